@@ -1,3 +1,3 @@
-from touch_grass.cli import main
+from touch_grass.client import main
 
 main()
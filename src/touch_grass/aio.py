@@ -0,0 +1,176 @@
+"""Asyncio API: weather, air quality and location without a thread per request.
+
+Requires the ``async`` extra (aiohttp). Responses are parsed into the same
+dicts as the synchronous functions and share their cache entries, so a
+service can multiplex many location checks on one event loop.
+
+Each event loop gets its own pooled ``aiohttp.ClientSession``, configured
+from the same retry and pool settings as the requests session (see
+session.configure_session). It is closed by ``await close_async_session()``
+or, failing that, by ``loop.shutdown_asyncgens()`` (which ``asyncio.run``
+calls). Network failures raise ``aiohttp.ClientError`` or
+``asyncio.TimeoutError``.
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+from typing import TYPE_CHECKING, AsyncGenerator, Awaitable, Callable
+
+from touch_grass.cache import async_cached_call_resilient, set_cached
+from touch_grass.grid import quantize
+from touch_grass.location import (
+    LAST_LOCATION_KEY,
+    LOCATION_STALE_TTL,
+    LOCATION_TTL,
+    LOCATION_URL,
+    _parse_location,
+    location_cache_key,
+)
+from touch_grass.session import _SETTINGS, RETRY_AFTER_MAX, RETRY_STATUSES
+from touch_grass.weather import (
+    AIR_QUALITY_URL,
+    WEATHER_URL,
+    _air_quality_params,
+    _cached_horizon,
+    _parse_air_quality,
+    _parse_weather,
+    _slice_days,
+    _weather_params,
+    fetch_horizon,
+)
+
+if TYPE_CHECKING:
+    import aiohttp
+
+# loop -> (session, guard). The session references its loop, so an entry is
+# only dropped when closed, by close_async_session() or the guard.
+_SESSIONS: dict[asyncio.AbstractEventLoop, tuple[aiohttp.ClientSession, AsyncGenerator]] = {}
+
+
+def _build_session() -> aiohttp.ClientSession:
+    try:
+        import aiohttp
+    except ImportError:
+        raise ImportError("the async API needs aiohttp: pip install 'touch-grass[async]'") from None
+    connector = aiohttp.TCPConnector(limit_per_host=_SETTINGS["pool_maxsize"])
+    return aiohttp.ClientSession(connector=connector, raise_for_status=False)
+
+
+async def _close_at_shutdown(loop: asyncio.AbstractEventLoop, session: aiohttp.ClientSession) -> AsyncGenerator:
+    """Parked at its yield; loop.shutdown_asyncgens() resumes it to close the session."""
+    try:
+        yield
+    finally:
+        if _SESSIONS.get(loop, (None,))[0] is session:
+            del _SESSIONS[loop]
+        await session.close()
+
+
+async def get_async_session() -> aiohttp.ClientSession:
+    """Return the running loop's pooled session, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    entry = _SESSIONS.get(loop)
+    if entry is not None and not entry[0].closed:
+        return entry[0]
+    session = _build_session()
+    guard = _close_at_shutdown(loop, session)
+    # First iteration registers the generator with the loop's shutdown hooks
+    await guard.asend(None)
+    _SESSIONS[loop] = (session, guard)
+    return session
+
+
+async def close_async_session() -> None:
+    """Close the running loop's session and its pooled connections."""
+    entry = _SESSIONS.pop(asyncio.get_running_loop(), None)
+    if entry is not None:
+        await entry[1].aclose()
+
+
+def _backoff(attempt: int, retry_after: str | None) -> float:
+    if retry_after is not None and retry_after.isdigit():
+        return min(float(retry_after), RETRY_AFTER_MAX)
+    return _SETTINGS["backoff_factor"] * (2 ** attempt) + random.uniform(0, _SETTINGS["backoff_jitter"])
+
+
+async def async_http_get_json(url: str, params: dict | None = None, timeout: float = 10):
+    """GET url and decode JSON, retrying like http_get (connection errors, timeouts and 429/5xx).
+
+    Raises aiohttp.ClientResponseError for a final error status.
+    """
+    import aiohttp
+
+    session = await get_async_session()
+    query = {k: str(v) for k, v in (params or {}).items()}
+    retries = _SETTINGS["retries"]
+    timeouts = 0
+    for attempt in range(retries + 1):
+        try:
+            async with session.get(url, params=query, timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+                if resp.status in RETRY_STATUSES and attempt < retries:
+                    delay = _backoff(attempt, resp.headers.get("Retry-After"))
+                else:
+                    resp.raise_for_status()
+                    return await resp.json(content_type=None)
+        except asyncio.TimeoutError:
+            timeouts += 1
+            if attempt == retries or timeouts > _SETTINGS["read_retries"]:
+                raise
+            delay = _backoff(attempt, None)
+        except aiohttp.ClientConnectionError:
+            if attempt == retries:
+                raise
+            delay = _backoff(attempt, None)
+        await asyncio.sleep(delay)
+
+
+async def _fetch_weather(latitude: float, longitude: float, forecast_days: int) -> dict:
+    return _parse_weather(await async_http_get_json(WEATHER_URL, _weather_params(latitude, longitude, forecast_days)))
+
+
+async def _fetch_air_quality(latitude: float, longitude: float, forecast_days: int) -> dict:
+    return _parse_air_quality(await async_http_get_json(AIR_QUALITY_URL, _air_quality_params(latitude, longitude, forecast_days)))
+
+
+async def _get_one(
+    prefix: str,
+    latitude: float,
+    longitude: float,
+    forecast_days: int,
+    fetch: Callable[[float, float, int], Awaitable[dict]],
+) -> dict:
+    latitude, longitude, cell = quantize(latitude, longitude)
+    value = _cached_horizon(prefix, cell, forecast_days, disk=False)
+    if value is None:
+        # Checking the disk cache may open one file per horizon: keep it off the loop
+        value = await asyncio.to_thread(_cached_horizon, prefix, cell, forecast_days)
+    if value is not None:
+        return value
+    fetch_days = max(forecast_days, fetch_horizon())
+    key = f"{prefix}:{cell}:{fetch_days}"
+    value = await async_cached_call_resilient(key, lambda: fetch(latitude, longitude, fetch_days))
+    return _slice_days(value, forecast_days)
+
+
+async def async_get_weather(latitude: float, longitude: float, forecast_days: int = 1) -> dict:
+    """Async get_weather: same result shape, cache keys and fallbacks."""
+    return await _get_one("weather", latitude, longitude, forecast_days, _fetch_weather)
+
+
+async def async_get_air_quality(latitude: float, longitude: float, forecast_days: int = 1) -> dict:
+    """Async get_air_quality: same result shape, cache keys and fallbacks."""
+    return await _get_one("air_quality", latitude, longitude, forecast_days, _fetch_air_quality)
+
+
+async def _fetch_location() -> dict:
+    location = _parse_location(await async_http_get_json(LOCATION_URL, timeout=5))
+    await asyncio.to_thread(set_cached, LAST_LOCATION_KEY, location, LOCATION_STALE_TTL)
+    return location
+
+
+async def async_get_location() -> dict:
+    """Async get_location (IP geolocation), sharing its per-network cache."""
+    return await async_cached_call_resilient(
+        location_cache_key(), _fetch_location, ttl=LOCATION_TTL, stale_ttl=LOCATION_STALE_TTL
+    )
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import csv
+import json
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from pathlib import Path
+from typing import IO, Iterable, Iterator
+
+from touch_grass.conditions import Evaluator
+from touch_grass.report import build_payload
+from touch_grass.session import request_errors
+from touch_grass.weather import MANY_CHUNK_SIZE, get_air_quality_many, get_conditions, get_weather_many
+
+DEFAULT_CONCURRENCY = 8
+
+_LAT_KEYS = ("latitude", "lat")
+_LON_KEYS = ("longitude", "lon", "lng")
+
+
+def _first(record: dict, keys: tuple[str, ...]):
+    for key in keys:
+        value = record.get(key)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _parse_location(record: dict) -> dict:
+    """Normalize a CSV/JSONL record into the location dict shape used by the CLI."""
+    lat = _first(record, _LAT_KEYS)
+    lon = _first(record, _LON_KEYS)
+    if lat is None or lon is None:
+        raise ValueError("missing latitude/longitude")
+    if isinstance(lat, bool) or isinstance(lon, bool):
+        raise ValueError("latitude/longitude must be numbers")
+    try:
+        lat, lon = float(lat), float(lon)
+    except TypeError:
+        # JSONL values such as lists or objects
+        raise ValueError("latitude/longitude must be numbers") from None
+    if not (-90 <= lat <= 90):
+        raise ValueError(f"Latitude must be between -90 and 90, got {lat}")
+    if not (-180 <= lon <= 180):
+        raise ValueError(f"Longitude must be between -180 and 180, got {lon}")
+    return {
+        "city": record.get("city") or record.get("name") or "Custom",
+        "region": record.get("region") or "",
+        "country": record.get("country") or "",
+        "latitude": lat,
+        "longitude": lon,
+    }
+
+
+def _is_jsonl(path: Path, f: IO[str]) -> bool:
+    if path.suffix.lower() in (".jsonl", ".ndjson"):
+        return True
+    if path.suffix.lower() == ".csv":
+        return False
+    start = f.read(1)
+    f.seek(0)
+    return start == "{"
+
+
+def read_locations(f: IO[str], path: str | Path = "") -> Iterator[dict | ValueError]:
+    """Lazily yield location dicts from an open CSV or JSONL file.
+
+    Invalid rows are yielded as ValueError instances so the caller can report
+    them in-stream without aborting the rest of the batch.
+    """
+    if _is_jsonl(Path(path), f):
+        for lineno, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError("expected a JSON object")
+                yield _parse_location(record)
+            except ValueError as e:
+                yield ValueError(f"line {lineno}: {e}")
+    else:
+        reader = csv.DictReader(f)
+        for lineno, record in enumerate(reader, start=2):
+            try:
+                yield _parse_location({k.strip().lower(): v for k, v in record.items() if k})
+            except ValueError as e:
+                yield ValueError(f"line {lineno}: {e}")
+
+
+def evaluate_location(location: dict, thresholds: dict, plan: str | None = None, forecast: int | None = None) -> dict:
+    """Fetch and evaluate a single location, returning the ``--json`` payload.
+
+    Uses its own Evaluator, so concurrent calls with different thresholds do not interfere.
+    """
+    evaluator = Evaluator(thresholds)
+    days = forecast if forecast is not None else 1
+    weather, air_quality = get_conditions(location["latitude"], location["longitude"], days)
+
+    result = evaluator.evaluate_current(weather, air_quality)
+    next_window = evaluator.find_next_safe_window(weather, air_quality)
+    forecast_summary = evaluator.forecast_days(weather, air_quality, forecast) if forecast else None
+    return build_payload(location, result, next_window, thresholds, plan, forecast_summary, forecast)
+
+
+def _prefetch(entries: Iterable[dict | ValueError], forecast_days: int, chunk_size: int) -> Iterator[dict | ValueError]:
+    """Warm the per-location cache with one multi-point request per chunk, then pass entries through."""
+    it = iter(entries)
+    while True:
+        chunk = list(islice(it, chunk_size))
+        if not chunk:
+            return
+        coordinates = [(e["latitude"], e["longitude"]) for e in chunk if not isinstance(e, ValueError)]
+        if coordinates:
+            try:
+                get_weather_many(coordinates, forecast_days, chunk_size)
+                get_air_quality_many(coordinates, forecast_days, chunk_size)
+            except (*request_errors(), KeyError, ValueError):
+                # Locations are fetched one by one below and report their own errors
+                pass
+        yield from chunk
+
+
+def _evaluate_entry(index: int, entry: dict | ValueError, thresholds: dict, plan: str | None, forecast: int | None) -> dict:
+    if isinstance(entry, ValueError):
+        return {"index": index, "error": f"Invalid location: {entry}", "error_type": "parameter"}
+    try:
+        payload = evaluate_location(entry, thresholds, plan, forecast)
+    except request_errors() as e:
+        return {"index": index, "location": entry, "error": f"Network error: {e}", "error_type": "network"}
+    except KeyError as e:
+        return {"index": index, "location": entry, "error": f"Unexpected API response — missing field: {e}", "error_type": "api"}
+    except ValueError as e:
+        return {"index": index, "location": entry, "error": f"Could not parse API response: {e}", "error_type": "api"}
+    return {"index": index, **payload}
+
+
+def evaluate_many(
+    entries: Iterable[dict | ValueError],
+    thresholds: dict,
+    plan: str | None = None,
+    forecast: int | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    chunk_size: int = MANY_CHUNK_SIZE,
+) -> Iterator[dict]:
+    """Evaluate locations with at most ``concurrency`` in flight, yielding results as they complete.
+
+    Input is consumed lazily and results are not retained, so memory stays flat
+    regardless of list size. Each result carries the input ``index`` since
+    completion order differs from input order. Upstream data is prefetched with
+    one multi-location request per ``chunk_size`` locations.
+    """
+    source = enumerate(_prefetch(entries, forecast if forecast is not None else 1, chunk_size))
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        pending = set()
+        for index, entry in source:
+            pending.add(pool.submit(_evaluate_entry, index, entry, thresholds, plan, forecast))
+            if len(pending) >= concurrency:
+                break
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+            for index, entry in source:
+                pending.add(pool.submit(_evaluate_entry, index, entry, thresholds, plan, forecast))
+                if len(pending) >= concurrency:
+                    break
+
+
+def result_exit_code(result: dict) -> int:
+    """Map one batch result to the CLI exit code convention (30/20/10/0)."""
+    if result.get("error_type") == "parameter":
+        return 30
+    if "error" in result:
+        return 20
+    return 0 if result["safe"] else 10
@@ -1,49 +1,533 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
 import time
-from typing import Any, Callable
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+from touch_grass.config import _config_dir
+
+# asyncio is only imported by the async entry points
+if TYPE_CHECKING:
+    import asyncio
 
-_CACHE: dict[str, tuple[float, Any]] = {}
 TTL = 600  # 10 minutes
 STALE_TTL = 21600  # 6 hours
+REVALIDATE_GRACE = 1800  # seconds past TTL served stale while refreshing, once enabled
+MAX_ENTRIES = 1024  # in-memory entries kept before least-recently-used eviction
+MAX_BYTES = 64 * 1024 * 1024  # approximate in-memory budget (JSON-encoded size)
+PURGE_INTERVAL = 300  # seconds between sweeps for entries past their retention
+PRUNE_MARKER = ".pruned"  # in the cache dir; its mtime is the last disk sweep
+
+
+class _MemoryCache:
+    """Bounded in-memory layer: key -> (timestamp, value), in least-recently-used order.
+
+    Entries are sized by their JSON encoding (the same text the disk layer
+    writes), which tracks the real footprint closely enough for a budget.
+    Each entry is retained for `keep` seconds (STALE_TTL unless its caller
+    serves it stale for longer). Storing evicts from the cold end until both
+    limits hold, and at most once per PURGE_INTERVAL sweeps out entries past
+    their retention.
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[float, Any, int, float]] = OrderedDict()
+        self._bytes = 0
+        self._last_purge = 0.0
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(("hits", "misses", "evictions", "expirations"), 0)
+
+    def get(self, key: str) -> tuple[float, Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0], entry[1]
+
+    def record(self, hit: bool) -> None:
+        with self._lock:
+            self._counters["hits" if hit else "misses"] += 1
+
+    def put(self, key: str, ts: float, value: Any, size: int, keep: float = STALE_TTL) -> None:
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._entries[key] = (ts, value, size, keep)
+            self._bytes += size
+            if time.time() - self._last_purge >= PURGE_INTERVAL:
+                self._purge()
+            while len(self._entries) > self.max_entries or (self._bytes > self.max_bytes and len(self._entries) > 1):
+                _, (_, _, evicted, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self._counters["evictions"] += 1
+
+    def _purge(self, max_age: float | None = None) -> int:
+        now = time.time()
+        expired = [
+            key
+            for key, (ts, _, _, keep) in self._entries.items()
+            if now - ts > (keep if max_age is None else max_age)
+        ]
+        for key in expired:
+            self._bytes -= self._entries.pop(key)[2]
+        self._counters["expirations"] += len(expired)
+        self._last_purge = now
+        return len(expired)
+
+    def purge(self, max_age: float | None = None) -> int:
+        with self._lock:
+            return self._purge(max_age)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self._counters,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_CACHE = _MemoryCache()
+
+# (id(event loop), key) -> task; only touched from the loop's own thread
+_ASYNC_INFLIGHT: dict[tuple[int, str], asyncio.Task] = {}
+
+# Guards _INFLIGHT and _REVALIDATING. Never held across fn() or disk I/O.
+_LOCK = threading.Lock()
+
+
+class _Flight:
+    """One in-progress refresh that concurrent callers of the same key wait on."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+_INFLIGHT: dict[str, _Flight] = {}
+
+# Stale-while-revalidate is off (0) unless a long-running process turns it on:
+# a one-shot CLI run would exit before a background refresh could finish.
+_REVALIDATE_GRACE = 0.0
+_REVALIDATING: dict[str, threading.Thread] = {}
+
+
+def set_revalidate_grace(seconds: float) -> None:
+    """Enable stale-while-revalidate for entries up to `seconds` past their TTL (0 disables)."""
+    global _REVALIDATE_GRACE
+    _REVALIDATE_GRACE = seconds
+
+
+# tag -> (type, encode, decode) for values that are not plain JSON
+_CODECS: dict[str, tuple[type, Callable[[Any], Any], Callable[[Any], Any]]] = {}
+
+
+def register_codec(tag: str, cls: type, encode: Callable[[Any], Any], decode: Callable[[Any], Any]) -> None:
+    """Teach the disk layer to persist instances of cls."""
+    _CODECS[tag] = (cls, encode, decode)
+
+
+def _json_default(obj: Any) -> Any:
+    for tag, (cls, encode, _) in _CODECS.items():
+        if isinstance(obj, cls):
+            return {"__codec__": tag, "data": encode(obj)}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _json_object_hook(obj: dict) -> Any:
+    tag = obj.get("__codec__")
+    if tag in _CODECS and len(obj) == 2:
+        return _CODECS[tag][2](obj["data"])
+    return obj
+
+
+def _disk_cache_enabled() -> bool:
+    return os.environ.get("TOUCH_GRASS_DISK_CACHE", "1") != "0"
+
+
+def _cache_dir() -> Path:
+    return _config_dir() / "cache"
+
+
+def _cache_path(key: str) -> Path:
+    return _cache_dir() / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+
+def _encode(key: str, ts: float, value: Any, keep: float) -> str | None:
+    try:
+        return json.dumps({"key": key, "ts": ts, "keep": keep, "value": value}, default=_json_default)
+    except (TypeError, ValueError):
+        return None
+
+
+def _disk_read(key: str) -> tuple[float, Any, int, float] | None:
+    """Return (ts, value, encoded size, retention) from disk, or None."""
+    if not _disk_cache_enabled():
+        return None
+    try:
+        with _cache_path(key).open() as f:
+            text = f.read()
+        data = json.loads(text, object_hook=_json_object_hook)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("key") != key:
+        return None
+    return float(data["ts"]), data["value"], len(text), float(data.get("keep", STALE_TTL))
+
+
+def _disk_write(key: str, text: str, expires: float) -> None:
+    """Persist an encoded entry atomically, with its mtime set to when it may be pruned.
+
+    Failures are ignored: the disk layer is best-effort.
+    """
+    if not _disk_cache_enabled():
+        return
+    cache_dir = _cache_dir()
+    tmp_path = None
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+        os.utime(tmp_path, (expires, expires))
+        os.replace(tmp_path, _cache_path(key))
+        tmp_path = None
+    except OSError:
+        pass
+    finally:
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+    _prune_disk(cache_dir)
+
+
+def _prune_disk(cache_dir: Path, force: bool = False) -> int:
+    """Delete cache files past their retention. Returns how many were removed.
+
+    A cache file's mtime is its expiry (see _disk_write), so per-entry
+    retention costs no extra reads; leftover temp files go after STALE_TTL.
+    Runs at most once per PURGE_INTERVAL across processes: the mtime of a
+    marker file records the last sweep, so short CLI runs cost one stat().
+    """
+    marker = cache_dir / PRUNE_MARKER
+    now = time.time()
+    try:
+        if not force and now - marker.stat().st_mtime < PURGE_INTERVAL:
+            return 0
+    except FileNotFoundError:
+        pass
+    except OSError:
+        return 0
+    removed = 0
+    try:
+        marker.touch()
+        with os.scandir(cache_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json"):
+                    cutoff = now
+                elif entry.name.endswith(".tmp"):
+                    cutoff = now - STALE_TTL
+                else:
+                    continue
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                        removed += 1
+                except OSError:
+                    # Raced with another process writing or pruning
+                    pass
+    except OSError:
+        pass
+    return removed
+
+
+def _lookup(key: str, now: float, ttl: float, record: bool = True) -> tuple[float, Any] | None:
+    """Return the newest known entry for key, consulting disk when memory is not fresh."""
+    entry = _CACHE.get(key)
+    if entry is not None and now - entry[0] < ttl:
+        if record:
+            _CACHE.record(hit=True)
+        return entry
+    if record:
+        _CACHE.record(hit=False)
+    disk_entry = _disk_read(key)
+    if disk_entry is not None and (entry is None or disk_entry[0] > entry[0]):
+        ts, value, size, keep = disk_entry
+        _CACHE.put(key, ts, value, size, keep)
+        return ts, value
+    return entry
+
+
+def _store(key: str, ts: float, value: Any, keep: float = STALE_TTL) -> None:
+    text = _encode(key, ts, value, keep)
+    _CACHE.put(key, ts, value, len(text) if text is not None else sys.getsizeof(value), keep)
+    if text is not None:
+        _disk_write(key, text, ts + keep)
+
+
+def _refresh(key: str, fn: Callable, ttl: float, keep: float = STALE_TTL) -> Any:
+    """Call fn() and cache its result for `keep` seconds, coalescing concurrent refreshes of one key.
+
+    The first caller runs fn(); callers arriving while it is in flight wait
+    and receive the same result, or the same exception. fn() must not refresh
+    its own key.
+    """
+    with _LOCK:
+        flight = _INFLIGHT.get(key)
+        leader = flight is None
+        if leader:
+            flight = _INFLIGHT[key] = _Flight()
+    if not leader:
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    try:
+        now = time.time()
+        entry = _CACHE.get(key)
+        if entry is not None and now - entry[0] < ttl:
+            # Another flight finished between our cache miss and taking the lead
+            flight.result = entry[1]
+        else:
+            flight.result = fn()
+            _store(key, now, flight.result, keep)
+        return flight.result
+    except BaseException as e:
+        flight.error = e
+        raise
+    finally:
+        with _LOCK:
+            del _INFLIGHT[key]
+        flight.done.set()
+
+
+def _revalidate(key: str, fn: Callable, ttl: float, keep: float = STALE_TTL) -> None:
+    """Refresh key in a background thread unless one is already running for it."""
+    def run():
+        try:
+            _refresh(key, fn, ttl, keep)
+        except Exception:
+            # The caller already has the stale value; the next call retries
+            pass
+        finally:
+            with _LOCK:
+                _REVALIDATING.pop(key, None)
+
+    with _LOCK:
+        if key in _REVALIDATING:
+            return
+        thread = _REVALIDATING[key] = threading.Thread(target=run, name=f"revalidate {key}", daemon=True)
+    thread.start()
 
 
 def cached_call(key: str, fn: Callable, ttl: int = TTL) -> Any:
     """Return cached result if fresh, else call fn() and cache result."""
-    now = time.monotonic()
-    if key in _CACHE:
-        ts, value = _CACHE[key]
+    now = time.time()
+    entry = _lookup(key, now, ttl)
+    if entry is not None:
+        ts, value = entry
         if now - ts < ttl:
             return value
-    result = fn()
-    _CACHE[key] = (now, result)
-    return result
+    return _refresh(key, fn, ttl)
 
 
-def cached_call_resilient(key: str, fn: Callable, ttl: int = TTL, stale_ttl: int = STALE_TTL) -> Any:
+def cached_call_resilient(
+    key: str,
+    fn: Callable,
+    ttl: int = TTL,
+    stale_ttl: int = STALE_TTL,
+    grace: float | None = None,
+) -> Any:
     """Return fresh cache when available.
 
+    Within `grace` seconds past ttl (default: set_revalidate_grace()), return
+    the stale value immediately and refresh it in the background.
+    Concurrent refreshes of the same key share one fn() call.
     If refresh fails (e.g. transient network error), return stale cache up to stale_ttl.
     If no usable cache exists, re-raise the original error.
+    Entries are retained for stale_ttl (at least STALE_TTL) so that fallback survives purges.
     """
-    now = time.monotonic()
-    if key in _CACHE:
-        ts, value = _CACHE[key]
+    now = time.time()
+    keep = max(stale_ttl, STALE_TTL)
+    entry = _lookup(key, now, ttl)
+    if entry is not None:
+        ts, value = entry
         if now - ts < ttl:
             return value
+        if now - ts < ttl + (_REVALIDATE_GRACE if grace is None else grace):
+            _revalidate(key, fn, ttl, keep)
+            return value
 
     try:
-        result = fn()
-        _CACHE[key] = (now, result)
-        return result
+        return _refresh(key, fn, ttl, keep)
     except Exception:
-        if key in _CACHE:
-            ts, value = _CACHE[key]
+        if entry is not None:
+            ts, value = entry
             if now - ts < stale_ttl:
                 return value
         raise
 
 
+async def _async_lookup(key: str, now: float, ttl: float) -> tuple[float, Any] | None:
+    """_lookup for the event loop: memory hits stay on the loop, disk reads go to a worker thread."""
+    import asyncio
+
+    entry = _CACHE.get(key)
+    if entry is not None and now - entry[0] < ttl:
+        _CACHE.record(hit=True)
+        return entry
+    return await asyncio.to_thread(_lookup, key, now, ttl)
+
+
+def _async_refresh(key: str, fn: Callable[[], Awaitable], ttl: float, keep: float = STALE_TTL) -> asyncio.Task:
+    """Return the task refreshing key on the running loop, starting one if none is in flight.
+
+    The asyncio counterpart of _refresh: callers await the same task, so
+    concurrent misses share one fn() call and its result or exception.
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    flight_key = (id(loop), key)
+    task = _ASYNC_INFLIGHT.get(flight_key)
+    if task is not None:
+        return task
+
+    async def run():
+        try:
+            now = time.time()
+            entry = _CACHE.get(key)
+            if entry is not None and now - entry[0] < ttl:
+                return entry[1]
+            value = await fn()
+            # Encoding and the disk write would block the loop
+            await asyncio.to_thread(_store, key, now, value, keep)
+            return value
+        finally:
+            _ASYNC_INFLIGHT.pop(flight_key, None)
+
+    task = _ASYNC_INFLIGHT[flight_key] = loop.create_task(run())
+    # Background revalidations are never awaited; mark their errors as seen
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    return task
+
+
+async def async_cached_call_resilient(
+    key: str,
+    fn: Callable[[], Awaitable],
+    ttl: int = TTL,
+    stale_ttl: int = STALE_TTL,
+    grace: float | None = None,
+) -> Any:
+    """cached_call_resilient for coroutine functions; shares the same cache entries.
+
+    fn is called with no arguments and awaited. Concurrent refreshes of a key
+    on one event loop share a task, which a cancelled caller does not cancel.
+    Disk cache I/O runs in worker threads, never on the loop.
+    """
+    import asyncio
+
+    now = time.time()
+    keep = max(stale_ttl, STALE_TTL)
+    entry = await _async_lookup(key, now, ttl)
+    if entry is not None:
+        ts, value = entry
+        if now - ts < ttl:
+            return value
+        if now - ts < ttl + (_REVALIDATE_GRACE if grace is None else grace):
+            _async_refresh(key, fn, ttl, keep)
+            return value
+
+    try:
+        return await asyncio.shield(_async_refresh(key, fn, ttl, keep))
+    except Exception:
+        if entry is not None:
+            ts, value = entry
+            if now - ts < stale_ttl:
+                return value
+        raise
+
+
+def get_cached(key: str, ttl: int = TTL, record: bool = True) -> Any:
+    """Return the cached value for key if younger than ttl, else None.
+
+    With record=False the lookup leaves the hit/miss counters alone, for
+    speculative probes that are not requests of their own.
+    """
+    now = time.time()
+    entry = _lookup(key, now, ttl, record)
+    if entry is not None and now - entry[0] < ttl:
+        return entry[1]
+    return None
+
+
+def get_cached_in_memory(key: str, ttl: int = TTL) -> Any:
+    """Like get_cached, but never touches disk (safe on an event loop)."""
+    entry = _CACHE.get(key)
+    if entry is not None and time.time() - entry[0] < ttl:
+        _CACHE.record(hit=True)
+        return entry[1]
+    return None
+
+
+def set_cached(key: str, value: Any, keep: float = STALE_TTL) -> None:
+    """Store value under key, stamped with the current time and retained for `keep` seconds."""
+    _store(key, time.time(), value, keep)
+
+
+def configure_cache(max_entries: int | None = None, max_bytes: int | None = None) -> None:
+    """Change the in-memory limits; takes effect from the next store."""
+    if max_entries is not None:
+        _CACHE.max_entries = max_entries
+    if max_bytes is not None:
+        _CACHE.max_bytes = max_bytes
+
+
+def purge_expired(max_age: float | None = None) -> int:
+    """Drop in-memory entries past their retention, or older than max_age seconds if given.
+
+    Returns how many were removed. Also sweeps cache files past their
+    retention from disk (not counted).
+    """
+    if _disk_cache_enabled():
+        _prune_disk(_cache_dir(), force=True)
+    return _CACHE.purge(max_age)
+
+
+def cache_stats() -> dict:
+    """Counters and usage of the in-memory layer: hits, misses, evictions, expirations, entries, bytes and limits."""
+    return _CACHE.stats()
+
+
 def clear_cache() -> None:
-    """Clear all cached entries."""
+    """Clear all cached entries, in memory and on disk."""
     _CACHE.clear()
+    shutil.rmtree(_cache_dir(), ignore_errors=True)
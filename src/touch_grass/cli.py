@@ -2,22 +2,33 @@ from __future__ import annotations
 
 import json
 import random
+import re
 import sys
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager, nullcontext
 
 import click
-import requests
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from rich.text import Text
 
-from touch_grass import conditions
-from touch_grass.conditions import evaluate_current, find_next_safe_window, forecast_days
-from touch_grass.config import has_user_thresholds, load_thresholds, run_first_time_setup
-from touch_grass.location import get_location
-from touch_grass.weather import get_air_quality, get_weather
+from touch_grass import conditions, grid
+from touch_grass.batch import DEFAULT_CONCURRENCY, evaluate_many, read_locations, result_exit_code
+from touch_grass.cache import REVALIDATE_GRACE, set_revalidate_grace
+from touch_grass.conditions import evaluate_current, evaluate_profiles, find_next_safe_window, forecast_days, safe_windows
+from touch_grass.config import has_user_thresholds, load_profile, load_thresholds, run_first_time_setup
+from touch_grass.location import cached_location, distance_km, get_location, last_known_location
+from touch_grass.report import build_payload, build_profile_payloads
+from touch_grass.session import POOL_MAXSIZE, configure_session, request_errors
+from touch_grass.weather import fetch_horizon, get_conditions, prefetch_conditions
 
-console = Console()
+SPECULATION_RADIUS_KM = 1.0  # resolved location this close to the last-known one keeps the prefetched data
+
+# rich is only needed for human output; it is imported and the Console built on
+# first use so --json runs skip both.
+_CONSOLE = None
+_CAPTURED = False
+
+# Off while the daemon runs a request (see without_prefetch)
+_PREFETCH = True
 
 NUDGES = [
     "The mass of grass is calling your name.",
@@ -28,11 +39,160 @@ NUDGES = [
 ]
 
 
+def _console():
+    global _CONSOLE
+    if _CONSOLE is None:
+        from rich.console import Console
+
+        _CONSOLE = Console()
+    return _CONSOLE
+
+
+@contextmanager
+def captured_console(file, terminal: bool, width: int | None):
+    """Render human output into file as a console with these properties would (used by the daemon)."""
+    global _CONSOLE, _CAPTURED
+    from rich.console import Console
+
+    saved = _CONSOLE, _CAPTURED
+    _CONSOLE = Console(file=file, force_terminal=terminal, width=width)
+    _CAPTURED = True
+    try:
+        yield
+    finally:
+        _CONSOLE, _CAPTURED = saved
+
+
+@contextmanager
+def without_prefetch():
+    """Resolve the location without a speculative prefetch (used by the daemon).
+
+    A discarded prefetch outlives its request. The daemon swaps the process
+    environment per client, so it could write the cache with another
+    client's config dir, grid or horizon.
+    """
+    global _PREFETCH
+    saved = _PREFETCH
+    _PREFETCH = False
+    try:
+        yield
+    finally:
+        _PREFETCH = saved
+
+
+def _status(message: str, quiet: bool):
+    """Spinner for human output; a no-op in JSON mode and when output is captured."""
+    return nullcontext() if quiet or _CAPTURED else _console().status(message)
+
+
 def _status_dot(safe: bool) -> str:
     return "[green]●[/green]" if safe else "[red]●[/red]"
 
 
-@click.command()
+def _parse_clock_range(value: str) -> tuple[str, str]:
+    """Parse HH:MM-HH:MM. Hours are 00-23; 24:00 is accepted only as the end."""
+    match = re.fullmatch(r"\s*(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})\s*", value)
+    if not match or int(match[1]) > 23 or int(match[2]) > 59 or int(match[4]) > 59 \
+            or not (int(match[3]) <= 23 or (int(match[3]), int(match[4])) == (24, 0)):
+        raise click.BadParameter(f"--between must look like 12:00-14:00, got {value!r}")
+    start, end = f"{int(match[1]):02d}:{match[2]}", f"{int(match[3]):02d}:{match[4]}"
+    if start == end:
+        raise click.BadParameter(f"--between range is empty: {value!r}")
+    return start, end
+
+
+def _parse_profiles(values: tuple[str, ...]) -> dict[str, str]:
+    profiles: dict[str, str] = {}
+    for value in values:
+        name, sep, path = value.partition("=")
+        name = name.strip()
+        if not sep or not name or not path:
+            raise click.BadParameter(f"--profile must look like NAME=PATH, got {value!r}")
+        if name in profiles:
+            raise click.BadParameter(f"Duplicate profile name: {name!r}")
+        profiles[name] = path
+    return profiles
+
+
+def _window_report(weather: dict, air_quality: dict, min_hours: int, clock_bounds: tuple[str, str] | None, days: int) -> dict:
+    index = safe_windows(weather, air_quality)
+    now = time.time()
+    next_window = index.next_window(min_hours, after=now)
+    longest = index.longest_window(days, after=now)
+    report = {
+        "min_hours": min_hours,
+        "next": next_window.as_dict() if next_window else None,
+        "longest": longest.as_dict() if longest else None,
+    }
+    if clock_bounds is not None:
+        report["overlapping"] = [w.as_dict() for w in index.overlapping(*clock_bounds, after=now)]
+    return report
+
+
+def _print_window_report(report: dict, clock_range: str | None) -> None:
+    def describe(window: dict | None) -> str:
+        if window is None:
+            return "[dim]none[/dim]"
+        return f"{window['label']} for {window['hours']}h"
+
+    console = _console()
+    console.print(f"[cyan]Next {report['min_hours']}h+ window:[/cyan] {describe(report['next'])}")
+    console.print(f"[cyan]Longest window:[/cyan] {describe(report['longest'])}")
+    if "overlapping" in report:
+        windows = ", ".join(describe(w) for w in report["overlapping"]) or "[dim]none[/dim]"
+        console.print(f"[cyan]Windows overlapping {clock_range}:[/cyan] {windows}")
+    console.print()
+
+
+def _print_profiles(profiles: dict) -> None:
+    from rich.table import Table
+
+    table = Table(show_header=False, box=None, padding=(0, 1))
+    table.add_column("status", width=2)
+    table.add_column("profile")
+    table.add_column("next")
+    for name, evaluation in profiles.items():
+        next_window = evaluation["next_safe_window"] or "no window"
+        table.add_row(_status_dot(evaluation["safe"]), f"[bold]{name}[/bold]", f"[dim]next: {next_window}[/dim]")
+    console = _console()
+    console.print(table)
+    console.print()
+
+
+def _run_batch(locations_file: str, thresholds: dict, plan: str | None, forecast: int | None, concurrency: int) -> None:
+    try:
+        f = open(locations_file, newline="")
+    except OSError as e:
+        raise click.BadParameter(f"Cannot read locations file: {e}")
+
+    configure_session(pool_maxsize=max(concurrency, POOL_MAXSIZE))
+    exit_code = 0
+    with f:
+        for result in evaluate_many(read_locations(f, locations_file), thresholds, plan, forecast, concurrency):
+            click.echo(json.dumps(result, ensure_ascii=False))
+            exit_code = max(exit_code, result_exit_code(result))
+    raise SystemExit(exit_code)
+
+
+def _locate(days: int) -> tuple[dict, Future | None]:
+    """Resolve the IP location, prefetching conditions for the last-known one while a lookup runs.
+
+    Returns the location and, when the guess lies within SPECULATION_RADIUS_KM
+    of it, the future holding (weather, air_quality) for the guess; otherwise
+    None and the caller fetches for the resolved location.
+    """
+    guess = last_known_location() if _PREFETCH and cached_location() is None else None
+    if guess is None:
+        return get_location(), None
+    speculative = prefetch_conditions(guess["latitude"], guess["longitude"], days)
+    location = get_location()
+    if distance_km(location, guess) <= SPECULATION_RADIUS_KM:
+        return location, speculative
+    # Moved: the prefetch runs on daemon threads, so it never holds up exit
+    return location, None
+
+
+@click.group(invoke_without_command=True)
 @click.option("--lat", type=float, default=None, help="Latitude (skips IP geolocation)")
 @click.option("--lon", type=float, default=None, help="Longitude (skips IP geolocation)")
 @click.option("--config", "config_path", default=None, help="Path to JSON config file with custom thresholds")
@@ -40,8 +200,16 @@ def _status_dot(safe: bool) -> str:
 @click.option("--json", "json_output", is_flag=True, help="Output machine-readable JSON")
 @click.option("--plan", type=click.Choice(["next-24h"]), default=None, help="Planning mode")
 @click.option("--forecast", type=click.IntRange(1, 7), default=None, help="Return a day-by-day forecast for the next N days")
-def main(lat: float | None, lon: float | None, config_path: str | None, configure: bool, json_output: bool, plan: str | None, forecast: int | None):
+@click.option("--locations-file", default=None, help="CSV/JSONL file of locations to evaluate; streams one NDJSON result per line")
+@click.option("--concurrency", type=click.IntRange(1, 64), default=DEFAULT_CONCURRENCY, show_default=True, help="Locations evaluated in parallel with --locations-file")
+@click.option("--min-hours", type=click.IntRange(1, 168), default=None, help="Report the next safe window lasting at least N hours")
+@click.option("--between", "clock_range", default=None, help="Report safe windows overlapping a daily time range, e.g. 12:00-14:00")
+@click.option("--profile", "profile_specs", multiple=True, metavar="NAME=PATH", help="Also evaluate a named threshold profile (JSON config file); repeatable")
+@click.pass_context
+def main(ctx: click.Context, lat: float | None, lon: float | None, config_path: str | None, configure: bool, json_output: bool, plan: str | None, forecast: int | None, locations_file: str | None, concurrency: int, min_hours: int | None, clock_range: str | None, profile_specs: tuple[str, ...]):
     """Check if it's safe to go outside and touch grass."""
+    if ctx.invoked_subcommand is not None:
+        return
     try:
         # Load thresholds (first-run setup, config file and/or env vars)
         try:
@@ -52,17 +220,33 @@ def main(lat: float | None, lon: float | None, config_path: str | None, configur
             else:
                 thresholds = load_thresholds(config_path)
             conditions.apply_thresholds(thresholds)
+            # Reject bad TOUCH_GRASS_GRID / TOUCH_GRASS_FETCH_DAYS before any fetch
+            grid.resolution()
+            fetch_horizon()
+            profiles = {name: load_profile(path) for name, path in _parse_profiles(profile_specs).items()}
         except FileNotFoundError as e:
-            console.print(f"[red]Configuration error: {e}[/red]")
+            _console().print(f"[red]Configuration error: {e}[/red]")
             raise SystemExit(30)
         except ValueError as e:
-            console.print(f"[red]Configuration error: {e}[/red]")
+            _console().print(f"[red]Configuration error: {e}[/red]")
             raise SystemExit(30)
         except OSError as e:
-            console.print(f"[red]Configuration error: {e}[/red]")
+            _console().print(f"[red]Configuration error: {e}[/red]")
             raise SystemExit(30)
 
+        if locations_file is not None:
+            if lat is not None or lon is not None:
+                raise click.BadParameter("--locations-file cannot be combined with --lat/--lon")
+            if profiles:
+                raise click.BadParameter("--locations-file cannot be combined with --profile")
+            _run_batch(locations_file, thresholds, plan, forecast, concurrency)
+
+        clock_bounds = _parse_clock_range(clock_range) if clock_range is not None else None
+
+        forecast_days_requested = forecast if forecast is not None else 1
+
         # Location
+        speculative = None
         if lat is not None and lon is not None:
             if not (-90 <= lat <= 90):
                 raise click.BadParameter(f"Latitude must be between -90 and 90, got {lat}")
@@ -70,8 +254,8 @@ def main(lat: float | None, lon: float | None, config_path: str | None, configur
                 raise click.BadParameter(f"Longitude must be between -180 and 180, got {lon}")
             location = {"city": "Custom", "region": "", "country": "", "latitude": lat, "longitude": lon}
         else:
-            with console.status("[dim]Finding your location...[/dim]"):
-                location = get_location()
+            with _status("[dim]Finding your location...[/dim]", json_output):
+                location, speculative = _locate(forecast_days_requested)
 
         city_parts = [location["city"]]
         if location["region"]:
@@ -80,40 +264,35 @@ def main(lat: float | None, lon: float | None, config_path: str | None, configur
             city_parts.append(location["country"])
         location_str = ", ".join(city_parts)
 
-        forecast_days_requested = forecast if forecast is not None else 1
-
         # Fetch data
-        with console.status("[dim]Checking conditions...[/dim]"):
-            weather = get_weather(location["latitude"], location["longitude"], forecast_days=forecast_days_requested)
-            air_quality = get_air_quality(location["latitude"], location["longitude"], forecast_days=forecast_days_requested)
+        with _status("[dim]Checking conditions...[/dim]", json_output):
+            if speculative is not None:
+                weather, air_quality = speculative.result()
+            else:
+                weather, air_quality = get_conditions(location["latitude"], location["longitude"], forecast_days_requested)
 
         # Evaluate
         result = evaluate_current(weather, air_quality)
         next_window = find_next_safe_window(weather, air_quality)
         forecast_summary = forecast_days(weather, air_quality, forecast) if forecast else None
+        window_report = None
+        if min_hours is not None or clock_bounds is not None:
+            window_report = _window_report(weather, air_quality, min_hours or 1, clock_bounds, forecast_days_requested)
+        profile_payloads = None
+        if profiles:
+            profile_payloads = build_profile_payloads(evaluate_profiles(weather, air_quality, profiles, forecast), forecast)
 
         if json_output:
-            payload = {
-                "safe": result["safe"],
-                "location": {
-                    "city": location.get("city"),
-                    "region": location.get("region"),
-                    "country": location.get("country"),
-                    "latitude": location.get("latitude"),
-                    "longitude": location.get("longitude"),
-                },
-                "checks": result["checks"],
-                "next_safe_window": next_window,
-                "thresholds": thresholds,
-                "plan": plan,
-            }
-            if forecast_summary is not None:
-                payload["forecast_days"] = forecast_summary
-                payload["forecast_count"] = forecast
+            payload = build_payload(location, result, next_window, thresholds, plan, forecast_summary, forecast, window_report, profile_payloads)
             click.echo(json.dumps(payload, ensure_ascii=False))
             raise SystemExit(0 if result["safe"] else 10)
 
         # Display
+        from rich.panel import Panel
+        from rich.table import Table
+        from rich.text import Text
+
+        console = _console()
         console.print()
         console.print(f"[bold]📍 {location_str}[/bold]")
         console.print()
@@ -129,6 +308,12 @@ def main(lat: float | None, lon: float | None, config_path: str | None, configur
         console.print(table)
         console.print()
 
+        if window_report is not None:
+            _print_window_report(window_report, clock_range)
+
+        if profile_payloads is not None:
+            _print_profiles(profile_payloads)
+
         if plan == "next-24h":
             if next_window:
                 console.print(Panel(f"[bold cyan]Best next window[/bold cyan]\n\n[dim]{next_window}[/dim]", border_style="cyan"))
@@ -150,14 +335,80 @@ def main(lat: float | None, lon: float | None, config_path: str | None, configur
             console.print(Panel(msg, border_style="red"))
 
     except click.BadParameter as e:
-        console.print(f"[red]Error: {e}[/red]")
+        _console().print(f"[red]Error: {e}[/red]")
         raise SystemExit(30)
-    except requests.RequestException as e:
-        console.print(f"[red]Network error: {e}[/red]")
+    except request_errors() as e:
+        _console().print(f"[red]Network error: {e}[/red]")
         raise SystemExit(20)
     except KeyError as e:
-        console.print(f"[red]Unexpected API response — missing field: {e}[/red]")
+        _console().print(f"[red]Unexpected API response — missing field: {e}[/red]")
         raise SystemExit(20)
     except ValueError as e:
-        console.print(f"[red]Could not parse API response: {e}[/red]")
+        _console().print(f"[red]Could not parse API response: {e}[/red]")
         raise SystemExit(20)
+
+
+@main.command()
+@click.option("--host", default="127.0.0.1", show_default=True, help="Interface to bind")
+@click.option("--port", type=click.IntRange(0, 65535), default=8765, show_default=True, help="Port to listen on (0 picks a free one)")
+@click.option("--config", "config_path", default=None, help="Path to JSON config file with custom thresholds")
+@click.option("--verbose", is_flag=True, help="Log every request to stderr")
+def serve(host: str, port: int, config_path: str | None, verbose: bool):
+    """Serve /check, /forecast and /plan over local HTTP with warm caches.
+
+    Endpoints take ?lat=&lon= (IP geolocation when omitted); /forecast also
+    takes ?days=1..7. Responses are the --json payload.
+    """
+    from touch_grass.server import make_server
+
+    try:
+        thresholds = load_thresholds(config_path)
+        grid.resolution()
+        fetch_horizon()
+    except (OSError, ValueError) as e:
+        _console().print(f"[red]Configuration error: {e}[/red]")
+        raise SystemExit(30)
+    try:
+        server = make_server(thresholds, host, port, quiet=not verbose)
+    except OSError as e:
+        _console().print(f"[red]Error: cannot listen on {host}:{port}: {e}[/red]")
+        raise SystemExit(30)
+
+    configure_session(pool_maxsize=max(DEFAULT_CONCURRENCY, POOL_MAXSIZE))
+    set_revalidate_grace(REVALIDATE_GRACE)
+    click.echo(f"Serving on http://{host}:{server.server_port} (Ctrl+C to stop)", err=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+@main.command()
+@click.option("--socket", "socket_path", default=None, help="Socket path (default: daemon.sock in the config dir)")
+def daemon(socket_path: str | None):
+    """Answer touch-grass invocations over a Unix socket with warm caches.
+
+    While it runs, the touch-grass command forwards to it instead of
+    evaluating in a new process; output and exit codes are unchanged.
+    """
+    from pathlib import Path
+
+    from touch_grass.daemon import make_daemon
+
+    try:
+        server = make_daemon(Path(socket_path) if socket_path else None)
+    except OSError as e:
+        _console().print(f"[red]Error: cannot start daemon: {e}[/red]")
+        raise SystemExit(30)
+
+    # No stale-while-revalidate: a background refresh would read whichever
+    # client's environment the daemon has swapped in when it writes the cache
+    click.echo(f"Listening on {server.path} (Ctrl+C to stop)", err=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
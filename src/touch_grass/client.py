@@ -0,0 +1,97 @@
+"""Console entry point: forward to a running daemon, else run the CLI in-process.
+
+The forwarding path only imports the standard library, so a query answered by
+``touch-grass daemon`` skips loading click, rich and the evaluation code.
+"""
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+
+from touch_grass.config import _config_dir
+
+SOCKET_NAME = "daemon.sock"
+CONNECT_TIMEOUT = 0.2  # seconds; a live daemon accepts immediately
+RESPONSE_TIMEOUT = 120  # seconds; covers cold fetches with retries
+
+# Environment the daemon must see to behave as this process would: threshold
+# overrides and config dir, plus what rich uses to pick colors and width.
+FORWARDED_ENV = ("NO_COLOR", "FORCE_COLOR", "TERM", "COLORTERM", "COLUMNS", "LINES", "TTY_COMPATIBLE", "TTY_INTERACTIVE")
+FORWARDED_ENV_PREFIX = "TOUCH_GRASS_"
+
+
+def socket_path() -> Path:
+    return Path(os.environ.get("TOUCH_GRASS_SOCKET", _config_dir() / SOCKET_NAME))
+
+
+def forwarded_env(environ=os.environ) -> dict[str, str]:
+    return {k: v for k, v in environ.items() if k.startswith(FORWARDED_ENV_PREFIX) or k in FORWARDED_ENV}
+
+
+def _terminal_width() -> int | None:
+    try:
+        return os.get_terminal_size(sys.stdout.fileno()).columns
+    except (OSError, ValueError):
+        return None
+
+
+def build_request(argv: list[str]) -> dict:
+    stdout_tty = sys.stdout.isatty()
+    return {
+        "argv": argv,
+        "cwd": os.getcwd(),
+        "env": forwarded_env(),
+        "stdin_tty": sys.stdin.isatty(),
+        "stdout_tty": stdout_tty,
+        "width": _terminal_width() if stdout_tty else None,
+    }
+
+
+def _recv_all(sock: socket.socket) -> bytes:
+    chunks = []
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            return b"".join(chunks)
+        chunks.append(chunk)
+
+
+def forward(argv: list[str], path: Path | None = None) -> dict | None:
+    """Send one invocation to the daemon.
+
+    Returns {"stdout", "stderr", "exit_code"}, or None when no daemon answered
+    or it asked the caller to run locally (e.g. interactive setup).
+    """
+    path = path or socket_path()
+    if os.environ.get("TOUCH_GRASS_DAEMON") == "0" or not hasattr(socket, "AF_UNIX") or not path.exists():
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(str(path))
+            sock.settimeout(RESPONSE_TIMEOUT)
+            sock.sendall(json.dumps(build_request(argv)).encode("utf-8") + b"\n")
+            sock.shutdown(socket.SHUT_WR)
+            response = json.loads(_recv_all(sock))
+    except (OSError, ValueError):
+        # No daemon, a stale socket, or a daemon that died mid-request
+        return None
+    if not isinstance(response, dict) or response.get("fallback"):
+        return None
+    return response
+
+
+def main() -> None:
+    response = forward(sys.argv[1:])
+    if response is None:
+        from touch_grass.cli import main as cli_main
+
+        cli_main()
+        return
+    sys.stdout.write(response["stdout"])
+    sys.stdout.flush()
+    sys.stderr.write(response["stderr"])
+    sys.exit(response["exit_code"])
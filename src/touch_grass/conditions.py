@@ -1,13 +1,24 @@
 from __future__ import annotations
 
+import time
 from collections import Counter
 from datetime import datetime
-from zoneinfo import ZoneInfo
+from types import MappingProxyType
+from typing import Mapping
 
+from touch_grass import vectorized
 from touch_grass.config import DEFAULT_THRESHOLDS
+from touch_grass.rules import CRITERIA, compile_rules
+from touch_grass.timeline import Timeline, timeline_for
+from touch_grass.windows import WindowIndex
 
 THRESHOLDS: dict = dict(DEFAULT_THRESHOLDS)
 
+# Timeline columns read by the rules, in rule order
+RULE_COLUMNS = tuple(criterion.column for criterion in CRITERIA)
+
+_DEFAULT_EVALUATOR: Evaluator | None = None
+
 
 def apply_thresholds(t: dict) -> None:
     """Replace module-level THRESHOLDS (called from CLI after config loading)."""
@@ -15,44 +26,26 @@ def apply_thresholds(t: dict) -> None:
     THRESHOLDS = t
 
 
-def check_condition(value, name: str) -> tuple[bool, str]:
-    """Check a single condition. Returns (is_safe, reason)."""
-    if value is None:
-        return False, f"{name}: data unavailable"
-
-    if name == "temperature":
-        if value < THRESHOLDS["temp_min"]:
-            return False, f"Temperature too cold ({value}°C)"
-        if value > THRESHOLDS["temp_max"]:
-            return False, f"Temperature too hot ({value}°C)"
-        return True, f"Temperature is {value}°C"
+def _thresholds_key(thresholds) -> tuple:
+    return tuple(sorted(thresholds.items()))
 
-    if name == "uv_index":
-        if value >= THRESHOLDS["uv_max"]:
-            return False, f"UV index too high ({value})"
-        return True, f"UV index is {value}"
 
-    if name == "rain":
-        if value > THRESHOLDS["rain_max"]:
-            return False, f"It's raining ({value} mm)"
-        return True, "No rain"
+def default_evaluator() -> Evaluator:
+    """Evaluator for the module-level THRESHOLDS, used by the module functions.
 
-    if name == "air_quality":
-        if value >= THRESHOLDS["aqi_max"]:
-            return False, f"Air quality poor (EU AQI: {value})"
-        return True, f"Air quality good (EU AQI: {value})"
-
-    if name == "us_air_quality":
-        if value >= THRESHOLDS["us_aqi_max"]:
-            return False, f"Air quality poor (US AQI: {value})"
-        return True, f"Air quality good (US AQI: {value})"
+    Rebuilt whenever THRESHOLDS changes, so apply_thresholds() and in-place
+    edits are both picked up.
+    """
+    global _DEFAULT_EVALUATOR
+    evaluator = _DEFAULT_EVALUATOR
+    if evaluator is None or evaluator.key != _thresholds_key(THRESHOLDS):
+        evaluator = _DEFAULT_EVALUATOR = Evaluator(THRESHOLDS)
+    return evaluator
 
-    if name == "wind_speed":
-        if value >= THRESHOLDS["wind_max"]:
-            return False, f"Wind too strong ({value} km/h)"
-        return True, f"Wind speed is {value} km/h"
 
-    return True, ""
+def check_condition(value, name: str) -> tuple[bool, str]:
+    """Check a single condition. Returns (is_safe, reason)."""
+    return default_evaluator().check_condition(value, name)
 
 
 def evaluate_current(weather: dict, air_quality: dict) -> dict:
@@ -62,101 +55,73 @@ def evaluate_current(weather: dict, air_quality: dict) -> dict:
         safe: bool
         checks: list of {name, value, safe, reason}
     """
-    current = weather["current"]
-    eu_aqi = air_quality["current"].get("european_aqi")
-    us_aqi = air_quality["current"].get("us_aqi")
-
-    # wind_speed and us_aqi are optional — skip rather than fail when absent
-    checks_input = [
-        ("temperature", current.get("temperature")),
-        ("uv_index", current.get("uv_index")),
-        ("rain", current.get("rain")),
-        ("wind_speed", current.get("wind_speed")),
-        ("air_quality", eu_aqi),
-        ("us_air_quality", us_aqi),
-    ]
-
-    checks = []
-    for name, value in checks_input:
-        if value is None and name in ("wind_speed", "us_air_quality"):
-            continue
-        is_safe, reason = check_condition(value, name)
-        checks.append({"name": name, "value": value, "safe": is_safe, "reason": reason})
-
-    all_safe = all(c["safe"] for c in checks)
-    return {"safe": all_safe, "checks": checks}
+    return default_evaluator().evaluate_current(weather, air_quality)
 
 
 def _hour_is_safe(weather_hour: dict, aqi_hour: dict | None) -> bool:
     """Check if a single hourly slot is safe."""
-    temp = weather_hour.get("temperature")
-    uv = weather_hour.get("uv_index")
-    rain = weather_hour.get("rain")
-    wind = weather_hour.get("wind_speed")
-
-    if temp is None or not (THRESHOLDS["temp_min"] <= temp <= THRESHOLDS["temp_max"]):
-        return False
-    if uv is None or uv >= THRESHOLDS["uv_max"]:
-        return False
-    if rain is None or rain > THRESHOLDS["rain_max"]:
-        return False
-    if wind is not None and wind >= THRESHOLDS["wind_max"]:
-        return False
-
-    if aqi_hour:
-        eu = aqi_hour.get("european_aqi")
-        if eu is not None and eu >= THRESHOLDS["aqi_max"]:
-            return False
-        us = aqi_hour.get("us_aqi")
-        if us is not None and us >= THRESHOLDS["us_aqi_max"]:
-            return False
-
-    return True
-
-
-def forecast_days(weather: dict, air_quality: dict, days: int) -> list[dict]:
-    """Return a compact day-by-day forecast evaluation for the next N days."""
-    tz_str = weather.get("timezone", "UTC")
-    tz = ZoneInfo(tz_str)
-    hourly_weather = weather["hourly"]
-    hourly_aqi = {h["time"]: h for h in air_quality["hourly"]}
-
-    by_day: dict[str, list[tuple[dict, dict | None]]] = {}
-    for hour in hourly_weather:
-        day_key = hour["time"].split("T", 1)[0]
-        by_day.setdefault(day_key, []).append((hour, hourly_aqi.get(hour["time"])))
-
+    hour = {**weather_hour, **(aqi_hour or {})}
+    return default_evaluator().values_are_safe([hour.get(column) for column in RULE_COLUMNS])
+
+
+class _DayStats:
+    """Running per-day accumulator for forecast_days."""
+
+    __slots__ = ("safe_hours", "blocker_counts", "min_temp", "max_temp", "peak_uv", "max_rain", "max_wind", "peak_eu_aqi", "peak_us_aqi")
+
+    def __init__(self):
+        self.safe_hours: list[str] = []
+        self.blocker_counts: Counter[str] = Counter()
+        self.min_temp = None
+        self.max_temp = None
+        self.peak_uv = None
+        self.max_rain = None
+        self.max_wind = None
+        self.peak_eu_aqi = None
+        self.peak_us_aqi = None
+
+    def add_metrics(self, temp, uv, rain, wind, eu, us) -> None:
+        """Fold one hour into the day's extremes. Threshold-independent."""
+        # Strict comparisons keep the first extreme, like max()/min()
+        if temp is not None:
+            if self.max_temp is None or temp > self.max_temp:
+                self.max_temp = temp
+            if self.min_temp is None or temp < self.min_temp:
+                self.min_temp = temp
+        value = uv or 0
+        if self.peak_uv is None or value > self.peak_uv:
+            self.peak_uv = value
+        value = rain or 0
+        if self.max_rain is None or value > self.max_rain:
+            self.max_rain = value
+        value = wind or 0
+        if self.max_wind is None or value > self.max_wind:
+            self.max_wind = value
+        if eu is not None and (self.peak_eu_aqi is None or eu > self.peak_eu_aqi):
+            self.peak_eu_aqi = eu
+        if us is not None and (self.peak_us_aqi is None or us > self.peak_us_aqi):
+            self.peak_us_aqi = us
+
+    def summary(self) -> tuple[list[str], list[str], dict]:
+        metrics = {
+            "min_temp": self.min_temp,
+            "max_temp": self.max_temp,
+            "peak_uv": self.peak_uv,
+            "max_rain": self.max_rain,
+            "max_wind": self.max_wind,
+            "peak_eu_aqi": self.peak_eu_aqi,
+            "peak_us_aqi": self.peak_us_aqi,
+        }
+        return self.safe_hours, [name for name, _ in self.blocker_counts.most_common(2)], metrics
+
+
+def _clock_label(t: str) -> str:
+    return datetime.fromisoformat(t).strftime("%I:%M %p").lstrip("0")
+
+
+def _day_summaries(day_keys: list[str], day_stats, tz) -> list[dict]:
     summaries: list[dict] = []
-    for day_key in sorted(by_day.keys())[:days]:
-        rows = by_day[day_key]
-        safe_hours = []
-        blocker_counts: Counter[str] = Counter()
-        representative = rows[0][0]
-        peak_uv = max((row[0].get("uv_index") or 0) for row in rows)
-        max_temp = max((row[0].get("temperature") for row in rows if row[0].get("temperature") is not None), default=None)
-        min_temp = min((row[0].get("temperature") for row in rows if row[0].get("temperature") is not None), default=None)
-        max_rain = max((row[0].get("rain") or 0) for row in rows)
-        max_wind = max((row[0].get("wind_speed") or 0) for row in rows)
-        peak_eu_aqi = max((aq.get("european_aqi") for _, aq in rows if aq and aq.get("european_aqi") is not None), default=None)
-        peak_us_aqi = max((aq.get("us_aqi") for _, aq in rows if aq and aq.get("us_aqi") is not None), default=None)
-
-        for hour, aqi in rows:
-            if _hour_is_safe(hour, aqi):
-                safe_hours.append(hour["time"])
-            else:
-                if hour.get("temperature") is None or not (THRESHOLDS["temp_min"] <= hour.get("temperature") <= THRESHOLDS["temp_max"]):
-                    blocker_counts["temperature"] += 1
-                if hour.get("uv_index") is None or hour.get("uv_index") >= THRESHOLDS["uv_max"]:
-                    blocker_counts["uv_index"] += 1
-                if hour.get("rain") is None or hour.get("rain") > THRESHOLDS["rain_max"]:
-                    blocker_counts["rain"] += 1
-                if hour.get("wind_speed") is not None and hour.get("wind_speed") >= THRESHOLDS["wind_max"]:
-                    blocker_counts["wind_speed"] += 1
-                if aqi and aqi.get("european_aqi") is not None and aqi.get("european_aqi") >= THRESHOLDS["aqi_max"]:
-                    blocker_counts["air_quality"] += 1
-                if aqi and aqi.get("us_aqi") is not None and aqi.get("us_aqi") >= THRESHOLDS["us_aqi_max"]:
-                    blocker_counts["us_air_quality"] += 1
-
+    for day_key, (safe_hours, primary_blockers, metrics) in zip(day_keys, day_stats):
         dt = datetime.fromisoformat(f"{day_key}T00:00:00").replace(tzinfo=tz)
         best_window = None
         if safe_hours:
@@ -168,39 +133,265 @@ def forecast_days(weather: dict, air_quality: dict, days: int) -> list[dict]:
             "safe": len(safe_hours) > 0,
             "best_window": best_window,
             "safe_hour_count": len(safe_hours),
-            "primary_blockers": [name for name, _ in blocker_counts.most_common(2)],
-            "metrics": {
-                "min_temp": min_temp,
-                "max_temp": max_temp,
-                "peak_uv": peak_uv,
-                "max_rain": max_rain,
-                "max_wind": max_wind,
-                "peak_eu_aqi": peak_eu_aqi,
-                "peak_us_aqi": peak_us_aqi,
-            },
+            "primary_blockers": primary_blockers,
+            "metrics": metrics,
         })
-
     return summaries
 
 
+class Evaluator:
+    """Evaluates forecasts against one fixed threshold set.
+
+    Thresholds are copied into a read-only mapping and compiled into rules
+    (see touch_grass.rules) at construction, so an Evaluator never changes
+    after it is built and can be shared freely between threads. Build one per
+    threshold set (per user, per request) instead of swapping the module-level
+    THRESHOLDS.
+
+    Hourly readings are passed around as sequences aligned with RULE_COLUMNS.
+    """
+
+    __slots__ = ("thresholds", "key", "rules", "_rules_by_name")
+
+    def __init__(self, thresholds: Mapping):
+        self.thresholds = MappingProxyType(dict(thresholds))
+        self.key = _thresholds_key(self.thresholds)
+        self.rules = compile_rules(self.thresholds)
+        self._rules_by_name = {rule.name: rule for rule in self.rules}
+
+    def __repr__(self) -> str:
+        return f"Evaluator({dict(self.thresholds)!r})"
+
+    def check_condition(self, value, name: str) -> tuple[bool, str]:
+        """Check a single condition. Returns (is_safe, reason)."""
+        if value is None:
+            return False, f"{name}: data unavailable"
+        rule = self._rules_by_name.get(name)
+        if rule is None:
+            return True, ""
+        return rule.check(value)
+
+    def values_are_safe(self, values) -> bool:
+        """Check one hour's readings; optional criteria pass when missing."""
+        for rule, value in zip(self.rules, values):
+            if rule.fails(value):
+                return False
+        return True
+
+    def hour_blockers(self, values) -> list[str]:
+        """Names of the rules one hour's readings fail, in rule order (empty when safe)."""
+        return [rule.name for rule, value in zip(self.rules, values) if rule.fails(value)]
+
+    def evaluate_current(self, weather: dict, air_quality: dict) -> dict:
+        """Evaluate current conditions.
+
+        Returns dict with:
+            safe: bool
+            checks: list of {name, value, safe, reason}
+        """
+        current = timeline_for(weather, air_quality).current
+
+        checks = []
+        for rule in self.rules:
+            value = current[rule.column]
+            # Wind and US AQI are skipped rather than failed when absent
+            if value is None and rule.skip_when_missing:
+                continue
+            is_safe, reason = rule.check(value)
+            checks.append({"name": rule.name, "value": value, "safe": is_safe, "reason": reason})
+
+        all_safe = all(c["safe"] for c in checks)
+        return {"safe": all_safe, "checks": checks}
+
+    def _summarize_days(self, timeline: Timeline, day_keys: list[str]) -> list[_DayStats]:
+        """Single pass over the requested days of the joined timeline, computing
+        every daily metric, the safe-hour list and blocker counts.
+
+        Each rule is applied once per hour; the result feeds both the safety
+        verdict and the blocker counts.
+        """
+        checks = [(rule.name, rule.fails, timeline.column(rule.column)) for rule in self.rules]
+
+        times = timeline.times
+        temps = timeline.column("temperature")
+        uvs = timeline.column("uv_index")
+        rains = timeline.column("rain")
+        winds = timeline.column("wind_speed")
+        eus = timeline.column("european_aqi")
+        uss = timeline.column("us_aqi")
+
+        results = []
+        for day_key in day_keys:
+            stats = _DayStats()
+            results.append(stats)
+            for i in timeline.days[day_key]:
+                stats.add_metrics(temps[i], uvs[i], rains[i], winds[i], eus[i], uss[i])
+
+                # Safety and blockers
+                counts = stats.blocker_counts
+                safe = True
+                for name, fails, column in checks:
+                    if fails(column[i]):
+                        counts[name] += 1
+                        safe = False
+                if safe:
+                    stats.safe_hours.append(times[i])
+
+        return results
+
+    def forecast_days(self, weather: dict, air_quality: dict, days: int) -> list[dict]:
+        """Return a compact day-by-day forecast evaluation for the next N days.
+
+        Uses the NumPy evaluator for long horizons when NumPy is installed.
+        """
+        timeline = timeline_for(weather, air_quality)
+        day_keys = sorted(timeline.days.keys())[:days]
+
+        # Length first: _numpy() imports NumPy
+        if len(timeline) >= vectorized.MIN_HOURS and vectorized._numpy() is not None:
+            day_stats = vectorized.summarize_days(timeline, [timeline.days[day_key] for day_key in day_keys], self.rules)
+        else:
+            day_stats = [stats.summary() for stats in self._summarize_days(timeline, day_keys)]
+
+        return _day_summaries(day_keys, day_stats, timeline.tz)
+
+    def find_next_safe_window(self, weather: dict, air_quality: dict) -> str | None:
+        """Scan hourly forecast for the next safe window.
+
+        Returns a time string like "4:00 PM" or None if no safe window today.
+        """
+        timeline = timeline_for(weather, air_quality)
+        epochs = timeline.epochs
+        columns = [timeline.column(column) for column in RULE_COLUMNS]
+
+        # Jump past elapsed hours, then scan forward from the first future one
+        now = time.time()
+        for i in range(timeline.first_after(now), len(epochs)):
+            if epochs[i] <= now:
+                continue
+            if self.values_are_safe([column[i] for column in columns]):
+                return _clock_label(timeline.times[i])
+
+        return None
+
+    def _index_safe_runs(self, timeline: Timeline) -> WindowIndex:
+        epochs = timeline.epochs
+        rows = zip(*(timeline.column(column) for column in RULE_COLUMNS))
+        runs = []
+        start = None
+        for i, values in enumerate(rows):
+            if not self.values_are_safe(values):
+                if start is not None:
+                    runs.append((start, i))
+                    start = None
+            elif start is None:
+                start = i
+            elif epochs[i] - epochs[i - 1] != 3600:
+                # A gap in the hourly data splits the run
+                runs.append((start, i))
+                start = i
+        if start is not None:
+            runs.append((start, len(epochs)))
+        return WindowIndex(timeline, runs)
+
+    def safe_windows(self, weather: dict, air_quality: dict) -> WindowIndex:
+        """Index contiguous safe runs for window queries.
+
+        Built in one linear pass and memoized on the shared timeline per threshold set.
+        """
+        timeline = timeline_for(weather, air_quality)
+        return timeline.derived(("safe_windows", self.key), lambda: self._index_safe_runs(timeline))
+
+
+def forecast_days(weather: dict, air_quality: dict, days: int) -> list[dict]:
+    """Return a compact day-by-day forecast evaluation for the next N days."""
+    return default_evaluator().forecast_days(weather, air_quality, days)
+
+
 def find_next_safe_window(weather: dict, air_quality: dict) -> str | None:
     """Scan hourly forecast for the next safe window.
 
     Returns a time string like "4:00 PM" or None if no safe window today.
     """
-    tz_str = weather.get("timezone", "UTC")
-    tz = ZoneInfo(tz_str)
-    now = datetime.now(tz=tz)
-    hourly_weather = weather["hourly"]
-    hourly_aqi = {h["time"]: h for h in air_quality["hourly"]}
-
-    for hour in hourly_weather:
-        hour_time = datetime.fromisoformat(hour["time"]).replace(tzinfo=tz)
-        if hour_time <= now:
-            continue
+    return default_evaluator().find_next_safe_window(weather, air_quality)
+
+
+def safe_windows(weather: dict, air_quality: dict) -> WindowIndex:
+    """Index contiguous safe runs for window queries (see Evaluator.safe_windows)."""
+    return default_evaluator().safe_windows(weather, air_quality)
 
-        aqi_hour = hourly_aqi.get(hour["time"])
-        if _hour_is_safe(hour, aqi_hour):
-            return hour_time.strftime("%I:%M %p").lstrip("0")
 
-    return None
+def evaluate_profiles(weather: dict, air_quality: dict, profiles: Mapping[str, Mapping], days: int | None = None) -> dict[str, dict]:
+    """Evaluate several threshold profiles against one fetched dataset.
+
+    profiles maps a profile name to a threshold dict (same keys as
+    DEFAULT_THRESHOLDS). Every profile's next safe window and, when days is
+    given, its day-by-day forecast come out of a single traversal of the
+    hourly data: readings and daily metrics are read once per hour, and only
+    the threshold comparisons are repeated per profile.
+
+    Returns {name: {"thresholds", "result", "next_window", "forecast"}}, where
+    "forecast" is None unless days is given.
+    """
+    evaluators = {name: Evaluator(thresholds) for name, thresholds in profiles.items()}
+    timeline = timeline_for(weather, air_quality)
+    times = timeline.times
+    epochs = timeline.epochs
+    temps = timeline.column("temperature")
+    uvs = timeline.column("uv_index")
+    rains = timeline.column("rain")
+    winds = timeline.column("wind_speed")
+    eus = timeline.column("european_aqi")
+    uss = timeline.column("us_aqi")
+    columns = [timeline.column(column) for column in RULE_COLUMNS]
+
+    day_keys = sorted(timeline.days.keys())[:days] if days else []
+    day_of: dict[int, int] = {}
+    for slot, day_key in enumerate(day_keys):
+        day_of.update(dict.fromkeys(timeline.days[day_key], slot))
+
+    # Metrics are threshold-independent: one accumulator per day, shared by all profiles
+    shared = [_DayStats() for _ in day_keys]
+    per_profile = {name: [_DayStats() for _ in day_keys] for name in evaluators}
+    next_hour: dict[str, int | None] = dict.fromkeys(evaluators)
+
+    now = time.time()
+    first = timeline.first_after(now)
+    for i in range(len(times)):
+        slot = day_of.get(i)
+        upcoming = i >= first and epochs[i] > now
+        if slot is None and not upcoming:
+            continue
+        values = [column[i] for column in columns]
+
+        if slot is not None:
+            shared[slot].add_metrics(temps[i], uvs[i], rains[i], winds[i], eus[i], uss[i])
+
+        for name, evaluator in evaluators.items():
+            blockers = evaluator.hour_blockers(values)
+            if slot is not None:
+                stats = per_profile[name][slot]
+                stats.blocker_counts.update(blockers)
+                if not blockers:
+                    stats.safe_hours.append(times[i])
+            if upcoming and not blockers and next_hour[name] is None:
+                next_hour[name] = i
+
+    results = {}
+    for name, evaluator in evaluators.items():
+        forecast = None
+        if days:
+            day_stats = []
+            for metrics_stats, stats in zip(shared, per_profile[name]):
+                _, _, metrics = metrics_stats.summary()
+                safe_hours, primary_blockers, _ = stats.summary()
+                day_stats.append((safe_hours, primary_blockers, metrics))
+            forecast = _day_summaries(day_keys, day_stats, timeline.tz)
+        i = next_hour[name]
+        results[name] = {
+            "thresholds": dict(evaluator.thresholds),
+            "result": evaluator.evaluate_current(weather, air_quality),
+            "next_window": _clock_label(times[i]) if i is not None else None,
+            "forecast": forecast,
+        }
+    return results
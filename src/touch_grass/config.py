@@ -4,8 +4,6 @@ import json
 import os
 from pathlib import Path
 
-import click
-
 DEFAULT_THRESHOLDS = {
     "temp_min": -5,      # °C
     "temp_max": 35,      # °C
@@ -54,6 +52,8 @@ def save_user_thresholds(thresholds: dict) -> None:
 
 def run_first_time_setup() -> dict:
     """Interactive setup for safety thresholds. Returns selected thresholds and persists them."""
+    import click
+
     click.echo("\nWelcome to touch-grass setup 🌱")
     click.echo("Set your personal safety thresholds once now.")
     click.echo("Tip: choose 'skip' to keep defaults. You can rerun with --configure.\n")
@@ -88,14 +88,7 @@ def load_thresholds(config_path: str | None = None) -> dict:
         _apply_thresholds_from_dict(thresholds, user_data)
 
     if config_path is not None:
-        path = Path(config_path)
-        if not path.exists():
-            raise FileNotFoundError(f"Config file not found: {config_path}")
-        if not path.is_file():
-            raise ValueError(f"Config path is not a file: {config_path}")
-        with path.open() as f:
-            file_data = json.load(f)
-        _apply_thresholds_from_dict(thresholds, file_data)
+        _apply_thresholds_from_dict(thresholds, _read_thresholds_file(config_path))
 
     for env_key, (threshold_key, cast) in _ENV_MAP.items():
         val = os.environ.get(env_key)
@@ -106,3 +99,30 @@ def load_thresholds(config_path: str | None = None) -> dict:
                 raise ValueError(f"Invalid value for {env_key}: {val!r}")
 
     return thresholds
+
+
+def load_profile(config_path: str) -> dict:
+    """Return a standalone threshold profile: defaults < JSON file.
+
+    Unlike load_thresholds, the user config and TOUCH_GRASS_* overrides are
+    not applied, so each profile is exactly what its file says.
+    """
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    try:
+        _apply_thresholds_from_dict(thresholds, _read_thresholds_file(config_path))
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid profile {config_path}: {e}") from None
+    return thresholds
+
+
+def _read_thresholds_file(config_path: str) -> dict:
+    path = Path(config_path)
+    if not path.exists():
+        raise FileNotFoundError(f"Config file not found: {config_path}")
+    if not path.is_file():
+        raise ValueError(f"Config path is not a file: {config_path}")
+    with path.open() as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"Config file must contain a JSON object: {config_path}")
+    return data
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from pathlib import Path
+
+from touch_grass import cli
+from touch_grass.client import FORWARDED_ENV, FORWARDED_ENV_PREFIX, socket_path
+from touch_grass.config import has_user_thresholds
+
+
+def _is_forwarded(name: str) -> bool:
+    return name.startswith(FORWARDED_ENV_PREFIX) or name in FORWARDED_ENV
+
+
+@contextmanager
+def _client_context(env: dict[str, str], cwd: str):
+    """Run with the client's forwarded environment and working directory, then restore ours.
+
+    stdin is replaced with an empty non-tty stream: anything that would need
+    the client's terminal is sent back by _needs_local instead.
+    """
+    saved_env = {k: v for k, v in os.environ.items() if _is_forwarded(k)}
+    saved_cwd = os.getcwd()
+    saved_stdin = sys.stdin
+    for name in saved_env:
+        del os.environ[name]
+    os.environ.update({k: v for k, v in env.items() if _is_forwarded(k)})
+    try:
+        os.chdir(cwd)
+        sys.stdin = io.StringIO()
+        yield
+    finally:
+        sys.stdin = saved_stdin
+        os.chdir(saved_cwd)
+        for name in [k for k in os.environ if _is_forwarded(k)]:
+            del os.environ[name]
+        os.environ.update(saved_env)
+
+
+# Interactive setup needs the client's terminal. Batch runs stream NDJSON for as
+# long as they take; through the serial daemon they would be buffered whole,
+# block other clients and outlast the client's response timeout.
+_LOCAL_OPTIONS = ("--configure", "--locations-file")
+
+
+def _needs_local(argv: list[str], stdin_tty: bool) -> bool:
+    """Invocations the client must run itself: subcommands, interactive setup and batch runs."""
+    if any(arg in cli.main.commands for arg in argv):
+        return True
+    if any(arg == option or arg.startswith(option + "=") for arg in argv for option in _LOCAL_OPTIONS):
+        return True
+    has_config = any(arg == "--config" or arg.startswith("--config=") for arg in argv)
+    return stdin_tty and not has_config and not has_user_thresholds()
+
+
+def handle_request(request: dict) -> dict:
+    """Run one forwarded CLI invocation and capture exactly what it would print."""
+    argv = list(request["argv"])
+    with _client_context(request.get("env", {}), request["cwd"]):
+        if _needs_local(argv, bool(request.get("stdin_tty"))):
+            return {"fallback": True}
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr), cli.without_prefetch(), \
+                cli.captured_console(stdout, bool(request.get("stdout_tty")), request.get("width")):
+            try:
+                cli.main.main(args=argv, prog_name="touch-grass")
+                exit_code = 0
+            except SystemExit as e:
+                if e.code is None or isinstance(e.code, int):
+                    exit_code = e.code or 0
+                else:
+                    stderr.write(f"{e.code}\n")
+                    exit_code = 1
+    return {"stdout": stdout.getvalue(), "stderr": stderr.getvalue(), "exit_code": exit_code}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            # Connection probe (see _is_listening)
+            return
+        try:
+            response = handle_request(json.loads(line))
+        except Exception:
+            # Let the client fall back to running in-process
+            response = {"fallback": True}
+        self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8"))
+
+
+def _is_listening(path: Path) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(path))
+        except OSError:
+            return False
+    return True
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    """Serves forwarded CLI invocations one at a time.
+
+    Requests run in this process (warm caches, pooled connections) but
+    serially: each one temporarily takes over the process environment,
+    working directory and stdout. For that reason no cache work runs in the
+    background (no stale-while-revalidate, no speculative prefetch). Use
+    ``touch-grass serve`` for concurrent queries.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.is_socket():
+            if _is_listening(path):
+                raise OSError(f"a daemon is already listening on {path}")
+            # Left behind by a daemon that did not shut down cleanly
+            path.unlink()
+        super().__init__(str(path), _Handler)
+        os.chmod(path, 0o600)
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def make_daemon(path: Path | None = None) -> DaemonServer:
+    """Bind the daemon socket; call serve_forever() on the result."""
+    return DaemonServer(path or socket_path())
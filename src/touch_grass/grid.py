@@ -0,0 +1,101 @@
+"""Spatial quantization of coordinates for cache keys and upstream requests.
+
+Open-Meteo answers from model grid cells a few kilometres wide, so points a
+few metres apart get the same forecast. Snapping them to a shared point first
+lets nearby queries (and neighbouring sites in a batch) share cache entries
+and upstream requests.
+
+Configured with TOUCH_GRASS_GRID:
+
+    unset, "0" or "off"   raw coordinates (the default)
+    "0.1"                 snap to a 0.1-degree grid
+    "geohash:5"           snap to the centre of the precision-5 geohash cell
+"""
+from __future__ import annotations
+
+import os
+
+GRID_ENV = "TOUCH_GRASS_GRID"
+MAX_GEOHASH_PRECISION = 12
+
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def resolution() -> tuple[str, float | int] | None:
+    """Parse TOUCH_GRASS_GRID into ("degrees", step) or ("geohash", precision); None when off."""
+    raw = os.environ.get(GRID_ENV, "").strip().lower()
+    if raw in ("", "0", "off"):
+        return None
+    try:
+        if raw.startswith("geohash:"):
+            precision = int(raw.split(":", 1)[1])
+            if not 1 <= precision <= MAX_GEOHASH_PRECISION:
+                raise ValueError
+            return "geohash", precision
+        step = float(raw)
+        if not 0 < step <= 10:
+            raise ValueError
+        return "degrees", step
+    except ValueError:
+        raise ValueError(
+            f"Invalid value for {GRID_ENV}: {raw!r} (expected degrees such as 0.1, "
+            f"or geohash:N with N from 1 to {MAX_GEOHASH_PRECISION})"
+        ) from None
+
+
+def geohash(latitude: float, longitude: float, precision: int) -> str:
+    return _geohash_cell(latitude, longitude, precision)[0]
+
+
+def _geohash_cell(latitude: float, longitude: float, precision: int) -> tuple[str, float, float]:
+    """Return (geohash, centre latitude, centre longitude) of the cell containing the point."""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # geohash interleaves bits starting with longitude
+    while len(chars) < precision:
+        interval, value = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (interval[0] + interval[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            interval[0] = mid
+        else:
+            interval[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars), (lat_range[0] + lat_range[1]) / 2, (lon_range[0] + lon_range[1]) / 2
+
+
+def _snap(value: float, step: float) -> float:
+    # round() again to drop float noise such as 45.500000000000004
+    return round(round(value / step) * step, 6)
+
+
+def quantize(latitude: float, longitude: float) -> tuple[float, float, str]:
+    """Snap a point per TOUCH_GRASS_GRID.
+
+    Returns (latitude, longitude, cache key fragment). The coordinates are
+    what to send upstream; every point in the same cell maps to the same
+    values, so the key fragment is shared too.
+    """
+    spec = resolution()
+    if spec is None:
+        return latitude, longitude, f"{latitude}:{longitude}"
+    kind, size = spec
+    if kind == "geohash":
+        cell, lat, lon = _geohash_cell(latitude, longitude, size)
+        return round(lat, 6), round(lon, 6), f"gh:{cell}"
+    lat = min(max(_snap(latitude, size), -90.0), 90.0)
+    lon = _snap(longitude, size)
+    if lon > 180:
+        lon = round(lon - 360, 6)
+    elif lon < -180:
+        lon = round(lon + 360, 6)
+    return lat, lon, f"{lat}:{lon}"
@@ -1,15 +1,99 @@
-import requests
+from __future__ import annotations
+
+import hashlib
+import math
+import socket
+
+from touch_grass.cache import cached_call_resilient, get_cached, set_cached
+from touch_grass.session import http_get
+
+LOCATION_URL = "https://ipinfo.io/json"
+LOCATION_TTL = 7 * 86400  # a week; re-queried sooner when the network fingerprint changes
+LOCATION_STALE_TTL = 30 * 86400  # same network, ipinfo unreachable: keep using the old answer
+LAST_LOCATION_KEY = "location:last"  # most recent lookup on any network, for speculative prefetch
+EARTH_RADIUS_KM = 6371.0
+_PROBE_ADDRESS = ("192.0.2.1", 80)  # TEST-NET-1; connect() on UDP only picks a route, nothing is sent
+_ROUTE_TABLE = "/proc/net/route"
+
+
+def _default_gateway() -> str:
+    """Gateway of the IPv4 default route as listed in the routing table; "" where unavailable."""
+    try:
+        with open(_ROUTE_TABLE) as table:
+            next(table, None)  # header
+            for line in table:
+                fields = line.split()
+                # Destination 0.0.0.0 with the RTF_GATEWAY flag set
+                if len(fields) > 3 and fields[1] == "00000000" and int(fields[3], 16) & 0x2:
+                    return f"{fields[0]}:{fields[2]}"
+    except (OSError, ValueError):
+        # Not Linux, or no readable routing table: fall back to the address alone
+        pass
+    return ""
+
+
+def network_fingerprint() -> str:
+    """Short hash of the hostname, the local address of the default route and its gateway.
+
+    Changes when the machine joins another network (new DHCP lease, VPN,
+    different interface), which is when its IP geolocation may change too.
+    The gateway tells apart NATed networks that hand out the same private
+    address, such as two routers both using 192.168.1.0/24.
+    """
+    address = ""
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.connect(_PROBE_ADDRESS)
+            address = sock.getsockname()[0]
+    except OSError:
+        # No route (offline): still a stable fingerprint, and the lookup itself will fail
+        pass
+    return hashlib.sha256(f"{socket.gethostname()}|{address}|{_default_gateway()}".encode()).hexdigest()[:16]
+
+
+def location_cache_key() -> str:
+    return f"location:{network_fingerprint()}"
 
 
 def get_location() -> dict:
     """Get user location from IP geolocation.
 
     Returns dict with keys: city, region, country, latitude, longitude
+
+    Cached on disk for LOCATION_TTL per network fingerprint, so only the
+    first run on a network (or after a week) queries ipinfo.io.
     """
-    resp = requests.get("https://ipinfo.io/json", timeout=5)
+    return cached_call_resilient(location_cache_key(), _fetch_location, ttl=LOCATION_TTL, stale_ttl=LOCATION_STALE_TTL)
+
+
+def cached_location() -> dict | None:
+    """The location for this network if it is cached and fresh, without any lookup."""
+    return get_cached(location_cache_key(), ttl=LOCATION_TTL)
+
+
+def last_known_location() -> dict | None:
+    """The most recently looked-up location on any network, up to LOCATION_STALE_TTL old."""
+    return get_cached(LAST_LOCATION_KEY, ttl=LOCATION_STALE_TTL)
+
+
+def distance_km(a: dict, b: dict) -> float:
+    """Great-circle (haversine) distance between two location dicts."""
+    lat1, lat2 = math.radians(a["latitude"]), math.radians(b["latitude"])
+    dlat = lat2 - lat1
+    dlon = math.radians(b["longitude"] - a["longitude"])
+    h = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+
+def _fetch_location() -> dict:
+    resp = http_get(LOCATION_URL, timeout=5)
     resp.raise_for_status()
-    data = resp.json()
+    location = _parse_location(resp.json())
+    set_cached(LAST_LOCATION_KEY, location, keep=LOCATION_STALE_TTL)
+    return location
+
 
+def _parse_location(data: dict) -> dict:
     lat, lon = data["loc"].split(",")
 
     return {
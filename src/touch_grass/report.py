@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+
+def build_payload(
+    location: dict,
+    result: dict,
+    next_window: str | None,
+    thresholds: dict,
+    plan: str | None,
+    forecast_summary: list[dict] | None = None,
+    forecast_count: int | None = None,
+    safe_windows: dict | None = None,
+    profiles: dict | None = None,
+) -> dict:
+    """Build the machine-readable payload printed by ``--json``."""
+    payload = {
+        "safe": result["safe"],
+        "location": {
+            "city": location.get("city"),
+            "region": location.get("region"),
+            "country": location.get("country"),
+            "latitude": location.get("latitude"),
+            "longitude": location.get("longitude"),
+        },
+        "checks": result["checks"],
+        "next_safe_window": next_window,
+        "thresholds": thresholds,
+        "plan": plan,
+    }
+    if forecast_summary is not None:
+        payload["forecast_days"] = forecast_summary
+        payload["forecast_count"] = forecast_count
+    if safe_windows is not None:
+        payload["safe_windows"] = safe_windows
+    if profiles is not None:
+        payload["profiles"] = profiles
+    return payload
+
+
+def build_profile_payloads(profile_results: dict, forecast_count: int | None = None) -> dict:
+    """Per-profile section of the ``--json`` payload, from conditions.evaluate_profiles()."""
+    payloads = {}
+    for name, evaluation in profile_results.items():
+        entry = {
+            "safe": evaluation["result"]["safe"],
+            "checks": evaluation["result"]["checks"],
+            "next_safe_window": evaluation["next_window"],
+            "thresholds": evaluation["thresholds"],
+        }
+        if evaluation["forecast"] is not None:
+            entry["forecast_days"] = evaluation["forecast"]
+            entry["forecast_count"] = forecast_count
+        payloads[name] = entry
+    return payloads
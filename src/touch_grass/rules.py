@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import operator
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping
+
+# Comparators a criterion may use. Each maps to a scalar predicate builder; the
+# same names drive the NumPy masks in vectorized.
+_COMPARATORS: dict[str, Callable[[Any], Callable[[Any], bool]]] = {
+    "lt": lambda bound: lambda v: v < bound,
+    "le": lambda bound: lambda v: v <= bound,
+    "between": lambda bound: lambda v: bound[0] <= v <= bound[1],
+}
+
+
+def _temperature_reason(value, safe: bool, bound) -> str:
+    if safe:
+        return f"Temperature is {value}°C"
+    if value < bound[0]:
+        return f"Temperature too cold ({value}°C)"
+    return f"Temperature too hot ({value}°C)"
+
+
+def _uv_reason(value, safe: bool, bound) -> str:
+    return f"UV index is {value}" if safe else f"UV index too high ({value})"
+
+
+def _rain_reason(value, safe: bool, bound) -> str:
+    return "No rain" if safe else f"It's raining ({value} mm)"
+
+
+def _wind_reason(value, safe: bool, bound) -> str:
+    return f"Wind speed is {value} km/h" if safe else f"Wind too strong ({value} km/h)"
+
+
+def _aqi_reason(label: str):
+    def reason(value, safe: bool, bound) -> str:
+        return f"Air quality {'good' if safe else 'poor'} ({label}: {value})"
+    return reason
+
+
+@dataclass(frozen=True)
+class Criterion:
+    """One safety criterion, before thresholds are known.
+
+    name is the check/blocker name, column the timeline column it reads, and
+    keys the threshold keys forming its bound (two keys for "between").
+    Optional criteria pass an hour whose value is missing; skip_when_missing
+    ones are left out of the current-conditions check instead of failing it.
+    """
+
+    name: str
+    column: str
+    comparator: str
+    keys: tuple[str, ...]
+    optional: bool
+    reason: Callable[[Any, bool, Any], str]
+    skip_when_missing: bool = False
+
+
+# Evaluation order: checks are reported and blockers ranked in this order.
+CRITERIA = (
+    Criterion("temperature", "temperature", "between", ("temp_min", "temp_max"), False, _temperature_reason),
+    Criterion("uv_index", "uv_index", "lt", ("uv_max",), False, _uv_reason),
+    Criterion("rain", "rain", "le", ("rain_max",), False, _rain_reason),
+    Criterion("wind_speed", "wind_speed", "lt", ("wind_max",), True, _wind_reason, skip_when_missing=True),
+    # A missing current EU AQI fails the current check: never advise going out blind
+    Criterion("air_quality", "european_aqi", "lt", ("aqi_max",), True, _aqi_reason("EU AQI")),
+    Criterion("us_air_quality", "us_aqi", "lt", ("us_aqi_max",), True, _aqi_reason("US AQI"), skip_when_missing=True),
+)
+
+
+@dataclass(frozen=True)
+class Rule:
+    """A criterion bound to concrete thresholds; passes(value) is the compiled predicate."""
+
+    name: str
+    column: str
+    comparator: str
+    bound: Any
+    optional: bool
+    passes: Callable[[Any], bool]
+    reason: Callable[[Any, bool, Any], str]
+    skip_when_missing: bool = False
+
+    def check(self, value) -> tuple[bool, str]:
+        """Check one present or missing value. Returns (is_safe, reason)."""
+        if value is None:
+            return False, f"{self.name}: data unavailable"
+        safe = self.passes(value)
+        return safe, self.reason(value, safe, self.bound)
+
+    def fails(self, value) -> bool:
+        """Hourly verdict: missing values fail unless the criterion is optional."""
+        if value is None:
+            return not self.optional
+        return not self.passes(value)
+
+
+def compile_rules(thresholds: Mapping, criteria: tuple[Criterion, ...] = CRITERIA) -> tuple[Rule, ...]:
+    """Bind each criterion to its threshold values once."""
+    rules = []
+    for criterion in criteria:
+        bound = tuple(thresholds[key] for key in criterion.keys)
+        if len(bound) == 1:
+            bound = bound[0]
+        rules.append(Rule(
+            criterion.name,
+            criterion.column,
+            criterion.comparator,
+            bound,
+            criterion.optional,
+            _COMPARATORS[criterion.comparator](bound),
+            criterion.reason,
+            criterion.skip_when_missing,
+        ))
+    return tuple(rules)
+
+
+def array_passes(rule: Rule, values):
+    """Vectorized rule.passes over a float array; NaN (missing) compares False."""
+    if rule.comparator == "between":
+        return (values >= rule.bound[0]) & (values <= rule.bound[1])
+    return getattr(operator, rule.comparator)(values, rule.bound)
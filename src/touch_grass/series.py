@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Sequence
+from typing import Any, Iterable, Iterator
+
+from touch_grass.cache import register_codec
+
+# A packed column: (values, missing). values is array('q') for all-int data,
+# array('d') for all-float data, or a plain list for anything else. missing is a
+# bytearray flagging None slots (None when the column has no gaps).
+_Column = tuple
+
+
+def _pack(values: Iterable) -> _Column:
+    values = list(values)
+    missing = bytearray(1 if v is None else 0 for v in values)
+    present = [v for v in values if v is not None]
+    typecode = None
+    if all(type(v) is int for v in present):
+        typecode = "q"
+    elif all(type(v) is float for v in present):
+        typecode = "d"
+    if typecode is not None:
+        filler = 0 if typecode == "q" else 0.0
+        try:
+            packed = array(typecode, (filler if v is None else v for v in values))
+        except OverflowError:
+            packed = None
+        if packed is not None:
+            return packed, (missing if any(missing) else None)
+    return values, None
+
+
+def _get(column: _Column, i: int) -> Any:
+    values, missing = column
+    if missing is not None and missing[i]:
+        return None
+    return values[i]
+
+
+def _unpack(column: _Column) -> list:
+    values, missing = column
+    if missing is None:
+        return list(values)
+    return [None if gap else v for v, gap in zip(values, missing)]
+
+
+class HourlySeries(Sequence):
+    """Hourly forecast data kept in Open-Meteo's columnar layout.
+
+    Columns are packed into typed arrays. Indexing or iterating yields row dicts
+    ({"time": ..., <column>: ...}) built on demand, so code written for the old
+    list-of-dicts shape keeps working.
+    """
+
+    __slots__ = ("times", "_columns")
+
+    def __init__(self, times: Iterable[str], columns: dict[str, Iterable]):
+        self.times = tuple(times)
+        self._columns = {name: _pack(values) for name, values in columns.items()}
+        for name, (values, _) in self._columns.items():
+            if len(values) != len(self.times):
+                raise ValueError(f"column {name!r} has {len(values)} values for {len(self.times)} hours")
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[dict]) -> HourlySeries:
+        """Build a series from row dicts (the pre-columnar shape)."""
+        rows = list(rows)
+        names: dict[str, None] = {}
+        for row in rows:
+            names.update(dict.fromkeys(k for k in row if k != "time"))
+        return cls(
+            (row["time"] for row in rows),
+            {name: [row.get(name) for row in rows] for name in names},
+        )
+
+    @property
+    def names(self) -> tuple[str, ...]:
+        return tuple(self._columns)
+
+    def column(self, name: str) -> list:
+        """Return one column as a list, with None for missing values."""
+        if name not in self._columns:
+            return [None] * len(self.times)
+        return _unpack(self._columns[name])
+
+    def row(self, i: int) -> dict:
+        row = {"time": self.times[i]}
+        for name, column in self._columns.items():
+            row[name] = _get(column, i)
+        return row
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return HourlySeries(self.times[index], {name: self.column(name)[index] for name in self._columns})
+        if index < 0:
+            index += len(self.times)
+        if not 0 <= index < len(self.times):
+            raise IndexError("hour index out of range")
+        return self.row(index)
+
+    def __iter__(self) -> Iterator[dict]:
+        for i in range(len(self.times)):
+            yield self.row(i)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, HourlySeries):
+            return self.times == other.times and {n: self.column(n) for n in self.names} == {n: other.column(n) for n in other.names}
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"HourlySeries({len(self)} hours, columns={list(self._columns)})"
+
+    def to_json(self) -> dict:
+        return {"time": list(self.times), "columns": {name: self.column(name) for name in self._columns}}
+
+    @classmethod
+    def from_json(cls, data: dict) -> HourlySeries:
+        return cls(data["time"], data["columns"])
+
+
+register_codec("hourly_series", HourlySeries, HourlySeries.to_json, HourlySeries.from_json)
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from touch_grass.batch import evaluate_location
+from touch_grass.cache import cache_stats
+from touch_grass.location import get_location
+from touch_grass.session import request_errors
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# path -> plan passed to evaluate_location
+ROUTES = {
+    "/check": None,
+    "/forecast": None,
+    "/plan": "next-24h",
+}
+
+
+def _single(query: dict, name: str) -> str | None:
+    values = query.get(name)
+    return values[-1] if values else None
+
+
+def _parse_float(query: dict, name: str, low: float, high: float) -> float | None:
+    raw = _single(query, name)
+    if raw is None:
+        return None
+    try:
+        value = float(raw)
+    except ValueError:
+        raise ValueError(f"{name} must be a number, got {raw!r}")
+    if not (low <= value <= high):
+        raise ValueError(f"{name} must be between {low:g} and {high:g}, got {value:g}")
+    return value
+
+
+def parse_request(path: str, query: dict) -> tuple[float | None, float | None, str | None, int | None]:
+    """Validate an endpoint and its query string.
+
+    Returns (lat, lon, plan, forecast). Raises LookupError for an unknown path
+    and ValueError for bad parameters (same ranges as the CLI options).
+    """
+    if path not in ROUTES:
+        raise LookupError(path)
+    lat = _parse_float(query, "lat", -90, 90)
+    lon = _parse_float(query, "lon", -180, 180)
+    if (lat is None) != (lon is None):
+        raise ValueError("lat and lon must be given together")
+
+    forecast = None
+    if path == "/forecast":
+        raw = _single(query, "days") or "1"
+        if not raw.isdigit() or not 1 <= int(raw) <= 7:
+            raise ValueError(f"days must be an integer between 1 and 7, got {raw!r}")
+        forecast = int(raw)
+    return lat, lon, ROUTES[path], forecast
+
+
+class TouchGrassServer(ThreadingHTTPServer):
+    """Threaded HTTP server answering with the ``--json`` payload.
+
+    One process serves every request, so the in-memory response cache, the
+    shared timelines and the pooled HTTP session stay warm between calls.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], thresholds: dict, quiet: bool = True):
+        super().__init__(address, _Handler)
+        self.thresholds = thresholds
+        self.quiet = quiet
+
+    def location(self, lat: float | None, lon: float | None) -> dict:
+        if lat is not None and lon is not None:
+            return {"city": "Custom", "region": "", "country": "", "latitude": lat, "longitude": lon}
+        # Cached per network by get_location itself
+        return get_location()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: TouchGrassServer
+    server_version = "touch-grass"
+    protocol_version = "HTTP/1.1"  # keep-alive for clients that reuse connections
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        if url.path == "/stats":
+            self._send(200, {"cache": cache_stats()})
+            return
+        try:
+            lat, lon, plan, forecast = parse_request(url.path, parse_qs(url.query))
+        except LookupError:
+            self._send(404, {"error": f"Unknown endpoint: {url.path}", "error_type": "parameter"})
+            return
+        except ValueError as e:
+            self._send(400, {"error": f"Invalid parameter: {e}", "error_type": "parameter"})
+            return
+
+        try:
+            location = self.server.location(lat, lon)
+            payload = evaluate_location(location, self.server.thresholds, plan, forecast)
+        except request_errors() as e:
+            self._send(502, {"error": f"Network error: {e}", "error_type": "network"})
+        except KeyError as e:
+            self._send(502, {"error": f"Unexpected API response — missing field: {e}", "error_type": "api"})
+        except ValueError as e:
+            self._send(502, {"error": f"Could not parse API response: {e}", "error_type": "api"})
+        else:
+            self._send(200, payload)
+
+    def _send(self, status: int, body: dict) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args) -> None:
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(thresholds: dict, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, quiet: bool = True) -> TouchGrassServer:
+    """Bind a server; call serve_forever() on the result. Port 0 picks a free port."""
+    return TouchGrassServer((host, port), thresholds, quiet)
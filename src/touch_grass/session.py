@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import sys
+import threading
+from typing import TYPE_CHECKING
+
+# requests/urllib3 are imported when the first session is built, so runs served
+# entirely from cache (e.g. warm --json invocations) never load them.
+if TYPE_CHECKING:
+    import requests
+    from urllib3.util.retry import Retry
+
+RETRIES = 3
+READ_RETRIES = 1  # a read timeout has already cost the full timeout; retry it once, not RETRIES times
+RETRY_AFTER_MAX = 10  # seconds; longer Retry-After values are clamped so a cron run cannot hang
+BACKOFF_FACTOR = 0.5  # seconds; doubles per retry
+BACKOFF_JITTER = 0.25  # seconds of random jitter added to each backoff
+POOL_MAXSIZE = 10  # keep-alive connections per host
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_SETTINGS: dict = {
+    "retries": RETRIES,
+    "read_retries": READ_RETRIES,
+    "backoff_factor": BACKOFF_FACTOR,
+    "backoff_jitter": BACKOFF_JITTER,
+    "pool_maxsize": POOL_MAXSIZE,
+}
+_SESSION: requests.Session | None = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _build_retry(retries: int, backoff_factor: float, backoff_jitter: float, read_retries: int = READ_RETRIES) -> Retry:
+    from urllib3.util.retry import Retry
+
+    class CappedRetry(Retry):
+        def get_retry_after(self, response):
+            retry_after = super().get_retry_after(response)
+            return None if retry_after is None else min(retry_after, RETRY_AFTER_MAX)
+
+    kwargs = {
+        "total": retries,
+        "connect": retries,
+        "read": min(read_retries, retries),
+        "status": retries,
+        "backoff_factor": backoff_factor,
+        "status_forcelist": RETRY_STATUSES,
+        "allowed_methods": frozenset({"GET"}),
+        "respect_retry_after_header": True,
+        # Hand the final 429/5xx back to the caller so raise_for_status() reports it
+        "raise_on_status": False,
+    }
+    try:
+        return CappedRetry(backoff_jitter=backoff_jitter, **kwargs)
+    except TypeError:
+        # urllib3 < 2 has no jitter support
+        return CappedRetry(**kwargs)
+
+
+def _build_session() -> requests.Session:
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    retry = _build_retry(_SETTINGS["retries"], _SETTINGS["backoff_factor"], _SETTINGS["backoff_jitter"], _SETTINGS["read_retries"])
+    adapter = HTTPAdapter(pool_maxsize=_SETTINGS["pool_maxsize"], max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the shared pooled session, creating it on first use."""
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                _SESSION = _build_session()
+    return _SESSION
+
+
+def configure_session(
+    retries: int | None = None,
+    backoff_factor: float | None = None,
+    backoff_jitter: float | None = None,
+    pool_maxsize: int | None = None,
+    read_retries: int | None = None,
+) -> None:
+    """Update retry/pool settings. The shared session is rebuilt on next use."""
+    updates = {
+        "retries": retries,
+        "read_retries": read_retries,
+        "backoff_factor": backoff_factor,
+        "backoff_jitter": backoff_jitter,
+        "pool_maxsize": pool_maxsize,
+    }
+    with _SESSION_LOCK:
+        _SETTINGS.update({k: v for k, v in updates.items() if v is not None})
+    close_session()
+
+
+def close_session() -> None:
+    """Close pooled connections and drop the shared session."""
+    global _SESSION
+    with _SESSION_LOCK:
+        session, _SESSION = _SESSION, None
+    if session is not None:
+        session.close()
+
+
+def http_get(url: str, **kwargs) -> requests.Response:
+    """GET through the shared session (keep-alive, retries with jittered backoff)."""
+    return get_session().get(url, **kwargs)
+
+
+def request_errors() -> tuple[type[Exception], ...]:
+    """Exception types to catch around http_get, for use in ``except`` clauses.
+
+    Empty until requests has been imported: if it was never loaded, no request
+    was made and none of its exceptions can be in flight.
+    """
+    requests = sys.modules.get("requests")
+    return (requests.RequestException,) if requests is not None else ()
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+from touch_grass.series import HourlySeries
+
+WEATHER_COLUMNS = ("temperature", "uv_index", "rain", "wind_speed")
+AIR_QUALITY_COLUMNS = ("european_aqi", "us_aqi")
+MEMO_SIZE = 64
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+_MEMO: OrderedDict[tuple[int, int], tuple[dict, dict, Timeline]] = OrderedDict()
+_MEMO_LOCK = threading.Lock()
+
+
+def _columns(hourly, names: tuple[str, ...]) -> tuple[list[str], dict[str, list]]:
+    if isinstance(hourly, HourlySeries):
+        return list(hourly.times), {name: hourly.column(name) for name in names}
+    return [h["time"] for h in hourly], {name: [h.get(name) for h in hourly] for name in names}
+
+
+class Timeline:
+    """Weather and air-quality hours joined on time.
+
+    Obtain through timeline_for() so one instance is shared by every evaluator
+    that sees the same pair of responses. The join, day index and epoch
+    timestamps are each computed once, on first use.
+    """
+
+    def __init__(self, weather: dict, air_quality: dict):
+        self.weather = weather
+        self.air_quality = air_quality
+        self.tz = ZoneInfo(weather.get("timezone", "UTC"))
+        self._times: list[str] | None = None
+        self._columns: dict[str, list] = {}
+        self._days: dict[str, list[int]] | None = None
+        self._epochs: list[int] | None = None
+        self._ascending = True
+        self._derived: dict = {}
+
+    @property
+    def current(self) -> dict:
+        """Current readings from both responses, keyed like the hourly columns."""
+        weather_now = self.weather["current"]
+        air_quality_now = self.air_quality["current"]
+        current = {name: weather_now.get(name) for name in WEATHER_COLUMNS}
+        current.update({name: air_quality_now.get(name) for name in AIR_QUALITY_COLUMNS})
+        return current
+
+    def _join(self) -> None:
+        times, columns = _columns(self.weather["hourly"], WEATHER_COLUMNS)
+        aqi_times, aqi_columns = _columns(self.air_quality["hourly"], AIR_QUALITY_COLUMNS)
+        if aqi_times == times:
+            columns.update(aqi_columns)
+        else:
+            position = {t: i for i, t in enumerate(aqi_times)}
+            rows = [position.get(t) for t in times]
+            for name, values in aqi_columns.items():
+                columns[name] = [None if i is None else values[i] for i in rows]
+        self._columns = columns
+        self._times = times
+
+    @property
+    def times(self) -> list[str]:
+        if self._times is None:
+            self._join()
+        return self._times
+
+    def column(self, name: str) -> list:
+        if self._times is None:
+            self._join()
+        return self._columns[name]
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    @property
+    def days(self) -> dict[str, list[int]]:
+        """Hour indices grouped by local date ("YYYY-MM-DD"), in first-seen order."""
+        if self._days is None:
+            days: dict[str, list[int]] = {}
+            for i, t in enumerate(self.times):
+                days.setdefault(t.split("T", 1)[0], []).append(i)
+            self._days = days
+        return self._days
+
+    @property
+    def epochs(self) -> list[int]:
+        """Start of each hour as integer Unix seconds, ascending for API data.
+
+        Derived once from the local ISO times with integer arithmetic. Zone
+        offsets come from ZoneInfo at the ends of the range; only a range that
+        spans a DST change falls back to per-hour datetime conversion.
+        """
+        if self._epochs is None:
+            epochs = _epochs(self.times, self.tz)
+            self._ascending = all(a < b for a, b in zip(epochs, epochs[1:]))
+            self._epochs = epochs
+        return self._epochs
+
+    def derived(self, key, build):
+        """Memoize data derived from this timeline, e.g. per-threshold indexes."""
+        value = self._derived.get(key)
+        if value is None:
+            value = self._derived[key] = build()
+        return value
+
+    def first_after(self, timestamp: float) -> int:
+        """Index of the first hour starting after timestamp (binary search on sorted data)."""
+        epochs = self.epochs
+        if self._ascending:
+            return bisect_right(epochs, timestamp)
+        return next((i for i, epoch in enumerate(epochs) if epoch > timestamp), len(epochs))
+
+
+def _aware(t: str, tz: ZoneInfo) -> datetime:
+    return datetime.fromisoformat(t).replace(tzinfo=tz)
+
+
+def _epochs(times: list[str], tz: ZoneInfo) -> list[int]:
+    if not times:
+        return []
+    first, last = _aware(times[0], tz), _aware(times[-1], tz)
+    offset = first.utcoffset()
+    if offset != last.utcoffset() or any(len(t) not in (16, 19) for t in times):
+        return [int(_aware(t, tz).timestamp()) for t in times]
+
+    offset_seconds = int(offset.total_seconds())
+    day_seconds: dict[str, int] = {}
+    epochs = []
+    for t in times:
+        day = t[:10]
+        base = day_seconds.get(day)
+        if base is None:
+            base = day_seconds[day] = (date.fromisoformat(day).toordinal() - _EPOCH_ORDINAL) * 86400 - offset_seconds
+        epochs.append(base + int(t[11:13]) * 3600 + int(t[14:16]) * 60 + (int(t[17:19]) if len(t) == 19 else 0))
+    return epochs
+
+
+def timeline_for(weather: dict, air_quality: dict) -> Timeline:
+    """Return the shared Timeline for this pair of responses, building it on first request.
+
+    Cached responses are returned as the same objects on every hit, so the
+    memo (keyed by identity, holding strong references) lives alongside them.
+    """
+    key = (id(weather), id(air_quality))
+    with _MEMO_LOCK:
+        entry = _MEMO.get(key)
+        if entry is not None and entry[0] is weather and entry[1] is air_quality:
+            _MEMO.move_to_end(key)
+            return entry[2]
+        timeline = Timeline(weather, air_quality)
+        _MEMO[key] = (weather, air_quality, timeline)
+        while len(_MEMO) > MEMO_SIZE:
+            _MEMO.popitem(last=False)
+        return timeline
+
+
+def clear_timelines() -> None:
+    """Drop every memoized Timeline (and the responses it holds)."""
+    with _MEMO_LOCK:
+        _MEMO.clear()
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from touch_grass.rules import array_passes
+
+# Below this many hours the array conversion costs more than it saves
+MIN_HOURS = 72
+
+# Optional: pip install "touch-grass[fast]". NumPy is imported on the first
+# _numpy() call, so short forecasts never pay for it.
+_NOT_LOADED = object()
+_np = _NOT_LOADED
+
+
+def _numpy():
+    """The numpy module, imported on first call, or None when it is not installed."""
+    global _np
+    if _np is _NOT_LOADED:
+        try:
+            import numpy
+        except ImportError:  # pragma: no cover - exercised only without numpy
+            numpy = None
+        _np = numpy
+    return _np
+
+
+def _extreme(values, column: list, reducer):
+    """First index of the max/min ignoring missing values, mapped back to the original value."""
+    if _numpy().isnan(values).all():
+        return None
+    return column[int(reducer(values))]
+
+
+def _peak_or_zero(values, column: list):
+    """Mirror ``max((v or 0) for v in column)`` including its int/float result."""
+    np = _numpy()
+    return column[int(np.argmax(np.nan_to_num(values, nan=0.0)))] or 0
+
+
+def _masks(arrays: dict, rules) -> dict:
+    """Per-rule failure masks, keyed by rule name in rule order."""
+    np = _numpy()
+    masks = {}
+    # NaN compares False: required values fail when missing, optional ones pass
+    with np.errstate(invalid="ignore"):
+        for rule in rules:
+            values = arrays[rule.column]
+            fails = ~array_passes(rule, values)
+            if rule.optional:
+                fails &= ~np.isnan(values)
+            masks[rule.name] = fails
+    return masks
+
+
+def _primary_blockers(masks: dict) -> list[str]:
+    # Ties in Counter.most_common are broken by first occurrence, then rule order
+    np = _numpy()
+    ranked = []
+    for order, (name, mask) in enumerate(masks.items()):
+        count = int(mask.sum())
+        if count:
+            ranked.append((-count, int(np.argmax(mask)), order, name))
+    ranked.sort()
+    return [name for _, _, _, name in ranked[:2]]
+
+
+def summarize_days(timeline, days_indexes: list[list[int]], rules) -> list[tuple[list[str], list[str], dict]]:
+    """Vectorized equivalent of ``conditions.Evaluator._summarize_days``.
+
+    Column arrays and masks are built once from the shared timeline; each day
+    is a gather of its hour indexes. Requires NumPy; check _numpy() first.
+    """
+    np = _numpy()
+    if np is None:
+        raise ImportError('NumPy is required: pip install "touch-grass[fast]"')
+    names = ("temperature", "uv_index", "rain", "wind_speed", "european_aqi", "us_aqi")
+    columns = {name: timeline.column(name) for name in names}
+    arrays = {name: np.array(column, dtype=float) for name, column in columns.items()}
+    masks = _masks(arrays, rules)
+    unsafe = np.zeros(len(timeline), dtype=bool)
+    for mask in masks.values():
+        unsafe |= mask
+    times = timeline.times
+
+    results = []
+    for indexes in days_indexes:
+        idx = np.asarray(indexes, dtype=np.intp)
+        day = {name: arrays[name][idx] for name in names}
+        # Reductions index into the day's slice, so map back through the original values
+        day_columns = {name: [columns[name][i] for i in indexes] for name in names}
+
+        safe_hours = [times[indexes[j]] for j in np.flatnonzero(~unsafe[idx])]
+        metrics = {
+            "min_temp": _extreme(day["temperature"], day_columns["temperature"], np.nanargmin),
+            "max_temp": _extreme(day["temperature"], day_columns["temperature"], np.nanargmax),
+            "peak_uv": _peak_or_zero(day["uv_index"], day_columns["uv_index"]),
+            "max_rain": _peak_or_zero(day["rain"], day_columns["rain"]),
+            "max_wind": _peak_or_zero(day["wind_speed"], day_columns["wind_speed"]),
+            "peak_eu_aqi": _extreme(day["european_aqi"], day_columns["european_aqi"], np.nanargmax),
+            "peak_us_aqi": _extreme(day["us_aqi"], day_columns["us_aqi"], np.nanargmax),
+        }
+        results.append((safe_hours, _primary_blockers({name: mask[idx] for name, mask in masks.items()}), metrics))
+
+    return results
@@ -1,6 +1,106 @@
-import requests
+from __future__ import annotations
 
-from touch_grass.cache import cached_call_resilient
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterable
+
+from touch_grass.cache import STALE_TTL, cached_call_resilient, get_cached, get_cached_in_memory, set_cached
+from touch_grass.grid import quantize
+from touch_grass.series import HourlySeries
+from touch_grass.session import http_get
+
+WEATHER_URL = "https://api.open-meteo.com/v1/forecast"
+AIR_QUALITY_URL = "https://air-quality-api.open-meteo.com/v1/air-quality"
+MANY_CHUNK_SIZE = 50  # coordinates per multi-location request
+MAX_FORECAST_DAYS = 7  # longest horizon requested (the air-quality API's limit)
+HORIZON_ENV = "TOUCH_GRASS_FETCH_DAYS"
+SLICE_MEMO_SIZE = 64
+
+# (id(source), days) -> (source, slice); holds the source so the id stays valid
+_SLICES: OrderedDict[tuple[int, int], tuple[dict, dict]] = OrderedDict()
+_SLICES_LOCK = threading.Lock()
+
+
+def fetch_horizon() -> int:
+    """Days fetched upstream at minimum, from TOUCH_GRASS_FETCH_DAYS (default 1).
+
+    Setting it to 7 makes every mode share one cache entry per location,
+    since shorter requests are sliced from the longer response.
+    """
+    raw = os.environ.get(HORIZON_ENV)
+    if raw is None or raw.strip() == "":
+        return 1
+    try:
+        days = int(raw)
+    except ValueError:
+        days = 0
+    if not 1 <= days <= MAX_FORECAST_DAYS:
+        raise ValueError(f"Invalid value for {HORIZON_ENV}: {raw!r} (expected 1 to {MAX_FORECAST_DAYS})")
+    return days
+
+
+def _slice_days(data: dict, days: int) -> dict:
+    """Trim a response to its first `days` local dates; current readings are kept as-is."""
+    hourly = data["hourly"]
+    times = hourly.times if isinstance(hourly, HourlySeries) else [h["time"] for h in hourly]
+    seen = 0
+    end = len(times)
+    previous = None
+    for i, t in enumerate(times):
+        day = t[:10]
+        if day != previous:
+            seen += 1
+            previous = day
+            if seen > days:
+                end = i
+                break
+    if end == len(times):
+        return data
+    key = (id(data), days)
+    with _SLICES_LOCK:
+        entry = _SLICES.get(key)
+        if entry is not None and entry[0] is data:
+            _SLICES.move_to_end(key)
+            return entry[1]
+        # Returning the same object for repeat hits keeps timeline_for's memo warm
+        sliced = {**data, "hourly": hourly[:end]}
+        _SLICES[key] = (data, sliced)
+        while len(_SLICES) > SLICE_MEMO_SIZE:
+            _SLICES.popitem(last=False)
+        return sliced
+
+
+def _cached_horizon(prefix: str, cell: str, days: int, disk: bool = True) -> dict | None:
+    """A fresh cached response covering at least `days`, sliced to `days`; None if there is none.
+
+    Only horizons a fetch can write are probed, from max(days, fetch_horizon())
+    up. Memory is scanned before disk, and misses are not counted in
+    cache_stats(): the caller's own lookup of the horizon it fetches counts once.
+    """
+    keys = [f"{prefix}:{cell}:{cached_days}" for cached_days in range(max(days, fetch_horizon()), MAX_FORECAST_DAYS + 1)]
+    for key in keys:
+        value = get_cached_in_memory(key)
+        if value is not None:
+            return _slice_days(value, days)
+    if disk:
+        for key in keys:
+            value = get_cached(key, record=False)
+            if value is not None:
+                return _slice_days(value, days)
+    return None
+
+
+def _get_one(prefix: str, latitude: float, longitude: float, forecast_days: int, fetch: Callable[[float, float, int], dict]) -> dict:
+    latitude, longitude, cell = quantize(latitude, longitude)
+    value = _cached_horizon(prefix, cell, forecast_days)
+    if value is not None:
+        return value
+    fetch_days = max(forecast_days, fetch_horizon())
+    key = f"{prefix}:{cell}:{fetch_days}"
+    value = cached_call_resilient(key, lambda: fetch(latitude, longitude, fetch_days))
+    return _slice_days(value, forecast_days)
 
 
 def get_weather(latitude: float, longitude: float, forecast_days: int = 1) -> dict:
@@ -8,44 +108,105 @@ def get_weather(latitude: float, longitude: float, forecast_days: int = 1) -> di
 
     Returns dict with:
         current: {temperature, rain, uv_index, wind_speed}
-        hourly: [{time, temperature, rain, uv_index, wind_speed}, ...]
+        hourly: HourlySeries of {time, temperature, rain, uv_index, wind_speed} rows
         timezone: str
 
-    Uses resilient cache fallback for transient API failures.
+    Uses resilient cache fallback for transient API failures. Coordinates
+    are snapped per TOUCH_GRASS_GRID before keying and fetching, and a fresh
+    cached response for a longer horizon is sliced rather than refetched.
+    """
+    return _get_one("weather", latitude, longitude, forecast_days, _fetch_weather)
+
+
+def get_conditions(latitude: float, longitude: float, forecast_days: int = 1) -> tuple[dict, dict]:
+    """Fetch weather and air quality concurrently; returns (weather, air_quality).
+
+    Weather is fetched on the calling thread and air quality on a helper
+    thread, so a cold fetch costs one round trip instead of two. Errors are
+    re-raised from the weather fetch first.
+    """
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        air_quality_future = pool.submit(get_air_quality, latitude, longitude, forecast_days=forecast_days)
+        weather = get_weather(latitude, longitude, forecast_days=forecast_days)
+        return weather, air_quality_future.result()
+
+
+def _in_background(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+    """Run fn on a daemon thread; unlike executor workers, it is not joined at interpreter exit."""
+    future: Future = Future()
+
+    def run():
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="prefetch", daemon=True).start()
+    return future
+
+
+def prefetch_conditions(latitude: float, longitude: float, forecast_days: int = 1) -> Future:
+    """Start get_conditions in the background; the future resolves to (weather, air_quality).
+
+    Both fetches run on daemon threads, so a prefetch nobody waits for
+    does not delay process exit; it only warms the cache if it finishes.
+    """
+    air_quality_future = _in_background(get_air_quality, latitude, longitude, forecast_days=forecast_days)
+
+    def conditions():
+        return get_weather(latitude, longitude, forecast_days=forecast_days), air_quality_future.result()
+
+    return _in_background(conditions)
+
+
+def get_weather_many(
+    coordinates: Iterable[tuple[float, float]],
+    forecast_days: int = 1,
+    chunk_size: int = MANY_CHUNK_SIZE,
+) -> list[dict]:
+    """Fetch weather for many (latitude, longitude) pairs, chunk_size points per request.
+
+    Returns one dict per input pair, in input order, in the same shape as get_weather.
+    Shares per-location cache entries with get_weather.
     """
-    key = f"weather:{latitude}:{longitude}:{forecast_days}"
-    return cached_call_resilient(key, lambda: _fetch_weather(latitude, longitude, forecast_days))
+    return _get_many("weather", coordinates, forecast_days, chunk_size, _fetch_weather_many)
+
+
+def _weather_params(latitude, longitude, forecast_days: int) -> dict:
+    return {
+        "latitude": latitude,
+        "longitude": longitude,
+        "current": "temperature_2m,rain,uv_index,windspeed_10m",
+        "hourly": "temperature_2m,rain,uv_index,windspeed_10m",
+        "forecast_days": forecast_days,
+        "timezone": "auto",
+    }
 
 
 def _fetch_weather(latitude: float, longitude: float, forecast_days: int) -> dict:
-    resp = requests.get(
-        "https://api.open-meteo.com/v1/forecast",
-        params={
-            "latitude": latitude,
-            "longitude": longitude,
-            "current": "temperature_2m,rain,uv_index,windspeed_10m",
-            "hourly": "temperature_2m,rain,uv_index,windspeed_10m",
-            "forecast_days": forecast_days,
-            "timezone": "auto",
-        },
-        timeout=10,
-    )
+    resp = http_get(WEATHER_URL, params=_weather_params(latitude, longitude, forecast_days), timeout=10)
+    resp.raise_for_status()
+    return _parse_weather(resp.json())
+
+
+def _fetch_weather_many(coordinates: list[tuple[float, float]], forecast_days: int) -> list[dict]:
+    latitudes, longitudes = _join_coordinates(coordinates)
+    resp = http_get(WEATHER_URL, params=_weather_params(latitudes, longitudes, forecast_days), timeout=10)
     resp.raise_for_status()
-    data = resp.json()
+    return [_parse_weather(data) for data in _split_locations(resp.json(), len(coordinates))]
 
+
+def _parse_weather(data: dict) -> dict:
     current = data["current"]
     hourly = data["hourly"]
 
-    hourly_list = [
-        {"time": t, "temperature": temp, "rain": r, "uv_index": uv, "wind_speed": ws}
-        for t, temp, r, uv, ws in zip(
-            hourly["time"],
-            hourly["temperature_2m"],
-            hourly["rain"],
-            hourly["uv_index"],
-            hourly["windspeed_10m"],
-        )
-    ]
+    hourly_series = HourlySeries(hourly["time"], {
+        "temperature": hourly["temperature_2m"],
+        "rain": hourly["rain"],
+        "uv_index": hourly["uv_index"],
+        "wind_speed": hourly["windspeed_10m"],
+    })
 
     return {
         "current": {
@@ -54,7 +215,7 @@ def _fetch_weather(latitude: float, longitude: float, forecast_days: int) -> dic
             "uv_index": current["uv_index"],
             "wind_speed": current["windspeed_10m"],
         },
-        "hourly": hourly_list,
+        "hourly": hourly_series,
         "timezone": data.get("timezone", "UTC"),
     }
 
@@ -64,30 +225,53 @@ def get_air_quality(latitude: float, longitude: float, forecast_days: int = 1) -
 
     Returns dict with:
         current: {european_aqi, us_aqi}
-        hourly: [{time, european_aqi, us_aqi}, ...]
+        hourly: HourlySeries of {time, european_aqi, us_aqi} rows
+
+    Uses resilient cache fallback for transient API failures. Coordinates
+    are snapped per TOUCH_GRASS_GRID before keying and fetching, and a fresh
+    cached response for a longer horizon is sliced rather than refetched.
+    """
+    return _get_one("air_quality", latitude, longitude, forecast_days, _fetch_air_quality)
+
 
-    Uses resilient cache fallback for transient API failures.
+def get_air_quality_many(
+    coordinates: Iterable[tuple[float, float]],
+    forecast_days: int = 1,
+    chunk_size: int = MANY_CHUNK_SIZE,
+) -> list[dict]:
+    """Fetch air quality for many (latitude, longitude) pairs, chunk_size points per request.
+
+    Returns one dict per input pair, in input order, in the same shape as get_air_quality.
+    Shares per-location cache entries with get_air_quality.
     """
-    key = f"air_quality:{latitude}:{longitude}:{forecast_days}"
-    return cached_call_resilient(key, lambda: _fetch_air_quality(latitude, longitude, forecast_days))
+    return _get_many("air_quality", coordinates, forecast_days, chunk_size, _fetch_air_quality_many)
+
+
+def _air_quality_params(latitude, longitude, forecast_days: int) -> dict:
+    return {
+        "latitude": latitude,
+        "longitude": longitude,
+        "current": "european_aqi,us_aqi",
+        "hourly": "european_aqi,us_aqi",
+        "forecast_days": forecast_days,
+        "timezone": "auto",
+    }
 
 
 def _fetch_air_quality(latitude: float, longitude: float, forecast_days: int) -> dict:
-    resp = requests.get(
-        "https://air-quality-api.open-meteo.com/v1/air-quality",
-        params={
-            "latitude": latitude,
-            "longitude": longitude,
-            "current": "european_aqi,us_aqi",
-            "hourly": "european_aqi,us_aqi",
-            "forecast_days": forecast_days,
-            "timezone": "auto",
-        },
-        timeout=10,
-    )
+    resp = http_get(AIR_QUALITY_URL, params=_air_quality_params(latitude, longitude, forecast_days), timeout=10)
     resp.raise_for_status()
-    data = resp.json()
+    return _parse_air_quality(resp.json())
 
+
+def _fetch_air_quality_many(coordinates: list[tuple[float, float]], forecast_days: int) -> list[dict]:
+    latitudes, longitudes = _join_coordinates(coordinates)
+    resp = http_get(AIR_QUALITY_URL, params=_air_quality_params(latitudes, longitudes, forecast_days), timeout=10)
+    resp.raise_for_status()
+    return [_parse_air_quality(data) for data in _split_locations(resp.json(), len(coordinates))]
+
+
+def _parse_air_quality(data: dict) -> dict:
     current_eu_aqi = data["current"].get("european_aqi")
     current_us_aqi = data["current"].get("us_aqi")
     hourly = data["hourly"]
@@ -96,12 +280,68 @@ def _fetch_air_quality(latitude: float, longitude: float, forecast_days: int) ->
     eu_values = hourly.get("european_aqi", [None] * len(times))
     us_values = hourly.get("us_aqi", [None] * len(times))
 
-    hourly_list = [
-        {"time": t, "european_aqi": eu, "us_aqi": us}
-        for t, eu, us in zip(times, eu_values, us_values)
-    ]
+    hourly_series = HourlySeries(times, {"european_aqi": eu_values, "us_aqi": us_values})
 
     return {
         "current": {"european_aqi": current_eu_aqi, "us_aqi": current_us_aqi},
-        "hourly": hourly_list,
+        "hourly": hourly_series,
     }
+
+
+def _join_coordinates(coordinates: list[tuple[float, float]]) -> tuple[str, str]:
+    return (
+        ",".join(str(lat) for lat, _ in coordinates),
+        ",".join(str(lon) for _, lon in coordinates),
+    )
+
+
+def _split_locations(data, expected: int) -> list[dict]:
+    """Open-Meteo returns a list for multi-point requests and a bare object for one point."""
+    locations = data if isinstance(data, list) else [data]
+    if len(locations) != expected:
+        raise ValueError(f"expected {expected} locations in response, got {len(locations)}")
+    return locations
+
+
+def _get_many(
+    prefix: str,
+    coordinates: Iterable[tuple[float, float]],
+    forecast_days: int,
+    chunk_size: int,
+    fetch_many: Callable[[list[tuple[float, float]], int], list[dict]],
+) -> list[dict]:
+    snapped = [quantize(lat, lon) for lat, lon in coordinates]
+    results: list[dict | None] = [None] * len(snapped)
+    fetch_days = max(forecast_days, fetch_horizon())
+
+    # Serve fresh cache hits and collapse coordinates in the same cell into one upstream point
+    missing: dict[str, list[int]] = {}
+    for i, (_, _, cell) in enumerate(snapped):
+        value = _cached_horizon(prefix, cell, forecast_days)
+        if value is not None:
+            results[i] = value
+        else:
+            missing.setdefault(f"{prefix}:{cell}:{fetch_days}", []).append(i)
+
+    pending = list(missing.items())
+    for start in range(0, len(pending), chunk_size):
+        chunk = pending[start:start + chunk_size]
+        try:
+            values = fetch_many([snapped[indexes[0]][:2] for _, indexes in chunk], fetch_days)
+        except Exception:
+            # Same fallback as cached_call_resilient: stale data beats no data
+            values = []
+            for key, _ in chunk:
+                stale = get_cached(key, ttl=STALE_TTL)
+                if stale is None:
+                    raise
+                values.append(stale)
+        else:
+            for (key, _), value in zip(chunk, values):
+                set_cached(key, value)
+        for (_, indexes), value in zip(chunk, values):
+            value = _slice_days(value, forecast_days)
+            for i in indexes:
+                results[i] = value
+
+    return results
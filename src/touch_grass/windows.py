@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+_FOREVER = float("inf")
+
+
+def _worst(timeline, start: int, stop: int) -> dict:
+    """Worst readings over hours [start, stop) of a timeline."""
+    def peak(name: str):
+        return max((v for v in timeline.column(name)[start:stop] if v is not None), default=None)
+
+    temps = [v for v in timeline.column("temperature")[start:stop] if v is not None]
+    return {
+        "min_temp": min(temps, default=None),
+        "max_temp": max(temps, default=None),
+        "peak_uv": peak("uv_index"),
+        "max_rain": peak("rain"),
+        "max_wind": peak("wind_speed"),
+        "peak_eu_aqi": peak("european_aqi"),
+        "peak_us_aqi": peak("us_aqi"),
+    }
+
+
+def _clock_minutes(value: str) -> int:
+    hours, minutes = value.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def _hour_overlaps_clock(minute: int, lo: int, hi: int) -> bool:
+    """Does the hour starting at `minute` past midnight overlap [lo, hi)? Ranges may wrap midnight."""
+    if lo < hi:
+        return minute < hi and lo < minute + 60
+    return minute < hi or minute + 60 > lo
+
+
+@dataclass(frozen=True)
+class SafeWindow:
+    """A run of contiguous safe hours, [start, end) in local time."""
+
+    start: str
+    end: str
+    hours: int
+    worst: dict
+
+    def as_dict(self) -> dict:
+        return {
+            "start": self.start,
+            "end": self.end,
+            "hours": self.hours,
+            "label": datetime.fromisoformat(self.start).strftime("%a %I:%M %p").replace(" 0", " "),
+            "worst": self.worst,
+        }
+
+
+class WindowIndex:
+    """Contiguous safe runs over a timeline, built by conditions.safe_windows().
+
+    Runs are (start, stop) hour-index pairs. Queries work on the run list; hourly
+    data is only re-read to recompute the worst readings of a run that a query
+    clips (at "now" or at the end of a horizon).
+    """
+
+    def __init__(self, timeline, runs: list[tuple[int, int]]):
+        self.timeline = timeline
+        self.runs = runs
+        self._worst = [_worst(timeline, start, stop) for start, stop in runs]
+        self._run_ends = [timeline.epochs[stop - 1] for _, stop in runs]
+
+    def __len__(self) -> int:
+        return len(self.runs)
+
+    def _window(self, run: int, start: int, stop: int) -> SafeWindow:
+        times = self.timeline.times
+        if (start, stop) == self.runs[run]:
+            worst = self._worst[run]
+        else:
+            worst = _worst(self.timeline, start, stop)
+        end = (datetime.fromisoformat(times[stop - 1]) + timedelta(hours=1)).isoformat(timespec="minutes")
+        return SafeWindow(times[start][:16], end, stop - start, worst)
+
+    def _future(self, after: float | None):
+        """Yield (run, start, stop) for runs clipped to hours starting after `after`."""
+        if after is None:
+            for run, (start, stop) in enumerate(self.runs):
+                yield run, start, stop
+            return
+        first = self.timeline.first_after(after)
+        for run in range(bisect_right(self._run_ends, after), len(self.runs)):
+            start, stop = self.runs[run]
+            start = max(start, first)
+            if start < stop:
+                yield run, start, stop
+
+    def all(self, after: float | None = None) -> list[SafeWindow]:
+        return [self._window(run, start, stop) for run, start, stop in self._future(after)]
+
+    def next_window(self, min_hours: int = 1, after: float | None = None) -> SafeWindow | None:
+        """First window of at least min_hours hours, counting only hours starting after `after`."""
+        for run, start, stop in self._future(after):
+            if stop - start >= min_hours:
+                return self._window(run, start, stop)
+        return None
+
+    def longest_window(self, days: float | None = None, after: float | None = None) -> SafeWindow | None:
+        """Longest window among hours starting after `after` and less than `days` days later.
+
+        Ties go to the earliest window.
+        """
+        limit = after + days * 86400 if days is not None and after is not None else _FOREVER
+        epochs = self.timeline.epochs
+        best = None
+        for run, start, stop in self._future(after):
+            if epochs[start] >= limit:
+                break
+            stop = bisect_left(epochs, limit, start, stop)
+            if best is None or stop - start > best[2] - best[1]:
+                best = (run, start, stop)
+        return self._window(*best) if best is not None else None
+
+    def overlapping(self, clock_start: str, clock_end: str, after: float | None = None) -> list[SafeWindow]:
+        """Windows with at least one hour inside the daily local clock range [clock_start, clock_end).
+
+        The range may wrap midnight ("22:00"-"01:00"); clock_end may be "24:00".
+        Raises ValueError for an empty range (start == end).
+        """
+        lo, hi = _clock_minutes(clock_start), _clock_minutes(clock_end)
+        if lo == hi or not (0 <= lo < 1440 and 0 < hi <= 1440):
+            raise ValueError(f"invalid clock range {clock_start}-{clock_end}")
+        times = self.timeline.times
+        matches = []
+        for run, start, stop in self._future(after):
+            first = _clock_minutes(times[start][11:16])
+            if any(_hour_overlaps_clock((first + 60 * k) % 1440, lo, hi) for k in range(min(stop - start, 24))):
+                matches.append(self._window(run, start, stop))
+        return matches
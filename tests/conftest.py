@@ -1,15 +1,20 @@
 import pytest
 
-from touch_grass.cache import clear_cache
+from touch_grass.cache import clear_cache, set_revalidate_grace
 from touch_grass.config import DEFAULT_THRESHOLDS
 from touch_grass import conditions
+from touch_grass.timeline import clear_timelines
 
 
 @pytest.fixture(autouse=True)
-def reset_state():
-    """Clear cache and reset thresholds before/after every test."""
+def reset_state(tmp_path, monkeypatch):
+    """Isolate the config dir, clear caches and reset thresholds before/after every test."""
+    monkeypatch.setenv("TOUCH_GRASS_CONFIG_DIR", str(tmp_path / "config"))
     clear_cache()
+    clear_timelines()
     conditions.apply_thresholds(dict(DEFAULT_THRESHOLDS))
     yield
     clear_cache()
+    clear_timelines()
+    set_revalidate_grace(0)
     conditions.apply_thresholds(dict(DEFAULT_THRESHOLDS))
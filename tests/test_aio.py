@@ -0,0 +1,216 @@
+import asyncio
+import threading
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from aiohttp import ClientResponseError, web
+
+from touch_grass import aio, cache, session
+from touch_grass.aio import (
+    _backoff,
+    async_get_air_quality,
+    async_get_location,
+    async_get_weather,
+    async_http_get_json,
+    close_async_session,
+    get_async_session,
+)
+from touch_grass.cache import set_cached
+from touch_grass.weather import get_weather
+
+WEATHER_JSON = {
+    "current": {"temperature_2m": 21.0, "rain": 0.0, "uv_index": 2.0, "windspeed_10m": 5.0},
+    "hourly": {
+        "time": ["2026-02-15T12:00", "2026-02-15T13:00"],
+        "temperature_2m": [21.0, 22.0],
+        "rain": [0.0, 0.0],
+        "uv_index": [2.0, 1.0],
+        "windspeed_10m": [5.0, 6.0],
+    },
+    "timezone": "UTC",
+}
+AIR_QUALITY_JSON = {
+    "current": {"european_aqi": 20, "us_aqi": 30},
+    "hourly": {"time": ["2026-02-15T12:00"], "european_aqi": [20], "us_aqi": [30]},
+}
+
+
+@patch("touch_grass.aio.async_http_get_json", new_callable=AsyncMock, return_value=WEATHER_JSON)
+def test_async_get_weather_parses_and_shares_sync_cache(mock_get):
+    async def run():
+        return await async_get_weather(45.52, -122.68), await async_get_weather(45.52, -122.68)
+
+    first, second = asyncio.run(run())
+
+    assert first is second
+    assert first["current"]["temperature"] == 21.0
+    assert first["hourly"][1]["wind_speed"] == 6.0
+    assert mock_get.await_count == 1
+    with patch("touch_grass.weather.http_get") as sync_get:
+        assert get_weather(45.52, -122.68) is first
+    sync_get.assert_not_called()
+
+
+@patch("touch_grass.aio.async_http_get_json", new_callable=AsyncMock, return_value=AIR_QUALITY_JSON)
+def test_async_get_air_quality_parses(mock_get):
+    result = asyncio.run(async_get_air_quality(45.52, -122.68))
+    assert result["current"] == {"european_aqi": 20, "us_aqi": 30}
+    assert mock_get.await_args.args[1]["hourly"] == "european_aqi,us_aqi"
+
+
+def test_concurrent_async_misses_share_one_fetch():
+    calls = 0
+
+    async def fetch(url, params=None, timeout=10):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return WEATHER_JSON
+
+    async def run():
+        return await asyncio.gather(*(async_get_weather(45.52, -122.68) for _ in range(50)))
+
+    with patch("touch_grass.aio.async_http_get_json", side_effect=fetch):
+        results = asyncio.run(run())
+
+    assert calls == 1
+    assert all(r is results[0] for r in results)
+
+
+@patch("touch_grass.aio.async_http_get_json", new_callable=AsyncMock, side_effect=OSError("down"))
+def test_async_get_weather_falls_back_to_stale_cache(mock_get):
+    stale = {"current": {"temperature": 1}, "hourly": [], "timezone": "UTC"}
+    with patch("touch_grass.cache.time.time", return_value=1000.0):
+        set_cached("weather:45.52:-122.68:1", stale)
+    with patch("touch_grass.cache.time.time", return_value=1000.0 + 3600):
+        assert asyncio.run(async_get_weather(45.52, -122.68)) == stale
+    with pytest.raises(OSError):
+        asyncio.run(async_get_weather(1.0, 1.0))
+
+
+@patch("touch_grass.aio.async_http_get_json", new_callable=AsyncMock)
+def test_async_get_location_parses_response(mock_get):
+    mock_get.return_value = {"city": "Portland", "region": "Oregon", "country": "US", "loc": "45.52,-122.68"}
+    loc = asyncio.run(async_get_location())
+    assert loc == {"city": "Portland", "region": "Oregon", "country": "US", "latitude": 45.52, "longitude": -122.68}
+
+
+def test_async_http_get_json_retries_then_raises(monkeypatch):
+    monkeypatch.setitem(session._SETTINGS, "backoff_factor", 0)
+    monkeypatch.setitem(session._SETTINGS, "backoff_jitter", 0)
+    statuses = [503, 200]
+    seen = []
+
+    async def handler(request):
+        seen.append(dict(request.query))
+        status = statuses.pop(0) if statuses else 404
+        return web.json_response({"ok": status == 200}, status=status)
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        url = f"http://127.0.0.1:{runner.addresses[0][1]}/"
+        try:
+            ok = await async_http_get_json(url, {"days": 2})
+            with pytest.raises(ClientResponseError):
+                await async_http_get_json(url)
+        finally:
+            await close_async_session()
+            await runner.cleanup()
+        return ok
+
+    assert asyncio.run(run()) == {"ok": True}
+    assert seen[0] == {"days": "2"}
+    assert len(seen) == 3
+
+
+def test_backoff_caps_retry_after():
+    assert _backoff(0, "3600") == session.RETRY_AFTER_MAX
+    assert _backoff(0, "2") == 2
+
+
+def test_async_http_get_json_retries_read_timeout_once(monkeypatch):
+    monkeypatch.setitem(session._SETTINGS, "backoff_factor", 0)
+    monkeypatch.setitem(session._SETTINGS, "backoff_jitter", 0)
+    seen = []
+
+    async def handler(request):
+        seen.append(1)
+        await asyncio.sleep(0.3)
+        return web.json_response({})
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                await async_http_get_json(f"http://127.0.0.1:{runner.addresses[0][1]}/", timeout=0.05)
+        finally:
+            await close_async_session()
+            await runner.cleanup()
+
+    asyncio.run(run())
+    assert len(seen) == 1 + session.READ_RETRIES
+
+
+def test_disk_cache_io_runs_off_the_event_loop():
+    io_threads = []
+    disk_read, disk_write = cache._disk_read, cache._disk_write
+
+    def record_read(*args):
+        io_threads.append(threading.current_thread())
+        return disk_read(*args)
+
+    def record_write(*args):
+        io_threads.append(threading.current_thread())
+        return disk_write(*args)
+
+    async def run():
+        await async_get_weather(45.52, -122.68, forecast_days=2)
+        cache._CACHE.clear()  # the next call has to read disk
+        await async_get_weather(45.52, -122.68)
+        return threading.current_thread()
+
+    with patch("touch_grass.aio.async_http_get_json", new_callable=AsyncMock, return_value=WEATHER_JSON), \
+            patch("touch_grass.cache._disk_read", side_effect=record_read), \
+            patch("touch_grass.cache._disk_write", side_effect=record_write):
+        loop_thread = asyncio.run(run())
+
+    assert io_threads
+    assert loop_thread not in io_threads
+
+
+def test_session_is_closed_and_released_when_the_loop_shuts_down():
+    async def run():
+        first = await get_async_session()
+        assert await get_async_session() is first
+        return first
+
+    session = asyncio.run(run())
+    assert session.closed
+    assert not aio._SESSIONS
+
+
+def test_close_async_session_releases_the_entry():
+    async def run():
+        session = await get_async_session()
+        await close_async_session()
+        assert not aio._SESSIONS
+        reopened = await get_async_session()
+        assert reopened is not session
+        return session, reopened
+
+    session, reopened = asyncio.run(run())
+    assert session.closed and reopened.closed
+    assert not aio._SESSIONS
@@ -0,0 +1,184 @@
+import io
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import requests
+import pytest
+from click.testing import CliRunner
+
+from touch_grass.batch import evaluate_location, evaluate_many, read_locations
+from touch_grass.cli import main
+from touch_grass.config import DEFAULT_THRESHOLDS
+
+SAFE_WEATHER = {
+    "current": {"temperature": 22, "uv_index": 2, "rain": 0, "wind_speed": 10},
+    "hourly": [],
+    "timezone": "UTC",
+}
+UNSAFE_WEATHER = {
+    "current": {"temperature": 40, "uv_index": 8, "rain": 5, "wind_speed": 10},
+    "hourly": [],
+    "timezone": "UTC",
+}
+SAFE_AQ = {
+    "current": {"european_aqi": 20, "us_aqi": 40},
+    "hourly": [],
+}
+
+
+@pytest.fixture(autouse=True)
+def no_prefetch():
+    """Per-location fetches are mocked below; keep the multi-point prefetch offline."""
+    with patch("touch_grass.batch.get_weather_many"), patch("touch_grass.batch.get_air_quality_many"):
+        yield
+
+
+def test_read_locations_csv():
+    f = io.StringIO("name,lat,lon\nHQ,45.52,-122.68\nPark,40.71,-74.01\n")
+    locations = list(read_locations(f, "sites.csv"))
+    assert locations[0] == {"city": "HQ", "region": "", "country": "", "latitude": 45.52, "longitude": -122.68}
+    assert locations[1]["longitude"] == -74.01
+
+
+def test_read_locations_jsonl():
+    f = io.StringIO('{"city": "Portland", "latitude": 45.52, "longitude": -122.68}\n\n{"lat": 1, "lng": 2}\n')
+    locations = list(read_locations(f, "sites.jsonl"))
+    assert len(locations) == 2
+    assert locations[0]["city"] == "Portland"
+    assert locations[1]["city"] == "Custom"
+    assert (locations[1]["latitude"], locations[1]["longitude"]) == (1.0, 2.0)
+
+
+def test_read_locations_reports_invalid_rows_inline():
+    f = io.StringIO("lat,lon\n95,0\nabc,1\n10,20\n")
+    locations = list(read_locations(f, "sites.csv"))
+    assert isinstance(locations[0], ValueError)
+    assert "line 2" in str(locations[0])
+    assert isinstance(locations[1], ValueError)
+    assert locations[2]["latitude"] == 10.0
+
+
+def test_read_locations_reports_non_numeric_jsonl_values_inline():
+    f = io.StringIO('{"lat": [1], "lon": 2}\n{"lat": {}, "lon": 2}\n{"lat": true, "lon": 2}\n{"lat": 1, "lon": 2}\n')
+    locations = list(read_locations(f, "sites.jsonl"))
+    for lineno, error in enumerate(locations[:3], start=1):
+        assert isinstance(error, ValueError)
+        assert str(error) == f"line {lineno}: latitude/longitude must be numbers"
+    assert locations[3]["latitude"] == 1.0
+
+
+def test_read_locations_sniffs_jsonl_without_suffix():
+    f = io.StringIO('{"lat": 1, "lon": 2}\n')
+    assert list(read_locations(f, "sites.txt"))[0]["latitude"] == 1.0
+
+
+@patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ)
+@patch("touch_grass.weather.get_weather", return_value=SAFE_WEATHER)
+def test_evaluate_many_yields_every_location(mock_weather, mock_aq):
+    entries = [{"city": str(i), "region": "", "country": "", "latitude": i, "longitude": i} for i in range(20)]
+    results = list(evaluate_many(entries, dict(DEFAULT_THRESHOLDS), concurrency=4))
+    assert sorted(r["index"] for r in results) == list(range(20))
+    assert all(r["safe"] for r in results)
+
+
+def test_evaluate_many_bounds_in_flight_work():
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def slow_weather(*args, **kwargs):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.01)
+        with lock:
+            in_flight -= 1
+        return SAFE_WEATHER
+
+    entries = ({"city": "x", "region": "", "country": "", "latitude": 0, "longitude": 0} for _ in range(30))
+    with patch("touch_grass.weather.get_weather", side_effect=slow_weather), \
+            patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ):
+        results = list(evaluate_many(entries, dict(DEFAULT_THRESHOLDS), concurrency=3))
+    assert len(results) == 30
+    assert peak <= 3
+
+
+def test_evaluate_location_fetches_weather_and_air_quality_concurrently():
+    # Each fetch waits for the other to start; a sequential fetch breaks the barrier
+    barrier = threading.Barrier(2, timeout=2)
+
+    def weather(*args, **kwargs):
+        barrier.wait()
+        return SAFE_WEATHER
+
+    def air_quality(*args, **kwargs):
+        barrier.wait()
+        return SAFE_AQ
+
+    location = {"city": "x", "region": "", "country": "", "latitude": 0, "longitude": 0}
+    with patch("touch_grass.weather.get_weather", side_effect=weather), \
+            patch("touch_grass.weather.get_air_quality", side_effect=air_quality):
+        payload = evaluate_location(location, dict(DEFAULT_THRESHOLDS))
+    assert payload["safe"] is True
+
+
+@patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ)
+@patch("touch_grass.weather.get_weather", side_effect=requests.exceptions.ConnectionError("refused"))
+def test_evaluate_many_reports_network_errors_per_location(mock_weather, mock_aq):
+    entries = [{"city": "x", "region": "", "country": "", "latitude": 0, "longitude": 0}]
+    (result,) = evaluate_many(entries, dict(DEFAULT_THRESHOLDS))
+    assert result["error_type"] == "network"
+    assert "Network error" in result["error"]
+
+
+# --- CLI ---
+
+
+@patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ)
+@patch("touch_grass.weather.get_weather", side_effect=[SAFE_WEATHER, UNSAFE_WEATHER])
+def test_cli_locations_file_streams_ndjson(mock_weather, mock_aq, tmp_path):
+    path = tmp_path / "sites.csv"
+    path.write_text("name,lat,lon\nHQ,45.52,-122.68\nPark,40.71,-74.01\n")
+    result = CliRunner().invoke(main, ["--locations-file", str(path), "--concurrency", "1"], catch_exceptions=False)
+    lines = [json.loads(line) for line in result.output.splitlines()]
+    assert [line["location"]["city"] for line in lines] == ["HQ", "Park"]
+    assert [line["safe"] for line in lines] == [True, False]
+    assert result.exit_code == 10
+
+
+@patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ)
+@patch("touch_grass.weather.get_weather", return_value=SAFE_WEATHER)
+def test_cli_locations_file_invalid_row_exit_code(mock_weather, mock_aq, tmp_path):
+    path = tmp_path / "sites.jsonl"
+    path.write_text('{"lat": 45.52, "lon": -122.68}\n{"lat": 200, "lon": 0}\n')
+    result = CliRunner().invoke(main, ["--locations-file", str(path)], catch_exceptions=False)
+    lines = [json.loads(line) for line in result.output.splitlines()]
+    assert len(lines) == 2
+    assert result.exit_code == 30
+
+
+def test_cli_locations_file_missing():
+    result = CliRunner().invoke(main, ["--locations-file", "/nonexistent.csv"])
+    assert result.exit_code == 30
+    assert "locations file" in result.output
+
+
+def test_cli_locations_file_rejects_lat_lon(tmp_path):
+    path = tmp_path / "sites.csv"
+    path.write_text("lat,lon\n1,2\n")
+    result = CliRunner().invoke(main, ["--locations-file", str(path), "--lat", "1", "--lon", "2"])
+    assert result.exit_code == 30
+
+
+def test_evaluate_many_prefetches_in_chunks():
+    entries = [{"city": "x", "region": "", "country": "", "latitude": i, "longitude": i} for i in range(5)]
+    with patch("touch_grass.batch.get_weather_many") as mock_many, \
+            patch("touch_grass.batch.get_air_quality_many"), \
+            patch("touch_grass.weather.get_weather", return_value=SAFE_WEATHER), \
+            patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ):
+        results = list(evaluate_many(entries + [ValueError("bad")], dict(DEFAULT_THRESHOLDS), chunk_size=2))
+    assert len(results) == 6
+    assert [call.args[0] for call in mock_many.call_args_list] == [[(0, 0), (1, 1)], [(2, 2), (3, 3)], [(4, 4)]]
@@ -1,3 +1,8 @@
+import os
+import threading
+import time
+from unittest.mock import patch
+
 import pytest
 
 from touch_grass import cache
@@ -30,3 +35,220 @@ def test_cached_call_resilient_raises_without_cache():
             ttl=0,
             stale_ttl=3600,
         )
+
+
+def test_cached_call_persists_across_processes():
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return {"ok": True}
+
+    cache.cached_call_resilient("k3", fetch)
+    # Simulate a fresh process: memory is empty, disk entry remains
+    cache._CACHE.clear()
+    value = cache.cached_call_resilient("k3", fetch)
+
+    assert value == {"ok": True}
+    assert len(calls) == 1
+
+
+def test_disk_entry_respects_ttl():
+    cache.cached_call("k4", lambda: 1)
+    cache._CACHE.clear()
+    assert cache.cached_call("k4", lambda: 2, ttl=0) == 2
+
+
+def test_disk_entry_used_as_stale_fallback():
+    cache.cached_call_resilient("k5", lambda: {"ok": True})
+    cache._CACHE.clear()
+    value = cache.cached_call_resilient(
+        "k5",
+        lambda: (_ for _ in ()).throw(RuntimeError("boom")),
+        ttl=0,
+        stale_ttl=3600,
+    )
+    assert value == {"ok": True}
+
+
+def test_disk_cache_can_be_disabled(monkeypatch):
+    monkeypatch.setenv("TOUCH_GRASS_DISK_CACHE", "0")
+    cache.cached_call("k6", lambda: 1)
+    cache._CACHE.clear()
+    assert cache.cached_call("k6", lambda: 2) == 2
+    assert not cache._cache_dir().exists()
+
+
+def test_clear_cache_removes_disk_entries():
+    cache.cached_call("k7", lambda: 1)
+    cache.clear_cache()
+    assert cache.cached_call("k7", lambda: 2) == 2
+
+
+def test_disk_prune_removes_files_older_than_stale_ttl():
+    cache.set_cached("old", 1)
+    cache.set_cached("new", 2)
+    old_path = cache._cache_path("old")
+    long_ago = time.time() - cache.STALE_TTL - 60
+    os.utime(old_path, (long_ago, long_ago))
+
+    # The first write already swept; the marker suppresses another sweep
+    assert cache._prune_disk(cache._cache_dir()) == 0
+    assert old_path.exists()
+
+    marker = cache._cache_dir() / cache.PRUNE_MARKER
+    os.utime(marker, (long_ago, long_ago))
+    cache.set_cached("newer", 3)
+    assert not old_path.exists()
+    assert cache._cache_path("new").exists()
+
+
+def test_purge_expired_sweeps_disk():
+    cache.set_cached("old", 1)
+    long_ago = time.time() - cache.STALE_TTL - 60
+    os.utime(cache._cache_path("old"), (long_ago, long_ago))
+    cache.purge_expired()
+    assert not cache._cache_path("old").exists()
+
+
+def _herd(fn, callers=8):
+    """Run cached_call_resilient for one key from several threads at once."""
+    barrier = threading.Barrier(callers)
+    outcomes = [None] * callers
+
+    def call(i):
+        barrier.wait()
+        try:
+            outcomes[i] = cache.cached_call_resilient("herd", fn)
+        except Exception as e:
+            outcomes[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(callers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return outcomes
+
+
+def test_concurrent_misses_share_one_fetch():
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.1)
+        return {"ok": True}
+
+    outcomes = _herd(fetch)
+    assert len(calls) == 1
+    assert all(o is outcomes[0] for o in outcomes)
+
+
+def test_concurrent_misses_share_the_error():
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.1)
+        raise RuntimeError("boom")
+
+    outcomes = _herd(fetch)
+    assert len(calls) == 1
+    assert all(isinstance(o, RuntimeError) for o in outcomes)
+    assert cache._INFLIGHT == {}
+
+
+def test_refresh_skips_fetch_when_another_flight_just_stored():
+    cache.set_cached("k8", 1)
+    assert cache._refresh("k8", lambda: 2, ttl=60) == 1
+
+
+def test_stale_while_revalidate_returns_immediately_and_refreshes_once():
+    cache.set_cached("swr", "old")
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return "new"
+
+    # Past ttl (0) but inside the grace window: stale value without blocking on fetch
+    assert cache.cached_call_resilient("swr", fetch, ttl=0, grace=60) == "old"
+    assert cache.cached_call_resilient("swr", fetch, ttl=0, grace=60) == "old"
+    thread = cache._REVALIDATING["swr"]
+    release.set()
+    thread.join(5)
+    assert len(calls) == 1
+    assert cache.get_cached("swr") == "new"
+    assert "swr" not in cache._REVALIDATING
+
+
+def test_stale_while_revalidate_is_off_by_default():
+    cache.set_cached("swr2", "old")
+    assert cache.cached_call_resilient("swr2", lambda: "new", ttl=0) == "new"
+
+
+def test_revalidate_grace_setting_and_failed_refresh():
+    cache.set_cached("swr3", "old")
+    cache.set_revalidate_grace(60)
+
+    def fetch():
+        raise RuntimeError("boom")
+
+    assert cache.cached_call_resilient("swr3", fetch, ttl=0) == "old"
+    thread = cache._REVALIDATING.get("swr3")
+    if thread is not None:
+        thread.join(5)
+    # A failed background refresh keeps the stale entry
+    assert cache.get_cached("swr3", ttl=3600) == "old"
+
+
+def test_memory_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setenv("TOUCH_GRASS_DISK_CACHE", "0")
+    monkeypatch.setattr(cache, "_CACHE", cache._MemoryCache(max_entries=2))
+    cache.set_cached("a", 1)
+    cache.set_cached("b", 2)
+    assert cache.get_cached("a") == 1  # "a" is now most recently used
+    cache.set_cached("c", 3)
+    assert cache.get_cached("b") is None
+    assert cache.get_cached("a") == 1
+    stats = cache.cache_stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+
+
+def test_memory_cache_respects_byte_budget(monkeypatch):
+    monkeypatch.setenv("TOUCH_GRASS_DISK_CACHE", "0")
+    monkeypatch.setattr(cache, "_CACHE", cache._MemoryCache())
+    cache.configure_cache(max_bytes=1000)
+    for i in range(10):
+        cache.set_cached(f"k{i}", "x" * 300)
+    stats = cache.cache_stats()
+    assert stats["bytes"] <= 1000
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 8
+    assert cache.get_cached("k9") == "x" * 300
+
+
+def test_purge_expired_drops_entries_past_stale_ttl(monkeypatch):
+    monkeypatch.setenv("TOUCH_GRASS_DISK_CACHE", "0")
+    monkeypatch.setattr(cache, "_CACHE", cache._MemoryCache())
+    cache.set_cached("fresh", 1)
+    cache._CACHE.put("old", time.time() - cache.STALE_TTL - 1, 2, 10)
+    assert cache.purge_expired() == 1
+    assert len(cache._CACHE) == 1
+    assert cache.cache_stats()["expirations"] == 1
+
+
+def test_entries_stored_with_longer_retention_outlive_stale_ttl():
+    cache.set_cached("short", 1)
+    cache.set_cached("long", 2, keep=cache.STALE_TTL * 10)
+    later = time.time() + cache.STALE_TTL + 60
+    with patch("touch_grass.cache.time.time", return_value=later):
+        assert cache.purge_expired() == 1
+    assert not cache._cache_path("short").exists()
+    assert cache._cache_path("long").exists()
+    assert cache.get_cached("long", ttl=cache.STALE_TTL * 10) == 2
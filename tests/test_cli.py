@@ -1,6 +1,7 @@
 import json
 import os
 import tempfile
+import time
 from unittest.mock import patch
 
 import pytest
@@ -8,6 +9,7 @@ import requests
 from click.testing import CliRunner
 
 from touch_grass.cli import main
+from touch_grass.config import DEFAULT_THRESHOLDS
 
 SAFE_WEATHER = {
     "current": {"temperature": 22, "uv_index": 2, "rain": 0, "wind_speed": 10},
@@ -32,8 +34,8 @@ LOCATION = {
 }
 
 
-@patch("touch_grass.cli.get_air_quality", return_value=SAFE_AQ)
-@patch("touch_grass.cli.get_weather", return_value=SAFE_WEATHER)
+@patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ)
+@patch("touch_grass.weather.get_weather", return_value=SAFE_WEATHER)
 @patch("touch_grass.cli.get_location", return_value=LOCATION)
 def test_safe_conditions(mock_loc, mock_weather, mock_aq):
     result = CliRunner().invoke(main, catch_exceptions=False)
@@ -42,8 +44,8 @@ def test_safe_conditions(mock_loc, mock_weather, mock_aq):
 
 
 @patch("touch_grass.cli.find_next_safe_window", return_value=None)
-@patch("touch_grass.cli.get_air_quality", return_value=SAFE_AQ)
-@patch("touch_grass.cli.get_weather", return_value=UNSAFE_WEATHER)
+@patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ)
+@patch("touch_grass.weather.get_weather", return_value=UNSAFE_WEATHER)
 @patch("touch_grass.cli.get_location", return_value=LOCATION)
 def test_unsafe_conditions(mock_loc, mock_weather, mock_aq, mock_window):
     result = CliRunner().invoke(main, catch_exceptions=False)
@@ -53,8 +55,8 @@ def test_unsafe_conditions(mock_loc, mock_weather, mock_aq, mock_window):
 
 @patch("touch_grass.cli.forecast_days", return_value=[])
 @patch("touch_grass.cli.find_next_safe_window", return_value="4:00 PM")
-@patch("touch_grass.cli.get_air_quality", return_value=SAFE_AQ)
-@patch("touch_grass.cli.get_weather", return_value=UNSAFE_WEATHER)
+@patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ)
+@patch("touch_grass.weather.get_weather", return_value=UNSAFE_WEATHER)
 @patch("touch_grass.cli.get_location", return_value=LOCATION)
 def test_json_output_and_unsafe_exit_code(mock_loc, mock_weather, mock_aq, mock_window, mock_forecast):
     result = CliRunner().invoke(main, ["--json"], catch_exceptions=False)
@@ -64,8 +66,8 @@ def test_json_output_and_unsafe_exit_code(mock_loc, mock_weather, mock_aq, mock_
     assert payload["next_safe_window"] == "4:00 PM"
 
 
-@patch("touch_grass.cli.get_air_quality", return_value=SAFE_AQ)
-@patch("touch_grass.cli.get_weather", return_value=SAFE_WEATHER)
+@patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ)
+@patch("touch_grass.weather.get_weather", return_value=SAFE_WEATHER)
 def test_lat_lon_skips_geolocation(mock_weather, mock_aq):
     result = CliRunner().invoke(main, ["--lat", "45.52", "--lon", "-122.68"], catch_exceptions=False)
     assert result.exit_code == 0
@@ -75,25 +77,28 @@ def test_lat_lon_skips_geolocation(mock_weather, mock_aq):
 # --- Error handling ---
 
 
-@patch("touch_grass.cli.get_weather", side_effect=KeyError("hourly"))
+@patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ)
+@patch("touch_grass.weather.get_weather", side_effect=KeyError("hourly"))
 @patch("touch_grass.cli.get_location", return_value=LOCATION)
-def test_key_error_shows_missing_field(mock_loc, mock_weather):
+def test_key_error_shows_missing_field(mock_loc, mock_weather, mock_aq):
     result = CliRunner().invoke(main)
     assert result.exit_code != 0
     assert "missing field" in result.output
 
 
-@patch("touch_grass.cli.get_weather", side_effect=ValueError("bad float"))
+@patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ)
+@patch("touch_grass.weather.get_weather", side_effect=ValueError("bad float"))
 @patch("touch_grass.cli.get_location", return_value=LOCATION)
-def test_value_error_shows_parse_error(mock_loc, mock_weather):
+def test_value_error_shows_parse_error(mock_loc, mock_weather, mock_aq):
     result = CliRunner().invoke(main)
     assert result.exit_code != 0
     assert "parse API response" in result.output
 
 
-@patch("touch_grass.cli.get_weather", side_effect=requests.exceptions.ConnectionError("refused"))
+@patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ)
+@patch("touch_grass.weather.get_weather", side_effect=requests.exceptions.ConnectionError("refused"))
 @patch("touch_grass.cli.get_location", return_value=LOCATION)
-def test_network_error_exits(mock_loc, mock_weather):
+def test_network_error_exits(mock_loc, mock_weather, mock_aq):
     result = CliRunner().invoke(main)
     assert result.exit_code != 0
     assert "Network error" in result.output
@@ -102,29 +107,29 @@ def test_network_error_exits(mock_loc, mock_weather):
 # --- Boundary coordinates ---
 
 
-@patch("touch_grass.cli.get_air_quality", return_value=SAFE_AQ)
-@patch("touch_grass.cli.get_weather", return_value=SAFE_WEATHER)
+@patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ)
+@patch("touch_grass.weather.get_weather", return_value=SAFE_WEATHER)
 def test_boundary_lat_positive_90(mock_weather, mock_aq):
     result = CliRunner().invoke(main, ["--lat", "90", "--lon", "0"], catch_exceptions=False)
     assert result.exit_code == 0
 
 
-@patch("touch_grass.cli.get_air_quality", return_value=SAFE_AQ)
-@patch("touch_grass.cli.get_weather", return_value=SAFE_WEATHER)
+@patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ)
+@patch("touch_grass.weather.get_weather", return_value=SAFE_WEATHER)
 def test_boundary_lat_negative_90(mock_weather, mock_aq):
     result = CliRunner().invoke(main, ["--lat", "-90", "--lon", "0"], catch_exceptions=False)
     assert result.exit_code == 0
 
 
-@patch("touch_grass.cli.get_air_quality", return_value=SAFE_AQ)
-@patch("touch_grass.cli.get_weather", return_value=SAFE_WEATHER)
+@patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ)
+@patch("touch_grass.weather.get_weather", return_value=SAFE_WEATHER)
 def test_boundary_lon_positive_180(mock_weather, mock_aq):
     result = CliRunner().invoke(main, ["--lat", "0", "--lon", "180"], catch_exceptions=False)
     assert result.exit_code == 0
 
 
-@patch("touch_grass.cli.get_air_quality", return_value=SAFE_AQ)
-@patch("touch_grass.cli.get_weather", return_value=SAFE_WEATHER)
+@patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ)
+@patch("touch_grass.weather.get_weather", return_value=SAFE_WEATHER)
 def test_boundary_lon_negative_180(mock_weather, mock_aq):
     result = CliRunner().invoke(main, ["--lat", "0", "--lon", "-180"], catch_exceptions=False)
     assert result.exit_code == 0
@@ -145,8 +150,8 @@ def test_boundary_lon_out_of_range():
 # --- --config option ---
 
 
-@patch("touch_grass.cli.get_air_quality", return_value=SAFE_AQ)
-@patch("touch_grass.cli.get_weather", return_value=SAFE_WEATHER)
+@patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ)
+@patch("touch_grass.weather.get_weather", return_value=SAFE_WEATHER)
 def test_cli_config_option_valid_file(mock_weather, mock_aq):
     with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
         json.dump({"temp_max": 30}, f)
@@ -174,8 +179,8 @@ def test_cli_config_path_directory_exits():
     assert "Configuration error" in result.output
 
 
-@patch("touch_grass.cli.get_air_quality", return_value=SAFE_AQ)
-@patch("touch_grass.cli.get_weather", return_value=SAFE_WEATHER)
+@patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ)
+@patch("touch_grass.weather.get_weather", return_value=SAFE_WEATHER)
 def test_cli_env_var_threshold(mock_weather, mock_aq):
     env = os.environ.copy()
     env["TOUCH_GRASS_TEMP_MAX"] = "25"
@@ -189,8 +194,8 @@ def test_cli_env_var_threshold(mock_weather, mock_aq):
     assert "Go touch grass!" in result.output
 
 
-@patch("touch_grass.cli.get_air_quality", return_value=SAFE_AQ)
-@patch("touch_grass.cli.get_weather", return_value=SAFE_WEATHER)
+@patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ)
+@patch("touch_grass.weather.get_weather", return_value=SAFE_WEATHER)
 def test_configure_skip_uses_defaults_and_saves(mock_weather, mock_aq):
     with tempfile.TemporaryDirectory() as tmpdir:
         env = os.environ.copy()
@@ -207,8 +212,8 @@ def test_configure_skip_uses_defaults_and_saves(mock_weather, mock_aq):
         assert os.path.exists(os.path.join(tmpdir, "thresholds.json"))
 
 
-@patch("touch_grass.cli.get_air_quality", return_value=SAFE_AQ)
-@patch("touch_grass.cli.get_weather", return_value=SAFE_WEATHER)
+@patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ)
+@patch("touch_grass.weather.get_weather", return_value=SAFE_WEATHER)
 def test_configure_custom_values_affect_result(mock_weather, mock_aq):
     with tempfile.TemporaryDirectory() as tmpdir:
         env = os.environ.copy()
@@ -228,8 +233,8 @@ def test_configure_custom_values_affect_result(mock_weather, mock_aq):
 
 @patch("touch_grass.cli.forecast_days")
 @patch("touch_grass.cli.find_next_safe_window", return_value="4:00 PM")
-@patch("touch_grass.cli.get_air_quality", return_value=SAFE_AQ)
-@patch("touch_grass.cli.get_weather", return_value=SAFE_WEATHER)
+@patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ)
+@patch("touch_grass.weather.get_weather", return_value=SAFE_WEATHER)
 @patch("touch_grass.cli.get_location", return_value=LOCATION)
 def test_forecast_json_output(mock_loc, mock_weather, mock_aq, mock_window, mock_forecast):
     mock_forecast.return_value = [
@@ -242,3 +247,124 @@ def test_forecast_json_output(mock_loc, mock_weather, mock_aq, mock_window, mock
     assert payload["forecast_count"] == 7
     assert len(payload["forecast_days"]) == 2
     assert payload["forecast_days"][0]["weekday"] == "Monday"
+
+
+@patch("touch_grass.weather.get_air_quality", side_effect=requests.exceptions.ConnectionError("refused"))
+@patch("touch_grass.weather.get_weather", return_value=SAFE_WEATHER)
+def test_air_quality_network_error_exits(mock_weather, mock_aq):
+    result = CliRunner().invoke(main, ["--lat", "45.52", "--lon", "-122.68"])
+    assert result.exit_code == 20
+    assert "Network error" in result.output
+
+
+@patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ)
+@patch("touch_grass.weather.get_weather", return_value=SAFE_WEATHER)
+def test_fetches_weather_and_air_quality_for_same_location(mock_weather, mock_aq):
+    result = CliRunner().invoke(main, ["--lat", "45.52", "--lon", "-122.68", "--forecast", "3"], catch_exceptions=False)
+    assert result.exit_code == 0
+    mock_weather.assert_called_once_with(45.52, -122.68, forecast_days=3)
+    mock_aq.assert_called_once_with(45.52, -122.68, forecast_days=3)
+
+
+@patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ)
+@patch("touch_grass.weather.get_weather", return_value=SAFE_WEATHER)
+def test_profiles_json_output(mock_weather, mock_aq, tmp_path):
+    strict = tmp_path / "strict.json"
+    strict.write_text(json.dumps({"uv_max": 1}))
+    result = CliRunner().invoke(
+        main,
+        ["--lat", "45.52", "--lon", "-122.68", "--json", "--profile", f"uv-sensitive={strict}", "--profile", f"default={tmp_path / 'missing.json'}"],
+    )
+    assert result.exit_code == 30
+
+    result = CliRunner().invoke(main, ["--lat", "45.52", "--lon", "-122.68", "--json", "--profile", f"uv-sensitive={strict}"], catch_exceptions=False)
+    assert result.exit_code == 0
+    payload = json.loads(result.output)
+    assert payload["safe"] is True
+    profile = payload["profiles"]["uv-sensitive"]
+    assert profile["safe"] is False
+    assert profile["thresholds"]["uv_max"] == 1
+    mock_weather.assert_called_once()
+
+
+@patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ)
+@patch("touch_grass.weather.get_weather", return_value=SAFE_WEATHER)
+def test_env_overrides_do_not_leak_into_profiles(mock_weather, mock_aq, tmp_path, monkeypatch):
+    monkeypatch.setenv("TOUCH_GRASS_UV_MAX", "9")
+    strict = tmp_path / "strict.json"
+    strict.write_text(json.dumps({"uv_max": 1}))
+    result = CliRunner().invoke(main, ["--lat", "45.52", "--lon", "-122.68", "--json", "--profile", f"uv-sensitive={strict}"], catch_exceptions=False)
+    payload = json.loads(result.output)
+    assert payload["thresholds"]["uv_max"] == 9
+    assert payload["profiles"]["uv-sensitive"]["thresholds"] == dict(DEFAULT_THRESHOLDS, uv_max=1)
+
+
+def test_profile_requires_name_and_path():
+    result = CliRunner().invoke(main, ["--lat", "45.52", "--lon", "-122.68", "--profile", "nopath"])
+    assert result.exit_code == 30
+    assert "NAME=PATH" in result.output
+
+
+def test_serve_bad_config_exits():
+    result = CliRunner().invoke(main, ["serve", "--config", "/nonexistent/thresholds.json"])
+    assert result.exit_code == 30
+    assert "Configuration error" in result.output
+
+
+def test_cli_rejects_invalid_grid():
+    env = os.environ.copy()
+    env["TOUCH_GRASS_GRID"] = "fine"
+    result = CliRunner().invoke(main, ["--lat", "45.52", "--lon", "-122.68"], env=env)
+    assert result.exit_code == 30
+    assert "TOUCH_GRASS_GRID" in result.output
+
+
+# --- Speculative prefetch ---
+
+
+@patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ)
+@patch("touch_grass.weather.get_weather", return_value=SAFE_WEATHER)
+@patch("touch_grass.cli.last_known_location", return_value=LOCATION)
+@patch("touch_grass.cli.cached_location", return_value=None)
+def test_prefetch_for_last_known_location_is_kept_when_it_matches(mock_cached, mock_last, mock_weather, mock_aq):
+    fetched_before_lookup_returned = []
+
+    def lookup():
+        deadline = time.monotonic() + 2
+        while not mock_weather.called and time.monotonic() < deadline:
+            time.sleep(0.001)
+        fetched_before_lookup_returned.append(mock_weather.called)
+        return dict(LOCATION, latitude=45.5201)
+
+    with patch("touch_grass.cli.get_location", side_effect=lookup):
+        result = CliRunner().invoke(main, ["--json"], catch_exceptions=False)
+
+    assert result.exit_code == 0
+    assert fetched_before_lookup_returned == [True]
+    mock_weather.assert_called_once_with(45.52, -122.68, forecast_days=1)
+    assert json.loads(result.output)["location"]["latitude"] == 45.5201
+
+
+@patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ)
+@patch("touch_grass.weather.get_weather", return_value=SAFE_WEATHER)
+@patch("touch_grass.cli.get_location", return_value=LOCATION)
+@patch("touch_grass.cli.last_known_location", return_value=dict(LOCATION, city="Seattle", latitude=47.61, longitude=-122.33))
+@patch("touch_grass.cli.cached_location", return_value=None)
+def test_prefetch_is_discarded_when_location_changed(mock_cached, mock_last, mock_loc, mock_weather, mock_aq):
+    result = CliRunner().invoke(main, ["--json"], catch_exceptions=False)
+    assert result.exit_code == 0
+    # The discarded prefetch for Seattle may still be running; Portland is fetched regardless
+    assert (45.52, -122.68) in [c.args for c in mock_weather.call_args_list]
+    assert json.loads(result.output)["location"]["city"] == "Portland"
+
+
+@patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ)
+@patch("touch_grass.weather.get_weather", return_value=SAFE_WEATHER)
+@patch("touch_grass.cli.get_location", return_value=LOCATION)
+@patch("touch_grass.cli.last_known_location")
+@patch("touch_grass.cli.cached_location", return_value=LOCATION)
+def test_no_prefetch_when_location_is_cached(mock_cached, mock_last, mock_loc, mock_weather, mock_aq):
+    result = CliRunner().invoke(main, ["--json"], catch_exceptions=False)
+    assert result.exit_code == 0
+    mock_last.assert_not_called()
+    mock_weather.assert_called_once()
@@ -1,13 +1,20 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
+import pytest
+
+from touch_grass import conditions
+from touch_grass.config import DEFAULT_THRESHOLDS
 from touch_grass.conditions import (
+    Evaluator,
     _hour_is_safe,
     check_condition,
     evaluate_current,
     find_next_safe_window,
+    forecast_days,
 )
 
 
@@ -171,6 +178,13 @@ def test_evaluate_current_us_aqi_unsafe():
     assert any(c["name"] == "us_air_quality" for c in unsafe)
 
 
+def test_evaluate_current_fails_when_eu_aqi_is_missing():
+    result = evaluate_current(*_make_data(aqi=None))
+    assert result["safe"] is False
+    missing = [c for c in result["checks"] if c["name"] == "air_quality"]
+    assert missing == [{"name": "air_quality", "value": None, "safe": False, "reason": "air_quality: data unavailable"}]
+
+
 # --- _hour_is_safe ---
 
 
@@ -308,3 +322,130 @@ def test_find_next_safe_window_uses_timezone():
     # The hour string is a UTC time labelled as New York — in test we just
     # verify it returns a string or None without crashing.
     assert result is None or ":" in result
+
+
+# --- forecast_days ---
+
+
+def _day_forecast(rows):
+    """Build weather + air_quality dicts from (hour, temp, uv, rain, wind, eu_aqi) tuples on one day."""
+    weather_hourly = []
+    aqi_hourly = []
+    for hour, temp, uv, rain, wind, eu in rows:
+        t = f"2026-03-09T{hour:02d}:00"
+        weather_hourly.append({"time": t, "temperature": temp, "uv_index": uv, "rain": rain, "wind_speed": wind})
+        aqi_hourly.append({"time": t, "european_aqi": eu})
+    return {"hourly": weather_hourly, "timezone": "UTC"}, {"hourly": aqi_hourly}
+
+
+def test_forecast_days_metrics_and_best_window():
+    weather, aq = _day_forecast([
+        (8, 10.5, 0, 0, 5, 20),
+        (9, 12, 1.5, 0, None, 30),
+        (10, None, 2, 0.4, 12, None),
+    ])
+    (day,) = forecast_days(weather, aq, 1)
+    assert day["date"] == "2026-03-09"
+    assert day["weekday"] == "Monday"
+    assert day["safe"] is True
+    assert day["best_window"] == "8:00 AM"
+    assert day["safe_hour_count"] == 2
+    assert day["metrics"] == {
+        "min_temp": 10.5,
+        "max_temp": 12,
+        "peak_uv": 2,
+        "max_rain": 0.4,
+        "max_wind": 12,
+        "peak_eu_aqi": 30,
+        "peak_us_aqi": None,
+    }
+
+
+def test_forecast_days_primary_blockers_ranked_by_count():
+    weather, aq = _day_forecast([
+        (8, 20, 5, 1, 5, 20),   # uv + rain
+        (9, 20, 5, 0, 5, 80),   # uv + aqi
+        (10, 20, 1, 1, 5, 20),  # rain
+        (11, 20, 5, 0, 5, 20),  # uv
+    ])
+    (day,) = forecast_days(weather, aq, 1)
+    assert day["safe"] is False
+    assert day["best_window"] is None
+    assert day["primary_blockers"] == ["uv_index", "rain"]
+
+
+def test_forecast_days_limits_to_requested_days():
+    weather, aq = _day_forecast([(8, 20, 1, 0, 5, 20)])
+    weather["hourly"].append({"time": "2026-03-10T08:00", "temperature": 20, "uv_index": 1, "rain": 0})
+    assert [d["date"] for d in forecast_days(weather, aq, 1)] == ["2026-03-09"]
+    assert [d["date"] for d in forecast_days(weather, aq, 7)] == ["2026-03-09", "2026-03-10"]
+
+
+# --- Evaluator ---
+
+
+def test_evaluator_thresholds_are_read_only():
+    source = dict(DEFAULT_THRESHOLDS)
+    evaluator = Evaluator(source)
+    source["uv_max"] = 100
+    assert evaluator.thresholds["uv_max"] == DEFAULT_THRESHOLDS["uv_max"]
+    with pytest.raises(TypeError):
+        evaluator.thresholds["uv_max"] = 100
+    with pytest.raises(AttributeError):
+        evaluator.rules[0].bound = 100
+
+
+def test_evaluators_with_different_thresholds_run_concurrently():
+    weather, aq = _day_forecast([(h, 20, 5, 0, 5, 20) for h in range(24)])
+    strict = Evaluator(DEFAULT_THRESHOLDS)
+    lenient = Evaluator({**DEFAULT_THRESHOLDS, "uv_max": 10})
+
+    def run(evaluator):
+        return evaluator.forecast_days(weather, aq, 1)[0]["safe_hour_count"]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        counts = list(pool.map(run, [strict, lenient] * 50))
+    assert counts == [0, 24] * 50
+
+
+def test_module_functions_follow_apply_thresholds():
+    assert check_condition(5, "uv_index")[0] is False
+    conditions.apply_thresholds({**DEFAULT_THRESHOLDS, "uv_max": 10})
+    assert check_condition(5, "uv_index")[0] is True
+    assert conditions.default_evaluator().thresholds["uv_max"] == 10
+
+
+def test_safe_windows_memoized_per_evaluator():
+    weather, aq = _day_forecast([(h, 20, 5, 0, 5, 20) for h in range(6)])
+    assert len(Evaluator(DEFAULT_THRESHOLDS).safe_windows(weather, aq)) == 0
+    assert len(Evaluator({**DEFAULT_THRESHOLDS, "uv_max": 10}).safe_windows(weather, aq)) == 1
+
+
+def test_evaluate_profiles_matches_individual_evaluators():
+    rows = [(h, 15 + h % 7, h % 6, (h % 5) * 0.2, 10 * (h % 6), 15 * (h % 5)) for h in range(24)]
+    weather, aq = _day_forecast(rows)
+    weather["current"] = {"temperature": 20, "uv_index": 4, "rain": 0}
+    aq["current"] = {"european_aqi": 30}
+    profiles = {
+        "default": dict(DEFAULT_THRESHOLDS),
+        "uv-sensitive": {**DEFAULT_THRESHOLDS, "uv_max": 2},
+        "lenient": {**DEFAULT_THRESHOLDS, "uv_max": 10, "rain_max": 1, "aqi_max": 100},
+    }
+    results = conditions.evaluate_profiles(weather, aq, profiles, days=1)
+    assert list(results) == list(profiles)
+    for name, thresholds in profiles.items():
+        evaluator = Evaluator(thresholds)
+        assert results[name]["forecast"] == evaluator.forecast_days(weather, aq, 1)
+        assert results[name]["next_window"] == evaluator.find_next_safe_window(weather, aq)
+        assert results[name]["result"] == evaluator.evaluate_current(weather, aq)
+        assert results[name]["thresholds"] == thresholds
+    assert results["lenient"]["forecast"][0]["safe_hour_count"] > results["default"]["forecast"][0]["safe_hour_count"]
+
+
+def test_evaluate_profiles_next_window_skips_past_hours():
+    weather, aq = _make_forecast([(-1, 20, 2, 0, 30), (2, 20, 2, 0, 30)])
+    weather["current"] = {"temperature": 20, "uv_index": 2, "rain": 0}
+    aq["current"] = {"european_aqi": 30}
+    results = conditions.evaluate_profiles(weather, aq, {"default": DEFAULT_THRESHOLDS})
+    assert results["default"]["next_window"] == find_next_safe_window(weather, aq)
+    assert results["default"]["forecast"] is None
@@ -4,7 +4,7 @@ import tempfile
 
 import pytest
 
-from touch_grass.config import DEFAULT_THRESHOLDS, load_thresholds
+from touch_grass.config import DEFAULT_THRESHOLDS, load_profile, load_thresholds, save_user_thresholds
 
 
 def test_load_thresholds_defaults():
@@ -91,3 +91,21 @@ def test_load_thresholds_all_env_vars(monkeypatch):
     assert result["us_aqi_max"] == 150
     assert result["rain_max"] == 1.0
     assert result["wind_max"] == 70.0
+
+
+def test_load_profile_ignores_user_config_and_env(monkeypatch, tmp_path):
+    save_user_thresholds(dict(DEFAULT_THRESHOLDS, temp_max=25.0))
+    monkeypatch.setenv("TOUCH_GRASS_UV_MAX", "9")
+    profile = tmp_path / "uv-sensitive.json"
+    profile.write_text(json.dumps({"uv_max": 2}))
+
+    assert load_profile(str(profile)) == dict(DEFAULT_THRESHOLDS, uv_max=2.0)
+    assert load_thresholds(str(profile))["temp_max"] == 25.0
+
+
+@pytest.mark.parametrize("content", ['["uv_max", 2]', '{"uv_max": "high"}'])
+def test_load_profile_rejects_invalid_files(tmp_path, content):
+    profile = tmp_path / "bad.json"
+    profile.write_text(content)
+    with pytest.raises(ValueError, match="bad.json"):
+        load_profile(str(profile))
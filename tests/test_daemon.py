@@ -0,0 +1,124 @@
+import json
+import os
+import socket
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from click.testing import CliRunner
+
+from touch_grass import cache, client
+from touch_grass.cli import main
+from touch_grass.daemon import handle_request, make_daemon
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets required")
+
+SAFE_WEATHER = {
+    "current": {"temperature": 22, "uv_index": 2, "rain": 0, "wind_speed": 10},
+    "hourly": [],
+    "timezone": "UTC",
+}
+SAFE_AQ = {
+    "current": {"european_aqi": 20, "us_aqi": 40},
+    "hourly": [],
+}
+ARGS = ["--lat", "45.52", "--lon", "-122.68"]
+
+
+def _request(argv, env=None, stdin_tty=False):
+    return {"argv": argv, "cwd": os.getcwd(), "env": env or {}, "stdin_tty": stdin_tty, "stdout_tty": False, "width": None}
+
+
+@pytest.fixture
+def fetch():
+    with patch("touch_grass.weather.get_weather", return_value=SAFE_WEATHER), \
+            patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ):
+        yield
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    server = make_daemon(tmp_path / "d.sock")
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("argv", [ARGS + ["--json"], ARGS, ["--lat", "95", "--lon", "0"], ["--bogus"]])
+def test_output_and_exit_code_match_in_process(fetch, argv):
+    env = {"TOUCH_GRASS_CONFIG_DIR": os.environ["TOUCH_GRASS_CONFIG_DIR"]}
+    with patch("touch_grass.cli.random.choice", side_effect=lambda seq: seq[0]):
+        expected = CliRunner().invoke(main, argv, prog_name="touch-grass")
+        response = handle_request(_request(argv, env=env))
+    assert response["exit_code"] == expected.exit_code
+    assert response["stdout"] == expected.stdout
+    assert response["stderr"] == expected.stderr
+
+
+def test_client_environment_applies_per_request_and_is_restored(fetch, monkeypatch):
+    monkeypatch.setenv("TOUCH_GRASS_UV_MAX", "10")
+    response = handle_request(_request(ARGS + ["--json"], env={"TOUCH_GRASS_UV_MAX": "1"}))
+    assert response["exit_code"] == 10
+    assert json.loads(response["stdout"])["thresholds"]["uv_max"] == 1
+    assert os.environ["TOUCH_GRASS_UV_MAX"] == "10"
+
+
+def test_requests_start_no_background_cache_work(fetch, tmp_path):
+    portland = {"city": "Portland", "region": "", "country": "US", "latitude": 45.52, "longitude": -122.68}
+    with patch("touch_grass.cli.cached_location", return_value=None), \
+            patch("touch_grass.cli.last_known_location", return_value=dict(portland, latitude=47.61)), \
+            patch("touch_grass.cli.get_location", return_value=portland), \
+            patch("touch_grass.cli.prefetch_conditions") as prefetch:
+        response = handle_request(_request(["--json"]))
+    assert response["exit_code"] == 0
+    prefetch.assert_not_called()
+
+    grace_while_serving = []
+    server = MagicMock(path=tmp_path / "d.sock")
+    server.serve_forever.side_effect = lambda: grace_while_serving.append(cache._REVALIDATE_GRACE)
+    with patch("touch_grass.daemon.make_daemon", return_value=server):
+        CliRunner().invoke(main, ["daemon"], catch_exceptions=False)
+    assert grace_while_serving == [0]
+
+
+def test_interactive_and_subcommand_invocations_fall_back():
+    assert handle_request(_request(["--configure"])) == {"fallback": True}
+    assert handle_request(_request(["serve"])) == {"fallback": True}
+    # No saved thresholds and a terminal on stdin: first-run setup must prompt locally
+    assert handle_request(_request(ARGS, stdin_tty=True)) == {"fallback": True}
+
+
+def test_batch_runs_fall_back(tmp_path, daemon):
+    sites = tmp_path / "sites.csv"
+    sites.write_text("lat,lon\n45.52,-122.68\n")
+    assert handle_request(_request(["--locations-file", str(sites)])) == {"fallback": True}
+    assert handle_request(_request([f"--locations-file={sites}", "--json"])) == {"fallback": True}
+    with patch("touch_grass.daemon.cli.main.main") as run_in_daemon:
+        assert client.forward(["--locations-file", str(sites)], daemon.path) is None
+    run_in_daemon.assert_not_called()
+
+
+def test_forward_round_trip(fetch, daemon):
+    response = client.forward(ARGS + ["--json"], daemon.path)
+    assert response["exit_code"] == 0
+    assert json.loads(response["stdout"])["safe"] is True
+
+
+def test_forward_without_daemon_returns_none(tmp_path, monkeypatch):
+    assert client.forward(ARGS, tmp_path / "missing.sock") is None
+    stale = tmp_path / "stale.sock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.bind(str(stale))
+    assert client.forward(ARGS, stale) is None
+
+
+def test_forward_disabled_by_env(daemon, monkeypatch):
+    monkeypatch.setenv("TOUCH_GRASS_DAEMON", "0")
+    assert client.forward(ARGS, daemon.path) is None
+
+
+def test_second_daemon_refuses_live_socket(daemon):
+    with pytest.raises(OSError):
+        make_daemon(daemon.path)
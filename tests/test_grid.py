@@ -0,0 +1,48 @@
+import pytest
+
+from touch_grass.grid import geohash, quantize, resolution
+
+
+def test_quantize_is_identity_by_default(monkeypatch):
+    monkeypatch.delenv("TOUCH_GRASS_GRID", raising=False)
+    assert quantize(45.5201, -122.6799) == (45.5201, -122.6799, "45.5201:-122.6799")
+
+
+def test_quantize_snaps_to_degree_grid(monkeypatch):
+    monkeypatch.setenv("TOUCH_GRASS_GRID", "0.1")
+    assert quantize(45.52, -122.68) == (45.5, -122.7, "45.5:-122.7")
+    assert quantize(45.5201, -122.6799)[2] == quantize(45.52, -122.68)[2]
+    assert quantize(89.99, 179.99)[:2] == (90.0, 180.0)
+
+
+def test_quantize_wraps_longitude(monkeypatch):
+    monkeypatch.setenv("TOUCH_GRASS_GRID", "0.25")
+    assert quantize(0.0, -179.9)[1] == -180.0
+    monkeypatch.setenv("TOUCH_GRASS_GRID", "7")
+    assert quantize(0.0, 179.0)[1] == -178.0
+
+
+def test_geohash_matches_reference_values():
+    assert geohash(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    assert geohash(45.52, -122.68, 5) == "c20fb"
+
+
+def test_quantize_geohash_uses_cell_centre(monkeypatch):
+    monkeypatch.setenv("TOUCH_GRASS_GRID", "geohash:5")
+    lat, lon, key = quantize(45.52, -122.68)
+    assert key == "gh:c20fb"
+    assert quantize(45.5201, -122.6799) == (lat, lon, key)
+    assert abs(lat - 45.52) < 0.03 and abs(lon + 122.68) < 0.03
+
+
+@pytest.mark.parametrize("raw", ["abc", "-1", "geohash:0", "geohash:13", "geohash:x"])
+def test_resolution_rejects_invalid_values(monkeypatch, raw):
+    monkeypatch.setenv("TOUCH_GRASS_GRID", raw)
+    with pytest.raises(ValueError, match="TOUCH_GRASS_GRID"):
+        resolution()
+
+
+def test_resolution_off_values(monkeypatch):
+    for raw in ("", "0", "off"):
+        monkeypatch.setenv("TOUCH_GRASS_GRID", raw)
+        assert resolution() is None
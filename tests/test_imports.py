@@ -0,0 +1,78 @@
+"""Import-cost regression tests for the fast --json path.
+
+Each check runs in a fresh interpreter so modules imported by other tests do
+not leak in.
+"""
+import json
+import subprocess
+import sys
+
+# Heavy dependencies the JSON path must not load: rich is only for human
+# output, requests only when something is actually fetched, numpy only for
+# long forecasts.
+DEFERRED = ("rich", "requests", "urllib3", "numpy")
+
+# Cumulative import time of touch_grass.cli, in microseconds (best of 3 runs).
+# Eager rich/requests/numpy imports put it well above this.
+IMPORT_BUDGET_US = 150_000
+
+WARM_JSON_RUN = """
+import json, sys
+from touch_grass.cache import set_cached
+from touch_grass.cli import main
+
+hourly = [{"time": "2026-03-09T12:00", "temperature": 20, "uv_index": 1, "rain": 0, "wind_speed": 5}]
+set_cached("weather:45.5:-122.6:1", {"current": {"temperature": 20, "uv_index": 1, "rain": 0, "wind_speed": 5}, "hourly": hourly, "timezone": "UTC"})
+set_cached("air_quality:45.5:-122.6:1", {"current": {"european_aqi": 20, "us_aqi": 30}, "hourly": []})
+try:
+    main(["--lat", "45.5", "--lon", "-122.6", "--json"])
+except SystemExit as e:
+    code = e.code
+print(json.dumps({"code": code, "modules": sorted(sys.modules)}), file=sys.stderr)
+"""
+
+
+def _loaded(modules, name):
+    return any(m == name or m.startswith(name + ".") for m in modules)
+
+
+def _run(args, tmp_path):
+    env = {"TOUCH_GRASS_CONFIG_DIR": str(tmp_path / "config"), "TOUCH_GRASS_DISK_CACHE": "0", "PATH": ""}
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, env=env, check=True)
+
+
+def test_cli_import_defers_heavy_dependencies(tmp_path):
+    proc = _run(["-c", "import json, sys, touch_grass.cli; print(json.dumps(sorted(sys.modules)))"], tmp_path)
+    modules = json.loads(proc.stdout)
+    assert [name for name in DEFERRED if _loaded(modules, name)] == []
+
+
+def test_daemon_client_imports_only_the_standard_library(tmp_path):
+    proc = _run(["-c", "import json, sys, touch_grass.client; print(json.dumps(sorted(sys.modules)))"], tmp_path)
+    modules = json.loads(proc.stdout)
+    assert [name for name in ("click", *DEFERRED) if _loaded(modules, name)] == []
+
+
+def test_warm_json_run_skips_rich_and_requests(tmp_path):
+    proc = _run(["-c", WARM_JSON_RUN], tmp_path)
+    report = json.loads(proc.stderr.strip().splitlines()[-1])
+    assert report["code"] == 0
+    assert json.loads(proc.stdout)["safe"] is True
+    assert [name for name in DEFERRED if _loaded(report["modules"], name)] == []
+
+
+def _cumulative_us(stderr: str, module: str) -> int:
+    # Lines look like "import time:  self [us] | cumulative | imported package"
+    for line in stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1])
+    raise AssertionError(f"{module} not in -X importtime output")
+
+
+def test_cli_import_time_budget(tmp_path):
+    timings = []
+    for _ in range(3):
+        proc = _run(["-X", "importtime", "-c", "import touch_grass.cli"], tmp_path)
+        timings.append(_cumulative_us(proc.stderr, "touch_grass.cli"))
+    assert min(timings) < IMPORT_BUDGET_US, f"touch_grass.cli import took {min(timings)}us"
@@ -1,9 +1,12 @@
 from unittest.mock import MagicMock, patch
 
-from touch_grass.location import get_location
+import requests
 
+from touch_grass import cache
+from touch_grass.location import LOCATION_TTL, cached_location, distance_km, get_location, last_known_location, network_fingerprint
 
-@patch("touch_grass.location.requests.get")
+
+@patch("touch_grass.location.http_get")
 def test_get_location_parses_response(mock_get):
     mock_resp = MagicMock()
     mock_resp.json.return_value = {
@@ -22,3 +25,95 @@ def test_get_location_parses_response(mock_get):
     assert loc["latitude"] == 37.7749
     assert loc["longitude"] == -122.4194
     mock_resp.raise_for_status.assert_called_once()
+
+
+IPINFO = {"city": "Portland", "region": "Oregon", "country": "US", "loc": "45.52,-122.68"}
+
+
+@patch("touch_grass.location.network_fingerprint", return_value="home")
+@patch("touch_grass.location.http_get")
+def test_get_location_is_cached_on_disk_per_network(mock_get, mock_fingerprint):
+    mock_get.return_value.json.return_value = IPINFO
+
+    first = get_location()
+    cache._CACHE.clear()  # a new process: memory is empty, the disk entry remains
+    second = get_location()
+
+    assert second == first
+    assert mock_get.call_count == 1
+
+    mock_fingerprint.return_value = "cafe"
+    get_location()
+    assert mock_get.call_count == 2
+
+
+@patch("touch_grass.location.network_fingerprint", return_value="home")
+@patch("touch_grass.location.http_get")
+def test_get_location_uses_old_answer_when_ipinfo_fails(mock_get, mock_fingerprint):
+    mock_get.return_value.json.return_value = IPINFO
+    with patch("touch_grass.cache.time.time", return_value=1000.0):
+        get_location()
+
+    mock_get.side_effect = requests.ConnectionError("offline")
+    with patch("touch_grass.cache.time.time", return_value=1000.0 + LOCATION_TTL + 60):
+        assert get_location()["city"] == "Portland"
+    assert mock_get.call_count == 2
+
+
+@patch("touch_grass.location.network_fingerprint", return_value="home")
+@patch("touch_grass.location.http_get")
+def test_memory_only_location_survives_cache_purges(mock_get, mock_fingerprint, monkeypatch):
+    monkeypatch.setenv("TOUCH_GRASS_DISK_CACHE", "0")
+    monkeypatch.setattr(cache, "_CACHE", cache._MemoryCache())
+    mock_get.return_value.json.return_value = IPINFO
+    with patch("touch_grass.cache.time.time", return_value=1000.0):
+        get_location()
+
+    # A day later, a weather store sweeps out entries past STALE_TTL
+    with patch("touch_grass.cache.time.time", return_value=1000.0 + 86400):
+        cache.set_cached("weather:0:0:1", {})
+        assert get_location()["city"] == "Portland"
+    assert mock_get.call_count == 1
+
+
+def test_network_fingerprint_is_stable():
+    assert network_fingerprint() == network_fingerprint()
+    assert len(network_fingerprint()) == 16
+
+
+ROUTE_HEADER = "Iface\tDestination\tGateway\tFlags\tRefCnt\tUse\tMetric\tMask\tMTU\tWindow\tIRTT\n"
+
+
+def test_network_fingerprint_tells_apart_gateways_behind_the_same_address(tmp_path):
+    home, cafe = tmp_path / "home", tmp_path / "cafe"
+    home.write_text(ROUTE_HEADER + "wlan0\t00000000\t0101A8C0\t0003\t0\t0\t600\t00000000\t0\t0\t0\n")
+    cafe.write_text(ROUTE_HEADER + "wlan0\t00000000\tFE01A8C0\t0003\t0\t0\t600\t00000000\t0\t0\t0\n")
+    with patch("touch_grass.location._ROUTE_TABLE", str(home)):
+        at_home = network_fingerprint()
+    with patch("touch_grass.location._ROUTE_TABLE", str(cafe)):
+        at_cafe = network_fingerprint()
+    assert at_home != at_cafe
+
+
+def test_network_fingerprint_without_a_routing_table(tmp_path):
+    with patch("touch_grass.location._ROUTE_TABLE", str(tmp_path / "missing")):
+        assert len(network_fingerprint()) == 16
+
+
+def test_distance_km():
+    portland = {"latitude": 45.52, "longitude": -122.68}
+    seattle = {"latitude": 47.61, "longitude": -122.33}
+    assert distance_km(portland, portland) == 0
+    assert 230 < distance_km(portland, seattle) < 235
+
+
+@patch("touch_grass.location.network_fingerprint", return_value="home")
+@patch("touch_grass.location.http_get")
+def test_lookup_records_last_known_location_across_networks(mock_get, mock_fingerprint):
+    assert last_known_location() is None
+    mock_get.return_value.json.return_value = IPINFO
+    location = get_location()
+
+    mock_fingerprint.return_value = "cafe"
+    assert cached_location() is None
+    assert last_known_location() == location
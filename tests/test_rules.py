@@ -0,0 +1,38 @@
+from touch_grass.config import DEFAULT_THRESHOLDS
+from touch_grass.rules import CRITERIA, Criterion, compile_rules
+
+
+def test_compile_rules_binds_bounds_in_criteria_order():
+    rules = compile_rules(DEFAULT_THRESHOLDS)
+    assert [rule.name for rule in rules] == [criterion.name for criterion in CRITERIA]
+    assert rules[0].bound == (DEFAULT_THRESHOLDS["temp_min"], DEFAULT_THRESHOLDS["temp_max"])
+    assert rules[1].bound == DEFAULT_THRESHOLDS["uv_max"]
+
+
+def test_rule_boundaries():
+    temperature, uv, rain, wind, _, _ = compile_rules({**DEFAULT_THRESHOLDS, "temp_min": 0, "temp_max": 30})
+    assert temperature.passes(0) and temperature.passes(30) and not temperature.passes(30.1)
+    assert not uv.passes(DEFAULT_THRESHOLDS["uv_max"])
+    assert rain.passes(DEFAULT_THRESHOLDS["rain_max"])
+    assert not wind.passes(DEFAULT_THRESHOLDS["wind_max"])
+
+
+def test_missing_values_fail_only_required_rules():
+    rules = {rule.name: rule for rule in compile_rules(DEFAULT_THRESHOLDS)}
+    assert rules["temperature"].fails(None) is True
+    assert rules["wind_speed"].fails(None) is False
+    assert rules["us_air_quality"].check(None) == (False, "us_air_quality: data unavailable")
+
+
+def test_reason_formatting():
+    rules = {rule.name: rule for rule in compile_rules(DEFAULT_THRESHOLDS)}
+    assert rules["temperature"].check(-10) == (False, "Temperature too cold (-10°C)")
+    assert rules["temperature"].check(40) == (False, "Temperature too hot (40°C)")
+    assert rules["air_quality"].check(20) == (True, "Air quality good (EU AQI: 20)")
+
+
+def test_custom_criteria():
+    criteria = (Criterion("humidity", "humidity", "le", ("humidity_max",), True, lambda v, safe, bound: f"{v}%"),)
+    (rule,) = compile_rules({"humidity_max": 80}, criteria)
+    assert rule.check(85) == (False, "85%")
+    assert rule.fails(None) is False
@@ -0,0 +1,67 @@
+from array import array
+
+import pytest
+
+from touch_grass import cache
+from touch_grass.series import HourlySeries
+
+TIMES = ["2026-02-15T12:00", "2026-02-15T13:00", "2026-02-15T14:00"]
+
+
+def test_rows_match_list_of_dicts_shape():
+    series = HourlySeries(TIMES, {"temperature": [20.5, None, 22.0], "european_aqi": [10, 20, None]})
+    assert series[0] == {"time": TIMES[0], "temperature": 20.5, "european_aqi": 10}
+    assert series[1]["temperature"] is None
+    assert series[-1]["european_aqi"] is None
+    assert len(series) == 3
+    assert [row["time"] for row in series] == TIMES
+
+
+def test_columns_are_packed_by_type():
+    series = HourlySeries(TIMES, {"temperature": [20.5, None, 22.0], "us_aqi": [1, 2, 3], "mixed": [1, 2.5, None]})
+    assert isinstance(series._columns["temperature"][0], array)
+    assert series._columns["temperature"][0].typecode == "d"
+    assert series._columns["us_aqi"][0].typecode == "q"
+    assert series._columns["us_aqi"][1] is None
+    assert series._columns["mixed"][0] == [1, 2.5, None]
+
+
+def test_ints_and_floats_round_trip_exactly():
+    series = HourlySeries(TIMES, {"rain": [0.0, 0.0, 1.0], "us_aqi": [40, None, 45]})
+    assert series.column("rain") == [0.0, 0.0, 1.0]
+    assert type(series.column("rain")[0]) is float
+    assert series.column("us_aqi") == [40, None, 45]
+    assert type(series.column("us_aqi")[0]) is int
+
+
+def test_missing_column_reads_as_none():
+    series = HourlySeries(TIMES, {"temperature": [1.0, 2.0, 3.0]})
+    assert series.column("uv_index") == [None, None, None]
+
+
+def test_slice_returns_series():
+    series = HourlySeries(TIMES, {"temperature": [1.0, 2.0, 3.0]})
+    head = series[:2]
+    assert isinstance(head, HourlySeries)
+    assert head.times == tuple(TIMES[:2])
+    assert head.column("temperature") == [1.0, 2.0]
+
+
+def test_equality_with_rows():
+    rows = [{"time": TIMES[0], "european_aqi": 10}, {"time": TIMES[1], "european_aqi": None}]
+    assert HourlySeries.from_rows(rows) == rows
+    assert HourlySeries.from_rows(rows) == HourlySeries.from_rows(rows)
+
+
+def test_length_mismatch_rejected():
+    with pytest.raises(ValueError):
+        HourlySeries(TIMES, {"temperature": [1.0]})
+
+
+def test_series_survives_disk_cache():
+    series = HourlySeries(TIMES, {"temperature": [20.5, None, 22.0], "us_aqi": [1, 2, 3]})
+    cache.cached_call("series", lambda: {"hourly": series})
+    cache._CACHE.clear()
+    restored = cache.cached_call("series", lambda: None)["hourly"]
+    assert isinstance(restored, HourlySeries)
+    assert restored == series
@@ -0,0 +1,116 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from touch_grass.config import DEFAULT_THRESHOLDS
+from touch_grass.server import make_server, parse_request
+
+SAFE_WEATHER = {
+    "current": {"temperature": 22, "uv_index": 2, "rain": 0, "wind_speed": 10},
+    "hourly": [],
+    "timezone": "UTC",
+}
+SAFE_AQ = {
+    "current": {"european_aqi": 20, "us_aqi": 40},
+    "hourly": [],
+}
+LOCATION = {"city": "Portland", "region": "Oregon", "country": "US", "latitude": 45.52, "longitude": -122.68}
+
+
+@pytest.fixture
+def server():
+    server = make_server(dict(DEFAULT_THRESHOLDS), port=0)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _get(server, path):
+    url = f"http://127.0.0.1:{server.server_port}{path}"
+    try:
+        with urllib.request.urlopen(url, timeout=5) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_parse_request():
+    assert parse_request("/check", {"lat": ["45.5"], "lon": ["-122"]}) == (45.5, -122.0, None, None)
+    assert parse_request("/forecast", {"days": ["3"]}) == (None, None, None, 3)
+    assert parse_request("/plan", {}) == (None, None, "next-24h", None)
+    with pytest.raises(LookupError):
+        parse_request("/nope", {})
+    with pytest.raises(ValueError):
+        parse_request("/check", {"lat": ["45"]})
+    with pytest.raises(ValueError):
+        parse_request("/forecast", {"days": ["8"]})
+
+
+@patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ)
+@patch("touch_grass.weather.get_weather", return_value=SAFE_WEATHER)
+def test_check_returns_json_payload(mock_weather, mock_aq, server):
+    status, payload = _get(server, "/check?lat=45.52&lon=-122.68")
+    assert status == 200
+    assert payload["safe"] is True
+    assert payload["location"]["latitude"] == 45.52
+    assert payload["thresholds"] == DEFAULT_THRESHOLDS
+    mock_weather.assert_called_once_with(45.52, -122.68, forecast_days=1)
+
+
+@patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ)
+@patch("touch_grass.weather.get_weather", return_value=SAFE_WEATHER)
+@patch("touch_grass.location.http_get")
+def test_forecast_and_plan_reuse_geolocation(mock_ipinfo, mock_weather, mock_aq, server):
+    mock_ipinfo.return_value.json.return_value = {"city": "Portland", "region": "Oregon", "country": "US", "loc": "45.52,-122.68"}
+    status, payload = _get(server, "/forecast?days=3")
+    assert status == 200
+    assert payload["forecast_count"] == 3
+    status, payload = _get(server, "/plan")
+    assert status == 200
+    assert payload["plan"] == "next-24h"
+    assert payload["location"]["city"] == "Portland"
+    mock_ipinfo.assert_called_once()
+
+
+def test_bad_requests(server):
+    assert _get(server, "/check?lat=200&lon=0")[0] == 400
+    status, payload = _get(server, "/missing")
+    assert status == 404
+    assert payload["error_type"] == "parameter"
+
+
+@patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ)
+@patch("touch_grass.weather.get_weather", side_effect=requests.exceptions.ConnectionError("refused"))
+def test_upstream_errors_map_to_502(mock_weather, mock_aq, server):
+    status, payload = _get(server, "/check?lat=1&lon=2")
+    assert status == 502
+    assert payload["error_type"] == "network"
+
+
+@patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ)
+@patch("touch_grass.weather.get_weather", return_value=SAFE_WEATHER)
+def test_concurrent_requests(mock_weather, mock_aq, server):
+    results = []
+
+    def call(i):
+        results.append(_get(server, f"/check?lat={i}&lon={i}"))
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(status for status, _ in results) == [200] * 10
+
+
+def test_stats_reports_cache_counters(server):
+    status, payload = _get(server, "/stats")
+    assert status == 200
+    assert {"hits", "misses", "evictions", "expirations", "entries", "bytes"} <= payload["cache"].keys()
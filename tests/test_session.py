@@ -0,0 +1,62 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from touch_grass import session
+
+
+@pytest.fixture(autouse=True)
+def reset_session():
+    session.close_session()
+    yield
+    session.configure_session(
+        retries=session.RETRIES,
+        backoff_factor=session.BACKOFF_FACTOR,
+        backoff_jitter=session.BACKOFF_JITTER,
+        pool_maxsize=session.POOL_MAXSIZE,
+        read_retries=session.READ_RETRIES,
+    )
+
+
+def test_get_session_is_shared():
+    assert session.get_session() is session.get_session()
+
+
+def test_session_retries_on_rate_limit_and_server_errors():
+    adapter = session.get_session().get_adapter("https://api.open-meteo.com/v1/forecast")
+    retry = adapter.max_retries
+    assert retry.total == session.RETRIES
+    assert 429 in retry.status_forcelist
+    assert 503 in retry.status_forcelist
+    assert retry.raise_on_status is False
+    assert retry.read == session.READ_RETRIES
+
+
+def test_retry_after_is_capped():
+    retry = session.get_session().get_adapter("https://api.open-meteo.com/v1/forecast").max_retries
+    response = MagicMock()
+    response.headers = {"Retry-After": "3600"}
+    response.getheader = lambda name, default=None: response.headers.get(name, default)
+    assert retry.get_retry_after(response) == session.RETRY_AFTER_MAX
+    response.headers = {"Retry-After": "2"}
+    assert retry.get_retry_after(response) == 2
+    # Subsequent attempts keep the cap
+    assert type(retry.increment(method="GET", url="/", response=MagicMock(status=429, headers={}))) is type(retry)
+
+
+def test_configure_session_rebuilds_with_new_settings():
+    first = session.get_session()
+    session.configure_session(retries=1, pool_maxsize=32)
+    second = session.get_session()
+
+    assert second is not first
+    adapter = second.get_adapter("https://ipinfo.io/json")
+    assert adapter.max_retries.total == 1
+    assert adapter._pool_maxsize == 32
+
+
+def test_http_get_uses_shared_session():
+    fake = MagicMock()
+    with patch.object(session, "_SESSION", fake):
+        session.http_get("https://example.com", timeout=3)
+    fake.get.assert_called_once_with("https://example.com", timeout=3)
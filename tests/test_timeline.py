@@ -0,0 +1,130 @@
+from datetime import datetime
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+from touch_grass.conditions import evaluate_current, find_next_safe_window, forecast_days
+from touch_grass.series import HourlySeries
+from touch_grass.timeline import Timeline, clear_timelines, timeline_for
+
+WEATHER_ROWS = [
+    {"time": "2026-03-09T08:00", "temperature": 10.0, "uv_index": 1.0, "rain": 0.0, "wind_speed": 5.0},
+    {"time": "2026-03-09T09:00", "temperature": 11.0, "uv_index": 2.0, "rain": 0.0, "wind_speed": 6.0},
+    {"time": "2026-03-10T08:00", "temperature": 12.0, "uv_index": 3.0, "rain": 0.5, "wind_speed": 7.0},
+]
+
+
+def _weather(hourly):
+    return {
+        "current": {"temperature": 20, "uv_index": 2, "rain": 0, "wind_speed": 10},
+        "hourly": hourly,
+        "timezone": "UTC",
+    }
+
+
+def test_join_aligns_air_quality_by_time():
+    aq = {"hourly": [
+        {"time": "2026-03-10T08:00", "european_aqi": 70, "us_aqi": 90},
+        {"time": "2026-03-09T08:00", "european_aqi": 20, "us_aqi": 30},
+    ]}
+    timeline = Timeline(_weather(WEATHER_ROWS), aq)
+    assert timeline.times == [row["time"] for row in WEATHER_ROWS]
+    assert timeline.column("european_aqi") == [20, None, 70]
+    assert timeline.column("us_aqi") == [30, None, 90]
+    assert timeline.column("temperature") == [10.0, 11.0, 12.0]
+
+
+def test_join_reads_columns_from_hourly_series():
+    aq_rows = [{"time": row["time"], "european_aqi": 10 + i, "us_aqi": None} for i, row in enumerate(WEATHER_ROWS)]
+    weather = _weather(HourlySeries.from_rows(WEATHER_ROWS))
+    aq = {"hourly": HourlySeries.from_rows(aq_rows)}
+    with patch.object(HourlySeries, "row", side_effect=AssertionError("row views should not be built")):
+        timeline = Timeline(weather, aq)
+        assert timeline.column("european_aqi") == [10, 11, 12]
+        assert timeline.column("wind_speed") == [5.0, 6.0, 7.0]
+
+
+def test_days_group_hour_indexes():
+    timeline = Timeline(_weather(WEATHER_ROWS), {"hourly": []})
+    assert timeline.days == {"2026-03-09": [0, 1], "2026-03-10": [2]}
+
+
+def test_timeline_for_memoizes_by_identity():
+    weather = _weather(WEATHER_ROWS)
+    aq = {"current": {"european_aqi": 10}, "hourly": []}
+    assert timeline_for(weather, aq) is timeline_for(weather, aq)
+    assert timeline_for(weather, aq) is not timeline_for(_weather(WEATHER_ROWS), aq)
+
+
+def test_clear_timelines_drops_the_memo():
+    weather = _weather(WEATHER_ROWS)
+    aq = {"current": {"european_aqi": 10}, "hourly": []}
+    first = timeline_for(weather, aq)
+    clear_timelines()
+    assert timeline_for(weather, aq) is not first
+
+
+def test_evaluators_share_one_join():
+    weather = _weather(WEATHER_ROWS)
+    aq = {"current": {"european_aqi": 10, "us_aqi": 20}, "hourly": []}
+    with patch.object(Timeline, "_join", autospec=True, side_effect=Timeline._join) as join:
+        evaluate_current(weather, aq)
+        find_next_safe_window(weather, aq)
+        forecast_days(weather, aq, 2)
+    assert join.call_count == 1
+
+
+def test_current_does_not_need_hourly_data():
+    timeline = Timeline({"current": {"temperature": 5}}, {"current": {"us_aqi": 40}})
+    assert timeline.current == {
+        "temperature": 5,
+        "uv_index": None,
+        "rain": None,
+        "wind_speed": None,
+        "european_aqi": None,
+        "us_aqi": 40,
+    }
+
+
+def _utc_epoch(t, tz):
+    return int(datetime.fromisoformat(t).replace(tzinfo=ZoneInfo(tz)).timestamp())
+
+
+def test_epochs_match_zoneinfo_conversion():
+    times = [f"2026-06-{d:02d}T{h:02d}:00" for d in range(1, 4) for h in range(24)]
+    timeline = Timeline({"hourly": [{"time": t} for t in times], "timezone": "America/Los_Angeles"}, {"hourly": []})
+    assert timeline.epochs == [_utc_epoch(t, "America/Los_Angeles") for t in times]
+
+
+def test_epochs_across_dst_change():
+    times = [f"2026-03-{d:02d}T{h:02d}:00" for d in (28, 29, 30) for h in range(24) if not (d == 29 and h == 2)]
+    timeline = Timeline({"hourly": [{"time": t} for t in times], "timezone": "Europe/Berlin"}, {"hourly": []})
+    assert timeline.epochs == [_utc_epoch(t, "Europe/Berlin") for t in times]
+
+
+def test_epochs_accept_seconds():
+    timeline = Timeline({"hourly": [{"time": "1970-01-01T01:00:30"}], "timezone": "UTC"}, {"hourly": []})
+    assert timeline.epochs == [3630]
+
+
+def test_first_after_uses_sorted_order():
+    times = [f"1970-01-01T{h:02d}:00" for h in range(5)]
+    timeline = Timeline({"hourly": [{"time": t} for t in times], "timezone": "UTC"}, {"hourly": []})
+    assert timeline.first_after(2 * 3600) == 3
+    assert timeline.first_after(2 * 3600 - 1) == 2
+    assert timeline.first_after(10 ** 10) == 5
+
+
+def test_first_after_handles_unsorted_hours():
+    times = ["1970-01-01T03:00", "1970-01-01T01:00", "1970-01-01T04:00"]
+    timeline = Timeline({"hourly": [{"time": t} for t in times], "timezone": "UTC"}, {"hourly": []})
+    assert timeline.first_after(2 * 3600) == 0
+
+
+def test_find_next_safe_window_skips_elapsed_hours_by_epoch():
+    rows = [
+        {"time": f"1970-01-01T{h:02d}:00", "temperature": 20, "uv_index": 1, "rain": 0}
+        for h in range(6)
+    ]
+    weather = {"hourly": rows, "timezone": "UTC"}
+    with patch("touch_grass.conditions.time.time", return_value=3 * 3600):
+        assert find_next_safe_window(weather, {"hourly": []}) == "4:00 AM"
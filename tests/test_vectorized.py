@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+from touch_grass import conditions, vectorized
+from touch_grass.config import DEFAULT_THRESHOLDS
+from touch_grass.rules import compile_rules
+from touch_grass.timeline import timeline_for
+
+np = pytest.importorskip("numpy")
+
+
+def _random_forecast(days, seed):
+    rng = random.Random(seed)
+
+    def maybe(value):
+        return None if rng.random() < 0.05 else value
+
+    weather_hourly, aqi_hourly = [], []
+    for day in range(days):
+        for hour in range(24):
+            t = f"2026-03-{day + 1:02d}T{hour:02d}:00"
+            weather_hourly.append({
+                "time": t,
+                "temperature": maybe(round(rng.uniform(-10, 40), 1)),
+                "uv_index": maybe(rng.choice([0.0, 0, 1.5, 2.9, 3, 5.2])),
+                "rain": maybe(rng.choice([0.0, 0, 0.2, 1.4])),
+                "wind_speed": maybe(round(rng.uniform(0, 70), 1)),
+            })
+            if rng.random() < 0.95:
+                aqi_hourly.append({"time": t, "european_aqi": maybe(rng.randint(5, 80)), "us_aqi": maybe(rng.randint(10, 160))})
+    return {"hourly": weather_hourly, "timezone": "UTC"}, {"hourly": aqi_hourly}
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_vectorized_matches_pure_python(seed, monkeypatch):
+    weather, aq = _random_forecast(7, seed)
+    monkeypatch.setattr(vectorized, "MIN_HOURS", 0)
+    fast = conditions.forecast_days(weather, aq, 7)
+    monkeypatch.setattr(vectorized, "_np", None)
+    slow = conditions.forecast_days(weather, aq, 7)
+    assert fast == slow
+    # ints stay ints so JSON output is byte-identical
+    assert [repr(d["metrics"]) for d in fast] == [repr(d["metrics"]) for d in slow]
+
+
+def test_vectorized_respects_custom_thresholds(monkeypatch):
+    weather, aq = _random_forecast(3, 1)
+    monkeypatch.setattr(vectorized, "MIN_HOURS", 0)
+    conditions.apply_thresholds({**DEFAULT_THRESHOLDS, "uv_max": 10, "rain_max": 5, "wind_max": 100})
+    fast = conditions.forecast_days(weather, aq, 3)
+    monkeypatch.setattr(vectorized, "_np", None)
+    assert fast == conditions.forecast_days(weather, aq, 3)
+
+
+def test_vectorized_handles_day_without_data():
+    weather = {"hourly": [{"time": "2026-03-01T00:00", "temperature": None, "uv_index": None, "rain": None}], "timezone": "UTC"}
+    timeline = timeline_for(weather, {"hourly": []})
+    ((safe_hours, blockers, metrics),) = vectorized.summarize_days(timeline, [[0]], compile_rules(DEFAULT_THRESHOLDS))
+    assert safe_hours == []
+    assert blockers == ["temperature", "uv_index"]
+    assert metrics["max_temp"] is None
+    assert metrics["peak_uv"] == 0
+
+
+def test_helpers_load_numpy_on_demand(monkeypatch):
+    monkeypatch.setattr(vectorized, "_np", vectorized._NOT_LOADED)
+    rules = compile_rules(DEFAULT_THRESHOLDS)
+    arrays = {rule.column: np.array([float("nan"), 100.0]) for rule in rules}
+    masks = vectorized._masks(arrays, rules)
+    assert masks["temperature"].tolist() == [True, True]
+    assert masks["wind_speed"].tolist() == [False, True]
+    assert vectorized._numpy() is np
+
+
+def test_summarize_days_requires_numpy(monkeypatch):
+    monkeypatch.setattr(vectorized, "_np", None)
+    timeline = timeline_for({"hourly": [], "timezone": "UTC"}, {"hourly": []})
+    with pytest.raises(ImportError):
+        vectorized.summarize_days(timeline, [], compile_rules(DEFAULT_THRESHOLDS))
@@ -1,12 +1,21 @@
+import threading
 from unittest.mock import MagicMock, patch
 
 import pytest
 import requests
 
-from touch_grass.weather import get_air_quality, get_weather
+from touch_grass import cache
+from touch_grass.weather import (
+    fetch_horizon,
+    get_air_quality,
+    get_air_quality_many,
+    get_weather,
+    get_weather_many,
+    prefetch_conditions,
+)
 
 
-@patch("touch_grass.weather.requests.get")
+@patch("touch_grass.weather.http_get")
 def test_get_weather_parses_response(mock_get):
     mock_resp = MagicMock()
     mock_resp.json.return_value = {
@@ -39,7 +48,7 @@ def test_get_weather_parses_response(mock_get):
     assert result["timezone"] == "America/Los_Angeles"
 
 
-@patch("touch_grass.weather.requests.get")
+@patch("touch_grass.weather.http_get")
 def test_get_air_quality_parses_response(mock_get):
     mock_resp = MagicMock()
     mock_resp.json.return_value = {
@@ -61,7 +70,7 @@ def test_get_air_quality_parses_response(mock_get):
     assert result["hourly"][1]["us_aqi"] == 45
 
 
-@patch("touch_grass.weather.requests.get")
+@patch("touch_grass.weather.http_get")
 def test_get_weather_missing_current_key(mock_get):
     mock_resp = MagicMock()
     mock_resp.json.return_value = {
@@ -80,7 +89,7 @@ def test_get_weather_missing_current_key(mock_get):
         get_weather(37.77, -122.42)
 
 
-@patch("touch_grass.weather.requests.get")
+@patch("touch_grass.weather.http_get")
 def test_get_weather_null_uv_index(mock_get):
     mock_resp = MagicMock()
     mock_resp.json.return_value = {
@@ -105,7 +114,7 @@ def test_get_weather_null_uv_index(mock_get):
     assert result["current"]["uv_index"] is None
 
 
-@patch("touch_grass.weather.requests.get")
+@patch("touch_grass.weather.http_get")
 def test_get_air_quality_missing_european_aqi(mock_get):
     mock_resp = MagicMock()
     mock_resp.json.return_value = {
@@ -122,7 +131,7 @@ def test_get_air_quality_missing_european_aqi(mock_get):
     assert result["current"]["us_aqi"] == 40
 
 
-@patch("touch_grass.weather.requests.get")
+@patch("touch_grass.weather.http_get")
 def test_get_weather_timeout(mock_get):
     mock_get.side_effect = requests.exceptions.Timeout()
 
@@ -130,7 +139,7 @@ def test_get_weather_timeout(mock_get):
         get_weather(37.77, -122.42)
 
 
-@patch("touch_grass.weather.requests.get")
+@patch("touch_grass.weather.http_get")
 def test_get_air_quality_timeout(mock_get):
     mock_get.side_effect = requests.exceptions.Timeout()
 
@@ -138,7 +147,7 @@ def test_get_air_quality_timeout(mock_get):
         get_air_quality(37.77, -122.42)
 
 
-@patch("touch_grass.weather.requests.get")
+@patch("touch_grass.weather.http_get")
 def test_cache_returns_same_object_on_second_call(mock_get):
     mock_resp = MagicMock()
     mock_resp.json.return_value = {
@@ -166,7 +175,7 @@ def test_cache_returns_same_object_on_second_call(mock_get):
     assert mock_get.call_count == 1
 
 
-@patch("touch_grass.weather.requests.get")
+@patch("touch_grass.weather.http_get")
 def test_cache_different_coords_fetches_separately(mock_get):
     mock_resp = MagicMock()
     mock_resp.json.return_value = {
@@ -191,3 +200,244 @@ def test_cache_different_coords_fetches_separately(mock_get):
     get_weather(40.71, -74.01)
 
     assert mock_get.call_count == 2
+
+
+def _point(temp):
+    return {
+        "current": {"temperature_2m": temp, "rain": 0.0, "uv_index": 1.0, "windspeed_10m": 5.0},
+        "hourly": {
+            "time": ["2026-02-15T12:00"],
+            "temperature_2m": [temp],
+            "rain": [0.0],
+            "uv_index": [1.0],
+            "windspeed_10m": [5.0],
+        },
+        "timezone": "UTC",
+    }
+
+
+@patch("touch_grass.weather.http_get")
+def test_get_weather_many_chunks_and_splits(mock_get):
+    def respond(url, params, timeout):
+        resp = MagicMock()
+        lats = params["latitude"].split(",")
+        resp.json.return_value = [_point(float(lat)) for lat in lats]
+        return resp
+
+    mock_get.side_effect = respond
+
+    results = get_weather_many([(1.0, 1.0), (2.0, 2.0), (3.0, 3.0)], chunk_size=2)
+
+    assert mock_get.call_count == 2
+    assert mock_get.call_args_list[0].kwargs["params"]["latitude"] == "1.0,2.0"
+    assert [r["current"]["temperature"] for r in results] == [1.0, 2.0, 3.0]
+    assert results[2]["hourly"][0]["temperature"] == 3.0
+
+
+@patch("touch_grass.weather.http_get")
+def test_get_weather_many_populates_per_location_cache(mock_get):
+    mock_resp = MagicMock()
+    mock_resp.json.return_value = [_point(1.0), _point(2.0)]
+    mock_get.return_value = mock_resp
+
+    get_weather_many([(1.0, 1.0), (2.0, 2.0)])
+    single = get_weather(2.0, 2.0)
+
+    assert mock_get.call_count == 1
+    assert single["current"]["temperature"] == 2.0
+
+
+@patch("touch_grass.weather.http_get")
+def test_get_weather_many_skips_cached_and_duplicate_points(mock_get):
+    mock_resp = MagicMock()
+    mock_resp.json.return_value = _point(1.0)
+    mock_get.return_value = mock_resp
+    get_weather(1.0, 1.0)
+
+    mock_resp.json.return_value = _point(2.0)
+    results = get_weather_many([(1.0, 1.0), (2.0, 2.0), (2.0, 2.0)])
+
+    assert mock_get.call_count == 2
+    assert mock_get.call_args.kwargs["params"]["latitude"] == "2.0"
+    assert [r["current"]["temperature"] for r in results] == [1.0, 2.0, 2.0]
+
+
+@patch("touch_grass.weather.http_get")
+def test_get_weather_many_rejects_mismatched_response(mock_get):
+    mock_resp = MagicMock()
+    mock_resp.json.return_value = [_point(1.0)]
+    mock_get.return_value = mock_resp
+
+    with pytest.raises(ValueError):
+        get_weather_many([(1.0, 1.0), (2.0, 2.0)])
+
+
+@patch("touch_grass.weather.http_get")
+def test_get_air_quality_many_splits_response(mock_get):
+    mock_resp = MagicMock()
+    mock_resp.json.return_value = [
+        {"current": {"european_aqi": 10, "us_aqi": 20}, "hourly": {"time": [], "european_aqi": [], "us_aqi": []}},
+        {"current": {"european_aqi": 30, "us_aqi": 40}, "hourly": {"time": [], "european_aqi": [], "us_aqi": []}},
+    ]
+    mock_get.return_value = mock_resp
+
+    results = get_air_quality_many([(1.0, 1.0), (2.0, 2.0)])
+
+    assert mock_get.call_args.kwargs["params"]["longitude"] == "1.0,2.0"
+    assert [r["current"]["european_aqi"] for r in results] == [10, 30]
+
+
+@patch("touch_grass.weather.http_get")
+def test_grid_shares_cache_between_nearby_points(mock_get, monkeypatch):
+    monkeypatch.setenv("TOUCH_GRASS_GRID", "0.1")
+    mock_resp = MagicMock()
+    mock_resp.json.return_value = _point(1.0)
+    mock_get.return_value = mock_resp
+
+    first = get_weather(45.52, -122.68)
+    second = get_weather(45.5201, -122.6799)
+
+    assert first is second
+    assert mock_get.call_count == 1
+    assert mock_get.call_args.kwargs["params"]["latitude"] == 45.5
+    assert mock_get.call_args.kwargs["params"]["longitude"] == -122.7
+
+
+@patch("touch_grass.weather.http_get")
+def test_grid_collapses_neighbours_in_many_requests(mock_get, monkeypatch):
+    monkeypatch.setenv("TOUCH_GRASS_GRID", "0.1")
+    mock_resp = MagicMock()
+    mock_resp.json.return_value = [_point(1.0), _point(2.0)]
+    mock_get.return_value = mock_resp
+
+    results = get_weather_many([(45.52, -122.68), (45.53, -122.67), (47.6, -122.3)])
+
+    assert mock_get.call_args.kwargs["params"]["latitude"] == "45.5,47.6"
+    assert [r["current"]["temperature"] for r in results] == [1.0, 1.0, 2.0]
+
+
+def _days_point(days, temp=1.0):
+    times = [f"2026-02-{15 + d}T{h:02d}:00" for d in range(days) for h in range(24)]
+    return {
+        "current": {"temperature_2m": temp, "rain": 0.0, "uv_index": 1.0, "windspeed_10m": 5.0},
+        "hourly": {
+            "time": times,
+            "temperature_2m": [temp] * len(times),
+            "rain": [0.0] * len(times),
+            "uv_index": [1.0] * len(times),
+            "windspeed_10m": [5.0] * len(times),
+        },
+        "timezone": "UTC",
+    }
+
+
+@patch("touch_grass.weather.http_get")
+def test_shorter_horizon_is_sliced_from_cached_longer_one(mock_get):
+    mock_resp = MagicMock()
+    mock_resp.json.return_value = _days_point(3)
+    mock_get.return_value = mock_resp
+
+    three = get_weather(45.52, -122.68, forecast_days=3)
+    one = get_weather(45.52, -122.68, forecast_days=1)
+
+    assert mock_get.call_count == 1
+    assert len(three["hourly"]) == 72
+    assert len(one["hourly"]) == 24
+    assert one["hourly"][-1]["time"] == "2026-02-15T23:00"
+    assert one["current"] == three["current"]
+    assert get_weather(45.52, -122.68, forecast_days=1) is one
+
+
+@patch("touch_grass.weather.http_get")
+def test_longer_horizon_is_not_served_from_shorter_one(mock_get):
+    mock_resp = MagicMock()
+    mock_resp.json.return_value = _days_point(1)
+    mock_get.return_value = mock_resp
+    get_weather(45.52, -122.68, forecast_days=1)
+
+    mock_resp.json.return_value = _days_point(2)
+    result = get_weather(45.52, -122.68, forecast_days=2)
+
+    assert mock_get.call_count == 2
+    assert len(result["hourly"]) == 48
+
+
+@patch("touch_grass.weather.http_get")
+def test_fetch_days_shares_one_entry_across_horizons(mock_get, monkeypatch):
+    monkeypatch.setenv("TOUCH_GRASS_FETCH_DAYS", "7")
+    mock_resp = MagicMock()
+    mock_resp.json.return_value = _days_point(7)
+    mock_get.return_value = mock_resp
+
+    one = get_weather(45.52, -122.68)
+    three = get_weather(45.52, -122.68, forecast_days=3)
+    many = get_weather_many([(45.52, -122.68)], forecast_days=2)
+
+    assert mock_get.call_count == 1
+    assert mock_get.call_args.kwargs["params"]["forecast_days"] == 7
+    assert [len(r["hourly"]) for r in (one, three, many[0])] == [24, 72, 48]
+
+
+@patch("touch_grass.weather.http_get")
+def test_warm_horizon_lookups_count_one_hit_and_skip_disk(mock_get, monkeypatch):
+    monkeypatch.setenv("TOUCH_GRASS_FETCH_DAYS", "7")
+    mock_get.return_value.json.return_value = _days_point(7)
+    get_weather(45.52, -122.68)
+    before = cache.cache_stats()
+
+    with patch("touch_grass.cache._disk_read", wraps=cache._disk_read) as disk_read:
+        for _ in range(10):
+            get_weather(45.52, -122.68)
+
+    stats = cache.cache_stats()
+    assert (stats["hits"] - before["hits"], stats["misses"] - before["misses"]) == (10, 0)
+    disk_read.assert_not_called()
+
+    cache._CACHE.clear()  # a new process: the 7-day entry is still on disk
+    assert len(get_weather(45.52, -122.68, forecast_days=2)["hourly"]) == 48
+    assert mock_get.call_count == 1
+
+
+@patch("touch_grass.weather.http_get")
+def test_get_weather_many_slices_fetch_horizon(mock_get, monkeypatch):
+    monkeypatch.setenv("TOUCH_GRASS_FETCH_DAYS", "2")
+    mock_resp = MagicMock()
+    mock_resp.json.return_value = [_days_point(2), _days_point(2)]
+    mock_get.return_value = mock_resp
+
+    results = get_weather_many([(1.0, 1.0), (2.0, 2.0)])
+
+    assert mock_get.call_args.kwargs["params"]["forecast_days"] == 2
+    assert [len(r["hourly"]) for r in results] == [24, 24]
+    assert len(get_weather(1.0, 1.0, forecast_days=2)["hourly"]) == 48
+    assert mock_get.call_count == 1
+
+
+@pytest.mark.parametrize("raw", ["0", "8", "week"])
+def test_fetch_horizon_rejects_invalid_values(monkeypatch, raw):
+    monkeypatch.setenv("TOUCH_GRASS_FETCH_DAYS", raw)
+    with pytest.raises(ValueError, match="TOUCH_GRASS_FETCH_DAYS"):
+        fetch_horizon()
+
+
+def test_prefetch_conditions_runs_on_daemon_threads():
+    daemons = []
+
+    def fetch(name):
+        def record(*args, **kwargs):
+            daemons.append(threading.current_thread().daemon)
+            return {"source": name}
+        return record
+
+    with patch("touch_grass.weather.get_weather", side_effect=fetch("weather")), \
+            patch("touch_grass.weather.get_air_quality", side_effect=fetch("air_quality")):
+        future = prefetch_conditions(45.52, -122.68, 3)
+        assert future.result(timeout=2) == ({"source": "weather"}, {"source": "air_quality"})
+    assert daemons == [True, True]
+
+
+def test_prefetch_conditions_reraises_fetch_errors():
+    with patch("touch_grass.weather.get_weather", side_effect=requests.ConnectionError("offline")), \
+            patch("touch_grass.weather.get_air_quality", return_value={}):
+        with pytest.raises(requests.ConnectionError):
+            prefetch_conditions(45.52, -122.68).result(timeout=2)
@@ -0,0 +1,122 @@
+import json
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from touch_grass.cli import _parse_clock_range, main
+from touch_grass.conditions import safe_windows
+
+SAFE = (20, 1, 0)
+UNSAFE = (20, 8, 0)
+BASE = 1_000_000_000 - 1_000_000_000 % 86400  # a UTC midnight
+
+
+def _forecast(pattern, start_hour=0, skip=()):
+    """Build hourly data from a string of 's' (safe) / 'u' (unsafe), one char per hour from 1970-01-01."""
+    rows = []
+    for i, flag in enumerate(pattern):
+        if i in skip:
+            continue
+        day, hour = divmod(start_hour + i, 24)
+        temp, uv, rain = SAFE if flag == "s" else UNSAFE
+        rows.append({"time": f"2001-09-{9 + day:02d}T{hour:02d}:00", "temperature": temp, "uv_index": uv, "rain": rain})
+    return {"hourly": rows, "timezone": "UTC"}, {"hourly": []}
+
+
+def _epoch(day, hour):
+    return BASE + day * 86400 + hour * 3600
+
+
+def test_runs_are_contiguous_safe_hours():
+    index = safe_windows(*_forecast("uussuuusssu"))
+    assert index.runs == [(2, 4), (7, 10)]
+    windows = index.all()
+    assert [(w.start, w.end, w.hours) for w in windows] == [
+        ("2001-09-09T02:00", "2001-09-09T04:00", 2),
+        ("2001-09-09T07:00", "2001-09-09T10:00", 3),
+    ]
+    assert windows[0].worst["peak_uv"] == 1
+
+
+def test_gap_in_hourly_data_splits_runs():
+    index = safe_windows(*_forecast("ssss", skip={2}))
+    assert index.runs == [(0, 2), (2, 3)]
+
+
+def test_next_window_respects_minimum_duration():
+    index = safe_windows(*_forecast("suussssuss"))
+    assert index.next_window(1).start == "2001-09-09T00:00"
+    assert index.next_window(3).start == "2001-09-09T03:00"
+    assert index.next_window(5) is None
+
+
+def test_next_window_clips_run_at_now():
+    index = safe_windows(*_forecast("ssssss"))
+    window = index.next_window(1, after=_epoch(0, 2))
+    assert window.start == "2001-09-09T03:00"
+    assert window.hours == 3
+    assert index.next_window(4, after=_epoch(0, 2)) is None
+
+
+def test_longest_window_within_days():
+    index = safe_windows(*_forecast("ss" + "u" * 22 + "s" * 10))
+    assert index.longest_window().hours == 10
+    # Only the first day is in range
+    assert index.longest_window(days=1, after=_epoch(0, 0) - 1).hours == 2
+    # Runs crossing the horizon are clipped
+    assert index.longest_window(days=1, after=_epoch(0, 4)).hours == 4
+
+
+def test_overlapping_clock_range():
+    index = safe_windows(*_forecast("sss" + "u" * 9 + "ss" + "u" * 8 + "ss"))
+    midday = index.overlapping("12:00", "14:00")
+    assert [w.start for w in midday] == ["2001-09-09T12:00"]
+    overnight = index.overlapping("22:00", "01:00")
+    assert [w.start for w in overnight] == ["2001-09-09T00:00", "2001-09-09T22:00"]
+    assert [w.start for w in index.overlapping("23:00", "24:00")] == ["2001-09-09T22:00"]
+    with pytest.raises(ValueError):
+        index.overlapping("12:00", "12:00")
+
+
+def test_index_is_memoized_per_thresholds():
+    weather, aq = _forecast("ss")
+    assert safe_windows(weather, aq) is safe_windows(weather, aq)
+
+
+# --- CLI ---
+
+
+SAFE_AQ = {"current": {"european_aqi": 20, "us_aqi": 40}, "hourly": []}
+
+
+def _cli_weather():
+    weather, _ = _forecast("s" * 48)
+    weather["current"] = {"temperature": 22, "uv_index": 2, "rain": 0, "wind_speed": 10}
+    return weather
+
+
+@patch("touch_grass.cli.time.time", return_value=_epoch(0, 5) + 1)
+@patch("touch_grass.weather.get_air_quality", return_value=SAFE_AQ)
+@patch("touch_grass.weather.get_weather")
+def test_cli_min_hours_json(mock_weather, mock_aq, mock_time):
+    mock_weather.return_value = _cli_weather()
+    result = CliRunner().invoke(main, ["--lat", "1", "--lon", "2", "--json", "--min-hours", "3", "--between", "12:00-14:00"], catch_exceptions=False)
+    payload = json.loads(result.output)
+    windows = payload["safe_windows"]
+    assert windows["min_hours"] == 3
+    assert windows["next"]["start"] == "2001-09-09T06:00"
+    assert windows["longest"]["hours"] == 24
+    assert [w["start"] for w in windows["overlapping"]] == ["2001-09-09T06:00"]
+
+
+@pytest.mark.parametrize("value", ["noon", "24:59-25:00", "10:00-24:30", "24:00-02:00", "12:00-12:00", "9:00-09:00"])
+def test_cli_rejects_bad_clock_range(value):
+    result = CliRunner().invoke(main, ["--lat", "1", "--lon", "2", "--between", value])
+    assert result.exit_code == 30
+    assert "--between" in result.output
+
+
+def test_parse_clock_range_accepts_end_of_day():
+    assert _parse_clock_range("0:00-24:00") == ("00:00", "24:00")
+    assert _parse_clock_range("22:30 - 1:15") == ("22:30", "01:15")